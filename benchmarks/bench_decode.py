@@ -0,0 +1,100 @@
+"""
+Decode throughput, and the cost of aggregating the individual answers with the per-project
+decode plan (see _decode_plan in pyapp/app/scoutnet_forms.py) compared with the inline
+type checks it replaced, which are kept below as the reference. Checks that both give
+identical group aggregates.
+
+    python -m benchmarks.bench_decode [num_participants]
+"""
+
+import copy
+import sys
+import time
+
+from benchmarks.scoutnet_data import make_project
+from pyapp.app.scoutnet_forms import _decode_plan, _decode_project, normalize_text_answer
+
+# --- The inline aggregation, as it was in _decode_project ---
+
+
+def _aggregate_inline(qdata: dict, members: list[tuple[dict, dict]]) -> None:
+    for aggregated, answers in members:
+        for qnum, qval in answers.items():
+            q = qdata[qnum]
+            qnum = int(qnum)
+            section_id = q["section_id"]
+            group_section = aggregated.setdefault(section_id, {})
+            if q["type"] == "boolean":
+                if q["choices"][qval]["option"] == "checked":
+                    group_section[qnum] = group_section.get(qnum, 0) + 1
+            elif q["type"] == "choice":
+                choice_counts = group_section.setdefault(qnum, {})
+                if type(qval) is not list:
+                    qval = [qval]
+                for qsel in qval:
+                    if qsel not in q["choices"]:
+                        continue
+                    choice_counts[int(qsel)] = choice_counts.get(int(qsel), 0) + 1
+            elif q["type"] == "text":
+                if (
+                    q["question"]
+                    not in [
+                        "Övriga önskemål på arbetsuppgifter",
+                        "Önskemål om personer att jobba tillsammans med:",
+                        "Om du har varit i kontakt med oss innan och förbokat vad du ska jobba med i Jamboreen, vem har du varit i kontakt med och inom vilket område ska du jobba?",
+                        "Vad är namnet på den nationella scoutorganisation som du tillhör?",
+                    ]
+                    and qval
+                    and qval.lower() not in ["no", "none", "n/a", "na", "n/a`", "ingen", "-"]
+                    and (text := normalize_text_answer(qval))
+                ):
+                    text_counts = group_section.setdefault(qnum, {})
+                    text_counts[text] = text_counts.get(text, 0) + 1
+            elif q["type"] == "number":
+                if qval:
+                    group_section[qnum] = group_section.get(qnum, 0) + float(qval)
+
+
+def _aggregate_planned(qdata: dict, members: list[tuple[dict, dict]]) -> None:
+    plan = _decode_plan(qdata)  # Included in the time, it is prepared once per decode
+    for aggregated, answers in members:
+        for qid, qval in answers.items():
+            qnum, section_id, aggregate, data = plan[qid]
+            aggregate(aggregated.setdefault(section_id, {}), qnum, qval, data)
+
+
+def _time(aggregate, qdata: dict, answers: list[dict], num_groups: int) -> tuple[float, list[dict]]:
+    groups = [{} for _ in range(num_groups)]
+    members = [(groups[i % num_groups], q) for i, q in enumerate(answers)]
+    start = time.perf_counter()
+    aggregate(qdata, members)
+    return time.perf_counter() - start, groups
+
+
+def main(num_participants: int = 25000) -> None:
+    project = make_project(num_participants=num_participants)
+    qdata = project.questions["questions"]
+    answers = [p["questions"] for p in project.participants["participants"].values() if p["questions"]]
+    num_groups = len(project.groups)
+
+    _, expected = _time(_aggregate_inline, qdata, answers, num_groups)
+    _, actual = _time(_aggregate_planned, qdata, answers, num_groups)
+    assert expected == actual, "Different aggregates"
+    print(f"Identical aggregates for {len(answers)} members in {num_groups} groups")
+
+    inline_s, planned_s, decode_s = float("inf"), float("inf"), float("inf")
+    for _ in range(15):  # Interleaved, so all see the same machine load
+        inline_s = min(inline_s, _time(_aggregate_inline, qdata, answers, num_groups)[0])
+        planned_s = min(planned_s, _time(_aggregate_planned, qdata, answers, num_groups)[0])
+        data = copy.deepcopy(project)  # Decoding patches the answers in place
+        start = time.perf_counter()
+        _decode_project(data)
+        decode_s = min(decode_s, time.perf_counter() - start)
+    print(f"{'':12} {'µs/member':>10}")
+    print(f"{'inline':12} {inline_s / len(answers) * 1e6:10.2f}")
+    print(f"{'planned':12} {planned_s / len(answers) * 1e6:10.2f}")
+    print(f"Decoded {num_participants / decode_s:,.0f} participants/s")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
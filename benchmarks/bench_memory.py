@@ -0,0 +1,38 @@
+"""
+Memory footprint of the decoded participant data at full event scale.
+
+Compares the compact cache representation (slotted participant records and the
+encoded answer store) with the plain dict representation it replaced: one dict
+per participant and one {question_id: value} dict per member.
+
+    python -m benchmarks.bench_memory [num_participants]
+"""
+
+import json
+import sys
+
+from benchmarks.scoutnet_data import make_project
+from pyapp.app.metrics import approx_size
+from pyapp.app.scoutnet_forms import _decode_project
+
+
+def main(num_participants: int = 25000) -> None:
+    project = _decode_project(make_project(num_participants=num_participants))
+    answers = {m: a for g in project.groups.values() for m, a in g.raw_individual_answers.items()}
+
+    # The previous representation: a dict per participant and answer dicts with their own key strings
+    plain_participants = {m: dict(p.items()) for m, p in project.participants.items()}
+    plain_answers = {m: json.loads(json.dumps(a)) for m, a in answers.items()}
+
+    rows = [
+        ("participants", approx_size(plain_participants), approx_size(project.participants)),
+        ("individual answers", approx_size(plain_answers), approx_size(project.answers)),
+    ]
+    print(f"{len(project.participants)} participants in {len(project.groups)} groups")
+    print(f"{'':20} {'plain MiB':>10} {'compact MiB':>12} {'saved':>6}")
+    for label, plain, compact in rows:
+        print(f"{label:20} {plain / 2**20:10.1f} {compact / 2**20:12.1f} {1 - compact / plain:6.0%}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
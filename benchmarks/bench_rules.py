@@ -0,0 +1,138 @@
+"""
+Per-participant cost of the answer rules (see pyapp/app/rules.py) compared with the
+hand-written J26 functions they replaced, which are kept below as the reference. Checks
+that both give identical answers for every participant and group.
+
+    python -m benchmarks.bench_rules [num_participants]
+"""
+
+import copy
+import json
+import random
+import sys
+import time
+
+from benchmarks.scoutnet_data import make_project
+from pyapp.app.rules import CompiledRules, load_rules
+
+# --- The hand-written functions, as they were in scoutnet_forms.py ---
+
+
+def _j26_question_hack_individual(q: dict) -> None:
+    if q.get("90519", None) != "61935":  # "Ålder/roll vid anmälan" is not "Jag är vårdnadshavare och anmäler mitt barn"
+        q.pop("90426", None)  # Remove  "Jag samtycker till publicering av bilder på mitt barn"
+    else:
+        if "90426" not in q:
+            q["90426"] = "0"  # count this as NO if above is true and this one does not exist in the api response.
+
+    if q.get("88181", None) != "60136":  # "Vilken åldersgrupp eller funktion tillhör du/ditt barn?" is not "Ledare"
+        for key in ("88212", "89316", "89317"):
+            q.pop(key, None)  # Remove "Extra frågor för ledare"
+
+    if q.get("90433") != "1":  # "Jag samtycker till behandling av hälsoinformation"
+        for key in ("88201", "88205", "89284", "89285", "89286", "90446", "90447", "90449"):
+            q.pop(key, None)  # Remove health relates responses if not consent
+    if q.get("90447") != "1":  # "Är du/ditt barn allergisk mot något läkemedel?"
+        q.pop("90448", None)  # Remove "Vilket/vilka läkemedel är du/ditt barn allergisk mot?"
+    if q.get("89285") != "1":  # "Tar du/ditt barn någon medicin som jamboreens sjukvårdsteam bör känna till?)"
+        q.pop("88213", None)  # Remove "Vilken medicin tar du/ditt barn som jamboreens sjukvårdsteam bör känna till?"
+    if q.get("90449") != "1":  # "Har du/ditt barn annan allergi som jamboreens sjukvårdsteam bör känna till?"
+        q.pop("90450", None)  # Remove "Beskriv din/ditt barn icke-kostrelaterade allergi"
+    if q.get("89284") != "1":  # "Har du/ditt barn behov av interntransport?"
+        q.pop("88190", None)  # Remove "Beskriv ditt/ditt barns behov av interntransport"
+    if q.get("89286") != "1":  # "Har du/ditt barn ett medicinskt behov av elektricitet vid boplatsen?""
+        q.pop("88192", None)  # Remove "Vad behöver du/ditt barn elektricitet till?"
+
+    if q.get("90424") != "1":  # "Jag samtycker till behandling av kostinformation"
+        q.pop("88199", None)  # Remove "Allergier och medicinsk specialkost"
+        q.pop("89292", None)  # Remove "Kostpreferenser"
+    if q.get("88199") != "1":  # "Allergier och medicinsk specialkost" take 1
+        for key in ("88189", "88202", "88206", "88207", "88209", "88210", "88215"):
+            q.pop(key, None)  # If not, remove related responses
+    if q.get("88199") != "1":  # "Allergier och medicinsk specialkost" take 2
+        for key in ("88218", "88219", "89287", "89288", "89289", "89290", "89291"):
+            q.pop(key, None)  # If not, remove related responses
+    if q.get("89292") != "1":  # "Kostpreferenser"
+        for key in ("89293", "89294", "89295", "89296", "89297", "89298"):
+            q.pop(key, None)  # If not, remove related responses
+
+    for qpatch in ["91453", "91454", "91458", "91455", "91456", "91459", "91457", "91460"]:
+        # Decode and patch some of the "other_unsupported_by_api" types
+        if qpatch in q:
+            try:
+                decoded = json.loads(q[qpatch])
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(decoded, dict) and "value" in decoded:
+                q[qpatch] = decoded["value"]
+    return
+
+
+def _j26_question_hack_group(q: dict) -> None:
+    if q.get("88180") != "60133":  # "Transportsätt för gods is not "Gods på pall"
+        for key in ("88197", "88211", "88221", "90422", "90423"):
+            q.pop(key, None)  # Remove gods related responses
+
+    return
+
+
+# --- Benchmark ---
+
+RULE_KEYS = sorted(
+    {rule.question for rule in load_rules().individual}
+    | {key for rule in load_rules().individual for key in rule.drop + list(rule.default)}
+)
+
+
+def random_answers(rnd: random.Random) -> dict:
+    """Answers to a random subset of the questions the rules read or drop, with rule-relevant values."""
+    answers = {}
+    for key in RULE_KEYS:
+        if rnd.random() < 0.7:
+            answers[key] = rnd.choice(["0", "1", "61935", "60136", "Text"])
+    if rnd.random() < 0.3:
+        answers["91453"] = rnd.choice(['{"value": "12"}', "12", "{", '["x"]'])
+    return answers
+
+
+def _time(apply, answers: list[dict]) -> float:
+    answers = copy.deepcopy(answers)
+    start = time.perf_counter()
+    for q in answers:
+        apply(q)
+    return time.perf_counter() - start
+
+
+def main(num_participants: int = 25000) -> None:
+    project = make_project(num_participants=num_participants)
+    rnd = random.Random(26)
+    individual = [p["questions"] for p in project.participants["participants"].values()]
+    group = [g["questions"] for g in project.groups.values()]
+
+    rules = load_rules()
+    compiled = CompiledRules(rules.individual, rules.decode_json)
+    compiled_group = CompiledRules(rules.group)
+    random_individual = [random_answers(rnd) for _ in range(num_participants)]  # Also every corner case
+    for reference, rule_list, answers in (
+        (_j26_question_hack_individual, compiled, individual + random_individual),
+        (_j26_question_hack_group, compiled_group, group),
+    ):
+        expected, actual = copy.deepcopy(answers), copy.deepcopy(answers)
+        for q in expected:
+            reference(q)
+        for q in actual:
+            rule_list.apply(q)
+        assert json.dumps(expected) == json.dumps(actual), "Different answers"
+    print(f"Identical answers for {len(individual) + len(random_individual)} members and {len(group)} groups")
+
+    reference_s, rules_s = float("inf"), float("inf")
+    for _ in range(15):  # Interleaved, so both see the same machine load
+        reference_s = min(reference_s, _time(_j26_question_hack_individual, individual))
+        rules_s = min(rules_s, _time(CompiledRules(rules.individual, rules.decode_json).apply, individual))
+    print(f"{'':12} {'µs/member':>10}")
+    print(f"{'functions':12} {reference_s / len(individual) * 1e6:10.2f}")
+    print(f"{'rules':12} {rules_s / len(individual) * 1e6:10.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,136 @@
+"""
+Synthetic Scoutnet project data at jamboree scale, shaped like the Scoutnet
+project API responses. Used by the benchmarks in this directory.
+"""
+
+import json
+import os
+import random
+
+# Config is read at import time; the benchmarks never talk to Scoutnet.
+os.environ.setdefault(
+    "SCOUTNET_PROJECTS", json.dumps([{"id": 1, "name": "Bench", "member_key": "", "question_key": ""}])
+)
+os.environ.setdefault("PERSIST_DIR", "/tmp/j26-signupinfo-bench")
+
+from pyapp.app.scoutnet import ScoutnetProjectData
+
+FIRST_NAMES = ["Åsa", "Erik", "Anna", "Björn", "Märta", "Olle", "Karin", "Johan", "Sofia", "Lars", "Elin", "Nils"]
+LAST_NAMES = ["Andersson", "Johansson", "Karlsson", "Nilsson", "Eriksson", "Larsson", "Olsson", "Persson", "Öberg"]
+TEXT_ANSWERS = ["Gluten", "Laktos", "Nötter", "Vegetarian", "Ingen", "Epipen vid nötallergi", "Mjölkprotein", "-"]
+
+
+def _boolean(qid, section_id, text):
+    choices = {"0": {"value": "0", "option": "unchecked"}, "1": {"value": "1", "option": "checked"}}
+    return qid, {"section_id": section_id, "question": text, "type": "boolean", "choices": choices}
+
+
+def _choice(qid, section_id, text, values):
+    choices = {str(v): {"value": str(v), "option": f"Alternativ {v}"} for v in values}
+    return qid, {"section_id": section_id, "question": text, "type": "choice", "choices": choices}
+
+
+def _plain(qid, section_id, text, qtype):
+    return qid, {"section_id": section_id, "question": text, "type": qtype}
+
+
+def make_project(
+    project_id: int = 1, num_participants: int = 25000, num_groups: int = 600, seed: int = 26
+) -> ScoutnetProjectData:
+    rnd = random.Random(seed)
+
+    sections = {
+        "individual": {
+            "1": {"id": 21334, "title": "Hälsa"},
+            "2": {"id": 21335, "title": "Allergener"},
+            "3": {"id": 21336, "title": "Om dig"},
+        },
+        "group_member": {"4": {"id": 21337, "title": "Deltagare"}},
+        "group": {"5": {"id": 21338, "title": "Ansvariga från kåren"}, "6": {"id": 21339, "title": "Gods"}},
+    }
+    questions = dict(
+        [
+            _boolean("90433", 21334, "Jag samtycker till behandling av hälsoinformation"),
+            _boolean("89285", 21334, "Tar du någon medicin?"),
+            _plain("88213", 21334, "Vilken medicin?", "text"),
+            _boolean("90424", 21335, "Jag samtycker till behandling av kostinformation"),
+            _boolean("88199", 21335, "Allergier och medicinsk specialkost"),
+            _plain("88206", 21335, "Annan relevant kostinformation", "text"),
+            _plain("88189", 21335, "Beskriv allergin", "text"),
+            _choice("90519", 21336, "Ålder/roll vid anmälan", [61934, 61935, 61936]),
+            _choice("88181", 21336, "Vilken åldersgrupp eller funktion tillhör du?", [60134, 60135, 60136]),
+            _boolean("90426", 21336, "Jag samtycker till publicering av bilder"),
+            _plain("88300", 21336, "Antal nätter", "number"),
+            _choice("88301", 21337, "Tröjstorlek", [70001, 70002, 70003, 70004, 70005]),
+            _plain("88195", 21338, "Ansvarig ledare på plats", "leader_select"),
+            _plain("88302", 21338, "Antal tält", "number"),
+            _choice("88180", 21339, "Transportsätt för gods", [60132, 60133]),
+            _plain("88197", 21339, "Antal pallar", "text"),
+        ]
+    )
+
+    groups_raw = {}
+    for g in range(num_groups):
+        gid = 1000 + g
+        groups_raw[str(gid)] = {"name": f"Scoutkår {gid}", "questions": {}}
+
+    participants = {}
+    member_nos = []
+    for i in range(num_participants):
+        member_no = 3000000 + i
+        member_nos.append(member_no)
+        gid = 1000 + rnd.randrange(num_groups)
+        year = rnd.choice([1970, 1985, 2000, 2008, 2010, 2012, 2014])
+        health = rnd.random() < 0.8
+        diet = rnd.random() < 0.8
+        q = {
+            "90519": rnd.choice(["61934", "61935", "61936"]),
+            "88181": rnd.choice(["60134", "60135", "60136"]),
+            "90426": rnd.choice(["0", "1"]),
+            "88300": str(rnd.randint(1, 10)),
+            "88301": rnd.choice(["70001", "70002", "70003", "70004", "70005"]),
+            "90433": "1" if health else "0",
+            "89285": rnd.choice(["0", "1"]),
+            "88213": rnd.choice(["Alvedon", "Insulin", "Ingen"]),
+            "90424": "1" if diet else "0",
+            "88199": rnd.choice(["0", "1"]),
+            "88206": rnd.choice(TEXT_ANSWERS),
+            "88189": rnd.choice(TEXT_ANSWERS),
+        }
+        participants[str(i)] = {
+            "member_no": member_no,
+            "first_name": rnd.choice(FIRST_NAMES),
+            "last_name": rnd.choice(LAST_NAMES),
+            "date_of_birth": f"{year}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+            "confirmed": rnd.random() > 0.02,
+            "cancelled": rnd.random() < 0.02,
+            "group_registration_info": {"group_id": gid, "group_name": groups_raw[str(gid)]["name"]},
+            "primary_membership_info": {"group_id": gid if rnd.random() < 0.9 else 1000 + rnd.randrange(num_groups)},
+            "primary_email": f"member{member_no}@example.com",
+            "contact_info": {"1": f"07{rnd.randint(10000000, 99999999)}"},
+            "sex": rnd.choice(["1", "2", "3"]),
+            "fee_id": rnd.choice([1, 2]),
+            "questions": q,
+        }
+
+    for g in groups_raw.values():
+        g["questions"] = {
+            "88195": str(rnd.choice(member_nos)),
+            "88302": str(rnd.randint(1, 20)),
+            "88180": rnd.choice(["60132", "60133"]),
+            "88197": str(rnd.randint(1, 4)),
+        }
+
+    return ScoutnetProjectData(
+        project_id=project_id,
+        project_name=f"Project {project_id}",
+        groups=groups_raw,
+        participants={
+            "labels": {
+                "sex": {"1": "Man", "2": "Kvinna", "3": "Annat"},
+                "project_fee": {"1": "Deltagare", "2": "Ledare"},
+            },
+            "participants": participants,
+        },
+        questions={"sections": sections, "questions": questions},
+    )
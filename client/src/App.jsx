@@ -15,6 +15,7 @@ import useScoutGroupSelector from "./hooks/useScoutGroupSelector.js";
 import useApiData from "./hooks/useApiData.js";
 import useGroupSummary from "./hooks/useGroupSummary.js";
 import useUrlHashState from "./hooks/useUrlHashState.js";
+import useCacheEvents from "./hooks/useCacheEvents.js";
 import { getSelectedScoutGroups } from "./utils/scoutGroupUtils.js";
 import ScoutGroupSelector from "./components/ScoutGroupSelector.jsx";
 import DrawerToggleButton from "./components/DrawerToggleButton.jsx";
@@ -54,6 +55,8 @@ export default function App() {
 
   const { viewMode } = useUrlHashState();
 
+  useCacheEvents();
+
   const prevProjectIdRef = useRef(/** @type {number|null} */ (null));
   useEffect(() => {
     if (prevProjectIdRef.current !== null && prevProjectIdRef.current !== projectId) {
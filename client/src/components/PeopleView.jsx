@@ -17,7 +17,6 @@ import {
   TableContainer,
   TableHead,
   TableRow,
-  Alert,
 } from "@mui/material";
 import SearchIcon from "@mui/icons-material/Search";
 import ClearIcon from "@mui/icons-material/Clear";
@@ -270,7 +269,7 @@ export default function PeopleView({
     results: searchResults,
     loading: searchLoading,
     error: searchError,
-    tooMany,
+    truncated,
     enabled: searchEnabled,
   } = useSearchMembers(isSearching ? projectId : null, query);
 
@@ -412,9 +411,9 @@ export default function PeopleView({
             {groupList.length} personer
           </Typography>
         )}
-        {isSearching && searchEnabled && searchResults != null && !tooMany && (
+        {isSearching && searchEnabled && searchResults != null && (
           <Typography variant="body2" color="text.secondary">
-            {searchResults.length} träffar
+            {truncated ? `De ${searchResults.length} bästa träffarna` : `${searchResults.length} träffar`}
           </Typography>
         )}
       </Box>
@@ -439,7 +438,6 @@ export default function PeopleView({
           enabled={searchEnabled}
           loading={searchLoading}
           error={searchError}
-          tooMany={tooMany}
           results={searchResults ?? []}
           onSelect={handleSearchHit}
         />
@@ -485,7 +483,6 @@ export default function PeopleView({
  * @param {boolean} props.enabled
  * @param {boolean} props.loading
  * @param {Error|null} props.error
- * @param {boolean} props.tooMany
  * @param {Array<{ member_no: number, name: string, born: string, registration_group: string, member_group: string, email?: string, mobile?: string }>} props.results
  * @param {(hit: any) => void} props.onSelect
  */
@@ -493,7 +490,6 @@ function SearchResultsPanel({
   enabled,
   loading,
   error,
-  tooMany,
   results,
   onSelect,
 }) {
@@ -501,13 +497,6 @@ function SearchResultsPanel({
     return <EmptyPanel message="Skriv minst 2 tecken för att söka" />;
   }
   if (loading) return <LoadingPanel />;
-  if (tooMany) {
-    return (
-      <Alert severity="info" sx={{ borderRadius: "12px" }}>
-        För många träffar — förfina din sökning.
-      </Alert>
-    );
-  }
   if (error) {
     return <ErrorPanel message={formatApiError(error, "Sökningen misslyckades.")} />;
   }
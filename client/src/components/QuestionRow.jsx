@@ -1,4 +1,3 @@
-import { useMemo } from "react";
 import { Box, Typography } from "@mui/material";
 import { SubQuestionValues } from "./QuestionAnswerValues.jsx";
 import StatRow from "./StatRow.jsx";
@@ -17,32 +16,20 @@ import { useGroupSelection } from "../context/GroupSelectionContext.jsx";
  * @param {number} props.numericTotal - total for StatRow percentage bars
  */
 export default function QuestionRow({ questionId, questionData, qIndex, numericTotal }) {
-  const { booleanQuestionIds, questionIdToText } = useProjectConfig();
+  const { booleanQuestionIds, questionIdToText, questionTypes } = useProjectConfig();
   const { onReplaceSelection } = useGroupSelection();
 
   const isNumParticipants = questionId === "_direct";
   const isNumeric = typeof questionData === "number";
-  const isTextAnswers = Array.isArray(questionData);
+  const isTextAnswers = !isNumeric && questionTypes[questionId] === "text"; // { answer: count }
   const isBooleanQuestion = isNumeric && booleanQuestionIds.has(questionId);
   const showHeader = !isNumParticipants && !isNumeric;
 
-  const effectiveAnswerCounts = useMemo(
-    () =>
-      isTextAnswers
-        ? questionData.reduce((/** @type {Record<string, number>} */ acc, /** @type {string} */ text) => {
-            const key = text || "(tomt)";
-            acc[key] = (acc[key] || 0) + 1;
-            return acc;
-          }, {})
-        : questionData,
-    [questionData]
-  );
-
   const hasNoAnswers =
     showHeader &&
     !isNumeric &&
     !isBooleanQuestion &&
-    Object.keys(effectiveAnswerCounts).length === 0;
+    Object.keys(questionData).length === 0;
 
   return (
     <Box
@@ -83,7 +70,7 @@ export default function QuestionRow({ questionId, questionData, qIndex, numericT
       ) : (
         <QuestionStats
           questionId={questionId}
-          answerCounts={isBooleanQuestion ? { checked: questionData } : effectiveAnswerCounts}
+          answerCounts={isBooleanQuestion ? { checked: questionData } : questionData}
           onSelectByAnswer={isTextAnswers ? undefined : onReplaceSelection}
         />
       )}
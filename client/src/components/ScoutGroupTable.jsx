@@ -58,10 +58,11 @@ function getManualSectionColumnIds(sectionId, scoutGroups) {
  * @param {string[]} selectedStatistics
  * @param {Record<string, string[] | null>} selectedSubQuestions
  * @param {Record<string, string[]>} sectionQuestions
+ * @param {Record<string, string>} questionTypes
  * @param {ScoutGroupItem[]} scoutGroups
  * @returns {Set<string>}
  */
-function getColumnIds(selectedStatistics, selectedSubQuestions, sectionQuestions, scoutGroups) {
+function getColumnIds(selectedStatistics, selectedSubQuestions, sectionQuestions, questionTypes, scoutGroups) {
   const ids = new Set(["name"]);
 
   if (selectedStatistics.includes("num_participants")) {
@@ -84,6 +85,7 @@ function getColumnIds(selectedStatistics, selectedSubQuestions, sectionQuestions
       const sectionData = group.stats?.[sectionId];
       if (!sectionData) continue;
       for (const qId of qIds) {
+        if (questionTypes[qId] === "text") continue; // Text answer counts stay in one column
         const val = sectionData[qId];
         if (val != null && typeof val === "object" && !Array.isArray(val)) {
           let keys = choiceKeysMap.get(qId);
@@ -136,6 +138,12 @@ function resolveValue(stats, parts, questionIdToText) {
   if (typeof current === "number") return questionIdToText?.[String(current)] ?? current;
   if (typeof current === "string") return questionIdToText?.[current] ?? current;
   if (Array.isArray(current)) return current.join("\n");
+  if (typeof current === "object") {
+    // Text answers counted per value: { "Gluten": 3, "Laktos": 1 }
+    return Object.entries(current)
+      .map(([text, count]) => (count > 1 ? `${text} (${count})` : text))
+      .join("\n");
+  }
   return "";
 }
 
@@ -208,8 +216,8 @@ export default function ScoutGroupTable({
     useProjectConfig();
 
   const chipDrivenColumns = useMemo(
-    () => getColumnIds(selectedStatistics, selectedSubQuestions, sectionQuestions, scoutGroups),
-    [selectedStatistics, selectedSubQuestions, sectionQuestions, scoutGroups]
+    () => getColumnIds(selectedStatistics, selectedSubQuestions, sectionQuestions, questionTypes, scoutGroups),
+    [selectedStatistics, selectedSubQuestions, sectionQuestions, questionTypes, scoutGroups]
   );
 
   const columnMeta = useMemo(
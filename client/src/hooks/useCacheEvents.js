@@ -0,0 +1,31 @@
+import { useEffect, useRef } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import { subscribeCacheEvents } from '../services/api';
+
+/**
+ * Listens for new server cache generations and invalidates the queries of the
+ * projects that changed. All query keys are [name, projectId, ...], except
+ * ['projects'] which is refetched whenever a project was added or removed.
+ * If an event was missed, everything is invalidated.
+ */
+export default function useCacheEvents() {
+  const queryClient = useQueryClient();
+  const generationRef = useRef(/** @type {number|null} */ (null));
+
+  useEffect(() => {
+    return subscribeCacheEvents((event) => {
+      const known = generationRef.current;
+      generationRef.current = event.generation;
+      if (known === null || known === event.generation) return; // First event after load, or a reconnect
+
+      if (known !== event.previous_generation) {
+        queryClient.invalidateQueries();
+        return;
+      }
+      const changed = new Set(event.changed_projects);
+      queryClient.invalidateQueries({
+        predicate: (query) => query.queryKey[0] === 'projects' || changed.has(Number(query.queryKey[1])),
+      });
+    });
+  }, [queryClient]);
+}
@@ -24,19 +24,21 @@ function useDebounced(value, delay) {
 	return debounced;
 }
 
+const MAX_HITS = 50;
+
 /**
  * Hook that searches participants by name. Doesn't fire until the user has
- * typed at least 2 characters (the backend would otherwise reply 422 "too
- * many matches" for single-letter queries on any real project).
+ * typed at least 2 characters, since single letters match most of any real
+ * project.
  *
  * Backend semantics translated to simpler client state:
  * - 404 no matches → `results: []`
- * - 422 too many matches → `tooMany: true`
+ * - MAX_HITS results → `truncated: true`, the best matches of possibly more
  * - everything else → bubbles up as `error`
  *
  * @param {number|null} projectId
  * @param {string} query
- * @returns {{ results: SearchMember[] | null, loading: boolean, error: Error|null, tooMany: boolean, enabled: boolean }}
+ * @returns {{ results: SearchMember[] | null, loading: boolean, error: Error|null, truncated: boolean, enabled: boolean }}
  */
 export default function useSearchMembers(projectId, query) {
 	const debouncedQuery = useDebounced(query, 300);
@@ -49,7 +51,7 @@ export default function useSearchMembers(projectId, query) {
 			try {
 				return await fetchSearchMembers(/** @type {number} */ (projectId), {
 					name: trimmed,
-					maxHits: 50,
+					maxHits: MAX_HITS,
 				});
 			} catch (e) {
 				if (/** @type {any} */ (e)?.status === 404) return [];
@@ -58,7 +60,7 @@ export default function useSearchMembers(projectId, query) {
 		},
 		enabled,
 		staleTime: 30_000,
-		// 4xx (including 422 "too many matches") means the request itself is wrong
+		// 4xx means the request itself is wrong
 		// — retrying just delays the user-visible outcome. Keep default retry for
 		// 5xx / network blips.
 		retry: (failureCount, /** @type {any} */ err) => {
@@ -68,13 +70,11 @@ export default function useSearchMembers(projectId, query) {
 		},
 	});
 
-	const err = /** @type {(Error & { status?: number }) | null} */ (error);
-
 	return {
 		results: data ?? null,
 		loading: isFetching,
-		error: err?.status === 422 ? null : err,
-		tooMany: err?.status === 422,
+		error: /** @type {Error | null} */ (error),
+		truncated: data?.length === MAX_HITS,
 		enabled,
 	};
 }
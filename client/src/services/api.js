@@ -7,7 +7,8 @@
 /**
  * @typedef {{ text: string, type?: string, choices?: Record<string, string> }} Question
  * @typedef {{ text: string, questions: Record<string, Question> }} QuestionSection
- * @typedef {{ total_participants: number, num_groups: number, stats: Record<string, Record<string, number> | number> }} GroupInfoSummary
+ * @typedef {{ count: number, sum?: number, mean?: number, min?: number, max?: number, p25?: number, median?: number, p75?: number, p90?: number }} NumberStats
+ * @typedef {{ total_participants: number, num_groups: number, updated_at: number, stats: Record<string, Record<string, number> | number>, number_stats: Record<string, Record<string, NumberStats>> }} GroupInfoSummary
  * @typedef {{ id: number, name: string, num_participants?: number }} ScoutGroup
  */
 
@@ -139,9 +140,10 @@ export async function fetchIndividualResponse(projectId, memberId) {
 }
 
 /**
- * Searches for participants matching the given criteria. The endpoint returns
- * 404 when nothing matches and 422 when the hit count exceeds `maxHits` — the
- * caller is responsible for handling those cases (e.g. via `err.status`).
+ * Searches for participants matching the given criteria. Names match regardless
+ * of case and diacritics and tolerate misspellings; the best `maxHits` matches
+ * are returned, best first. The endpoint returns 404 when nothing matches — the
+ * caller is responsible for handling that case (e.g. via `err.status`).
  *
  * @param {number|string} projectId
  * @param {{ name?: string, born?: string, group?: string, maxHits?: number }} params
@@ -178,4 +180,20 @@ export async function fetchScoutGroups(projectId) {
   }
 
   return allItems;
-}
\ No newline at end of file
+}
+/**
+ * @typedef {{ generation: number, previous_generation: number, updated_at: number, changed_projects: number[] }} GenerationEvent
+ */
+
+/**
+ * Subscribes to the server-sent events that announce new cache generations.
+ * The browser reconnects automatically; the current generation is sent on every connect.
+ *
+ * @param {(event: GenerationEvent) => void} onGeneration
+ * @returns {() => void} Unsubscribe function
+ */
+export function subscribeCacheEvents(onGeneration) {
+  const source = new EventSource(`${API_BASE}/scoutnet/events`, { withCredentials: true });
+  source.addEventListener('generation', (e) => onGeneration(JSON.parse(/** @type {MessageEvent} */ (e).data)));
+  return () => source.close();
+}
@@ -0,0 +1,251 @@
+import json
+import math
+from array import array
+from collections import Counter
+from collections.abc import Iterator, Mapping
+
+# Dictionary-encoded store of the individual answers of one project.
+#
+# Scoutnet returns every member's answers as {question_id: value} with string values.
+# The store keeps one typed column per question instead, indexed by a row number per
+# member:
+#   choice   -> int choice codes
+#   boolean  -> bit-packed present/checked bits
+#   number   -> floats
+#   anything else -> indexes into a per-project table of deduplicated values
+# A column only gets a compact type if every value in it converts back to the exact
+# original string, otherwise it falls back to the value table. Answers are decoded
+# lazily back to the original dict shape.
+
+_MISSING = object()
+
+
+class _ChoiceColumn:
+    __slots__ = ("codes",)
+
+    def __init__(self, size: int):
+        self.codes = array("q", [-1]) * size
+
+    @staticmethod
+    def accepts(value) -> bool:
+        return isinstance(value, str) and value.isdigit() and str(int(value)) == value
+
+    def set(self, row: int, value: str) -> None:
+        self.codes[row] = int(value)
+
+    def get(self, row: int, values: list):
+        code = self.codes[row]
+        return str(code) if code >= 0 else _MISSING
+
+    def counts(self, rows, values: list) -> Counter:
+        counts = Counter(self.codes[r] for r in rows)
+        counts.pop(-1, None)
+        return Counter({str(code): n for code, n in counts.items()})
+
+
+class _BooleanColumn:
+    __slots__ = ("checked", "present")
+
+    def __init__(self, size: int):
+        self.present = bytearray((size + 7) // 8)
+        self.checked = bytearray((size + 7) // 8)
+
+    @staticmethod
+    def accepts(value) -> bool:
+        return value in ("0", "1")
+
+    def set(self, row: int, value: str) -> None:
+        self.present[row >> 3] |= 1 << (row & 7)
+        if value == "1":
+            self.checked[row >> 3] |= 1 << (row & 7)
+
+    def get(self, row: int, values: list):
+        if not self.present[row >> 3] & (1 << (row & 7)):
+            return _MISSING
+        return "1" if self.checked[row >> 3] & (1 << (row & 7)) else "0"
+
+    def counts(self, rows, values: list) -> Counter:
+        return Counter(v for r in rows if (v := self.get(r, values)) is not _MISSING)
+
+
+class _NumberColumn:
+    __slots__ = ("numbers",)
+
+    def __init__(self, size: int):
+        self.numbers = array("d", [math.nan]) * size
+
+    @staticmethod
+    def accepts(value) -> bool:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return False
+        return math.isfinite(number) and _format_number(number) == value
+
+    def set(self, row: int, value: str) -> None:
+        self.numbers[row] = float(value)
+
+    def get(self, row: int, values: list):
+        number = self.numbers[row]
+        return _MISSING if math.isnan(number) else _format_number(number)
+
+    def counts(self, rows, values: list) -> Counter:
+        return Counter(v for r in rows if (v := self.get(r, values)) is not _MISSING)
+
+
+class _ValueColumn:
+    __slots__ = ("indexes",)
+
+    def __init__(self, size: int):
+        self.indexes = array("l", [-1]) * size
+
+    @staticmethod
+    def accepts(value) -> bool:
+        return True
+
+    def get(self, row: int, values: list):
+        index = self.indexes[row]
+        return values[index] if index >= 0 else _MISSING
+
+    def counts(self, rows, values: list) -> Counter:
+        counts = Counter(self.indexes[r] for r in rows)
+        counts.pop(-1, None)
+        return Counter({_hashable(values[i]): n for i, n in counts.items()})
+
+
+_COLUMN_TYPES = {"choice": _ChoiceColumn, "boolean": _BooleanColumn, "number": _NumberColumn}
+
+
+def _format_number(number: float) -> str:
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+def _hashable(value):
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+class AnswerStore:
+    """Column store of all individual answers in a project, see the module comment."""
+
+    __slots__ = ("columns", "questions", "row_groups", "row_members", "rows", "values")
+
+    def __init__(self, question_types: dict[str, str], answers: list[tuple[int, int, dict | None]]):
+        """
+        :param question_types: Scoutnet question type per question id
+        :param answers: (member_no, group_id, {question_id: value}) per member
+        """
+        self.rows: dict[int, int] = {}  # member_no -> row
+        self.row_members = array("q", (member_no for member_no, _, _ in answers))
+        self.row_groups = array("q", (group_id for _, group_id, _ in answers))
+        self.questions: dict[str, int] = {}  # question id -> column index
+        self.columns: list = []
+        self.values: list = []  # Deduplicated answer values referenced by value columns
+
+        for row, (member_no, _, _) in enumerate(answers):
+            self.rows[member_no] = row
+
+        # Pick a column type per question that every value in it round-trips through
+        question_values: dict[str, list] = {}
+        for _, _, response in answers:
+            for qid, value in (response or {}).items():
+                question_values.setdefault(qid, []).append(value)
+        for qid, qvalues in question_values.items():
+            column_type = _COLUMN_TYPES.get(question_types.get(qid), _ValueColumn)
+            if not all(column_type.accepts(v) for v in qvalues):
+                column_type = _ValueColumn
+            self.questions[qid] = len(self.columns)
+            self.columns.append(column_type(len(answers)))
+
+        value_index: dict = {}
+        for row, (_, _, response) in enumerate(answers):
+            for qid, value in (response or {}).items():
+                column = self.columns[self.questions[qid]]
+                if isinstance(column, _ValueColumn):
+                    key = (type(value).__name__, _hashable(value))
+                    if (index := value_index.get(key)) is None:
+                        index = value_index[key] = len(self.values)
+                        self.values.append(value)
+                    column.indexes[row] = index
+                else:
+                    column.set(row, value)
+
+    def __contains__(self, member_no: int) -> bool:
+        return member_no in self.rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _decode(self, row: int) -> dict:
+        response = {}
+        for qid, col in self.questions.items():
+            if (value := self.columns[col].get(row, self.values)) is not _MISSING:
+                response[qid] = value
+        return response
+
+    def get(self, member_no: int, default=None) -> dict | None:
+        """Return a member's answers as {question_id: value}."""
+        row = self.rows.get(member_no)
+        return default if row is None else self._decode(row)
+
+    def value_counts(self, question_id: str, member_nos=None) -> Counter:
+        """
+        Count the answer values of one question over all members, or over the given ones.
+        Works directly on the column, without decoding any answers.
+        """
+        if (col := self.questions.get(question_id)) is None:
+            return Counter()
+        rows = range(len(self.row_members)) if member_nos is None else (self.rows[m] for m in member_nos)
+        return self.columns[col].counts(rows, self.values)
+
+    def column(self, question_id: str) -> tuple[str, list]:
+        """
+        Return the storage type of a question's column ("choice", "boolean", "number" or "value")
+        and its values in row order (see row_members): choice codes as ints, checkboxes as bools,
+        numbers as floats and anything else as the original value. None where unanswered.
+        """
+        column = self.columns[self.questions[question_id]]
+        if isinstance(column, _ChoiceColumn):
+            return "choice", [code if code >= 0 else None for code in column.codes]
+        if isinstance(column, _BooleanColumn):
+            return "boolean", [
+                bool(column.checked[r >> 3] & (1 << (r & 7))) if column.present[r >> 3] & (1 << (r & 7)) else None
+                for r in range(len(self.row_members))
+            ]
+        if isinstance(column, _NumberColumn):
+            return "number", [None if math.isnan(number) else number for number in column.numbers]
+        return "value", [self.values[index] if index >= 0 else None for index in column.indexes]
+
+    def scan(self, question_id: str) -> Iterator[tuple[int, object]]:
+        """Yield (member_no, value) for every member that answered a question."""
+        if (col := self.questions.get(question_id)) is None:
+            return
+        column = self.columns[col]
+        for row, member_no in enumerate(self.row_members):
+            if (value := column.get(row, self.values)) is not _MISSING:
+                yield member_no, value
+
+
+class GroupAnswers(Mapping):
+    """Read-only member_no -> answers mapping over the members of one group in an AnswerStore."""
+
+    __slots__ = ("group_id", "members", "store")
+
+    def __init__(self, store: AnswerStore, group_id: int, members: list[int]):
+        self.store = store
+        self.group_id = group_id
+        self.members = array("q", members)
+
+    def __getitem__(self, member_no: int) -> dict:
+        row = self.store.rows.get(member_no)
+        if row is None or self.store.row_groups[row] != self.group_id:
+            raise KeyError(member_no)
+        return self.store._decode(row)
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+
+STORE_TYPES = (AnswerStore, GroupAnswers, _ChoiceColumn, _BooleanColumn, _NumberColumn, _ValueColumn)  # For snapshots
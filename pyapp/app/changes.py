@@ -0,0 +1,92 @@
+import hashlib
+
+# Participant changes between cache generations.
+#
+# Every participant gets a 128-bit hash at decode time: the upper 64 bits hash the
+# participant details (name, birth date, groups, contact info), the lower 64 bits the
+# answers. Diffing two generations of a project is then one pass over the member
+# numbers, comparing ints. Only members whose hash changed are looked at in detail.
+
+_ANSWERS_MASK = (1 << 64) - 1
+
+
+class ChangesUnavailable(LookupError):
+    """The changes since the requested generation are no longer (or not yet) recorded."""
+
+
+def member_hash(participant, answers: dict | None) -> int:
+    p = participant
+    details = (
+        f"{p.name}\x1f{p.born}\x1f{p.registration_group}\x1f{p.member_group}\x1f{p.get('email')}\x1f{p.get('mobile')}"
+    )
+    answered = "\x1f".join(f"{q}\x1e{v}" for q, v in answers.items()) if answers else ""
+    return int.from_bytes(
+        hashlib.blake2b(details.encode(), digest_size=8).digest()
+        + hashlib.blake2b(answered.encode(), digest_size=8).digest()
+    )
+
+
+def diff_project(old, new) -> dict | None:
+    """
+    Return the changes from the old to the new CachedProject, or None if the old one
+    has no member hashes to compare with.
+    """
+    if old is None or not old.member_hashes:
+        return None
+    old_hashes, new_hashes = old.member_hashes, new.member_hashes or {}
+
+    diff = {
+        "added": [m for m in new_hashes if m not in old_hashes],
+        "removed": {
+            m: {"name": old.participants[m].name, "group_id": old.participants[m].registration_group}
+            for m in old_hashes
+            if m not in new_hashes
+        },
+        "moved": {},  # member_no -> [from group_id, to group_id]
+        "changed_details": {},  # member_no -> [field, ...]
+        "changed_answers": {},  # member_no -> [question_id, ...]
+    }
+    for m, h in new_hashes.items():
+        if (old_h := old_hashes.get(m)) is None or old_h == h:
+            continue
+        if (old_h ^ h) >> 64:
+            before, after = old.participants[m], new.participants[m]
+            if before.registration_group != after.registration_group:
+                diff["moved"][m] = [before.registration_group, after.registration_group]
+            keys = set(before.keys()) | set(after.keys())
+            if fields := sorted(k for k in keys if k != "registration_group" and before.get(k) != after.get(k)):
+                diff["changed_details"][m] = fields
+        if (old_h ^ h) & _ANSWERS_MASK:
+            before, after = old.answers.get(m) or {}, new.answers.get(m) or {}
+            if questions := sorted(q for q in before.keys() | after.keys() if before.get(q) != after.get(q)):
+                diff["changed_answers"][m] = questions  # No entry if only the order of the answers changed
+    return diff
+
+
+def merge_diffs(diffs: list[dict]) -> dict:
+    """Combine consecutive diffs, oldest first, into the net changes over all of them."""
+    merged = {"added": set(), "removed": {}, "moved": {}, "changed_details": {}, "changed_answers": {}}
+    for diff in diffs:
+        for m in diff["added"]:
+            if merged["removed"].pop(m, None) is None:  # Removed and back again: no net change
+                merged["added"].add(m)
+        for m, info in diff["removed"].items():
+            merged["moved"].pop(m, None)
+            merged["changed_details"].pop(m, None)
+            merged["changed_answers"].pop(m, None)
+            if m in merged["added"]:
+                merged["added"].discard(m)  # Added and removed again: no net change
+            else:
+                merged["removed"][m] = info
+        for m, (from_group, to_group) in diff["moved"].items():
+            if m in merged["added"]:
+                continue
+            from_group = merged["moved"].pop(m, [from_group])[0]
+            if from_group != to_group:
+                merged["moved"][m] = [from_group, to_group]
+        for key in ("changed_details", "changed_answers"):
+            for m, names in diff[key].items():
+                if m not in merged["added"]:
+                    merged[key][m] = sorted(set(merged[key].get(m, [])) | set(names))
+    merged["added"] = sorted(merged["added"])
+    return merged
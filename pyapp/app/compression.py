@@ -0,0 +1,161 @@
+import gzip
+from collections import OrderedDict
+
+import brotli
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+
+from . import metrics
+
+# Response compression.
+#
+# CompressionMiddleware compresses single-body responses on the fly with fast settings.
+# Streamed responses (file downloads, server-sent events) are passed through untouched.
+# Responses built from the project cache are instead encoded once per cache generation
+# with the slower, stronger settings and kept in a ResponseCache, see stats.py. Those
+# responses already carry a Content-Encoding and are skipped by the middleware.
+
+MINIMUM_SIZE = 1024  # Smaller bodies are not worth compressing
+ENCODINGS = ("br", "gzip")  # In order of preference
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "image/svg+xml", "text/")
+STREAMING_TYPES = ("text/event-stream",)
+
+_FAST = {"br": 4, "gzip": 6}  # Per request
+_STRONG = {"br": 9, "gzip": 9}  # Once per cache generation
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Return the preferred encoding that the Accept-Encoding header allows, or None."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        q = 1.0
+        if (params := params.strip()).startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    candidates = [(accepted.get(encoding, wildcard), encoding) for encoding in ENCODINGS]
+    q, encoding = max(candidates, key=lambda c: c[0])  # First (preferred) encoding wins ties
+    return encoding if q > 0 else None
+
+
+def compress(body: bytes, encoding: str, strong: bool = False) -> bytes:
+    level = (_STRONG if strong else _FAST)[encoding]
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return (
+        "content-encoding" not in headers
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+        and not content_type.startswith(STREAMING_TYPES)
+    )
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware that compresses responses with brotli or gzip as negotiated
+    by the Accept-Encoding request header.
+    """
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "") if scope["type"] == "http" else ""
+        if not (encoding := choose_encoding(accept_encoding)):
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start_message = message  # Held back until we know whether to compress
+            elif message["type"] == "http.response.body":
+                headers = MutableHeaders(scope=start_message)
+                body = message.get("body", b"")
+                if message.get("more_body", False) or not _is_compressible(headers):
+                    passthrough = True  # Streamed or already encoded
+                    await send(start_message)
+                    await send(message)
+                    return
+                if len(body) >= self.minimum_size:
+                    body = compress(body, encoding)
+                    headers["content-encoding"] = encoding
+                    headers["content-length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body})
+            else:
+                await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+
+class EncodedBody:
+    """A response body together with its precompressed variants."""
+
+    __slots__ = ("encoded", "identity", "media_type")
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.media_type = media_type
+        self.identity = body
+        self.encoded = {}
+        if len(body) >= MINIMUM_SIZE and media_type.startswith(COMPRESSIBLE_TYPES):
+            self.encoded = {encoding: compress(body, encoding, strong=True) for encoding in ENCODINGS}
+            # Keep only variants that are actually smaller
+            self.encoded = {enc: data for enc, data in self.encoded.items() if len(data) < len(body)}
+
+    def response(self, request: Request, headers: dict | None = None) -> Response:
+        """Return the variant that the request accepts."""
+        headers = {**(headers or {}), "vary": "Accept-Encoding"}
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding in self.encoded:
+            headers["content-encoding"] = encoding
+            return Response(self.encoded[encoding], media_type=self.media_type, headers=headers)
+        return Response(self.identity, media_type=self.media_type, headers=headers)
+
+
+class ResponseCache:
+    """
+    Encoded response bodies for one cache generation, evicted least recently used first.
+    All entries are dropped when a newer generation is requested.
+    Hits, misses and evictions are counted in metrics under the cache name.
+    """
+
+    def __init__(self, name: str = "responses", max_entries: int = 256):
+        self.name = name
+        self.max_entries = max_entries
+        self.generation = None
+        self.entries: OrderedDict[tuple, EncodedBody] = OrderedDict()
+
+    def get(self, key: tuple, generation: int) -> EncodedBody | None:
+        if generation != self.generation:
+            self.entries.clear()
+            self.generation = generation
+            metrics.response_cache_entries.labels(self.name).set(0)
+        if (body := self.entries.get(key)) is not None:
+            self.entries.move_to_end(key)
+        metrics.response_cache_requests.labels(self.name, "miss" if body is None else "hit").inc()
+        return body
+
+    def put(self, key: tuple, generation: int, body: EncodedBody) -> None:
+        if generation != self.generation:
+            return  # The cache has moved on while the body was built
+        self.entries[key] = body
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            metrics.response_cache_evictions.labels(self.name).inc()
+        metrics.response_cache_entries.labels(self.name).set(len(self.entries))
@@ -1,9 +1,18 @@
+from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .schedule import CronSchedule
+
+
+def _validate_schedule(expression: str) -> str:
+    if expression:
+        CronSchedule(expression).next_after(datetime.now())  # Raises ValueError if invalid or never matching
+    return expression
+
 
 class ProjectConfig(BaseModel):
     """Configuration for a single Scoutnet project."""
@@ -13,6 +22,10 @@ class ProjectConfig(BaseModel):
     member_key: str
     question_key: str
     group_key: str = ""  # Optional; empty string = no groups for this project
+    refresh_schedule: str = ""  # Optional cron expression; empty string = REFRESH_SCHEDULE
+    answer_rules: str = ""  # Optional path to an answer rule file (see rules.py); empty string = the J26 rules
+
+    _check_schedule = field_validator("refresh_schedule")(_validate_schedule)
 
 
 class Settings(BaseSettings):
@@ -22,6 +35,17 @@ class Settings(BaseSettings):
     API_PREFIX: str = "/api"
     AUTH_DISABLED: bool = False
     PERSIST_DIR: Path = Path("/app/persist")  # Must match volume mountPath
+    FAST_START: bool = False  # Serve the disk cache at startup and refresh from Scoutnet in the background
+    CACHE_STALE_AFTER_H: int = 26  # Report the cache as stale when older than this
+    REFRESH_LEASE_TTL: int = 60  # Seconds before the refresh lease of a silent leader expires
+    PROFILING_ENABLED: bool = False  # Allow privileged users to profile single requests
+    REFRESH_SCHEDULE: str = "0 3 * * *"  # Default cron expression (Europe/Stockholm) for project refreshes
+    REFRESH_JITTER_S: int = 300  # Random delay of up to this many seconds added to each scheduled refresh
+    SCOUTNET_MAX_CONCURRENCY: int = 8  # Max concurrent Scoutnet requests
+    SCOUTNET_MAX_PER_HOST: int = 4  # Max concurrent Scoutnet requests to one host
+    PREWARM_TOP_K: int = 20  # Most requested responses to build before announcing a new cache generation
+
+    _check_schedule = field_validator("REFRESH_SCHEDULE")(_validate_schedule)
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from . import metrics
+
+# Server-sent events.
+#
+# All subscribers of a Broadcaster wait on one shared future, which is resolved and
+# replaced on every publish and on every heartbeat. An idle connection therefore costs
+# one suspended coroutine: there are no per-connection queues or timers. Subscribers
+# always send the latest event, so one that was busy while two events were published
+# skips straight to the newest.
+
+HEARTBEAT_INTERVAL = 20  # Seconds between keep-alive comments, below common proxy idle timeouts
+RETRY_MS = 10000  # Reconnect delay suggested to the browser
+
+
+class Broadcaster:
+    """Fan-out of the latest event to any number of server-sent event streams."""
+
+    def __init__(self, event_name: str, heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        self.event_name = event_name
+        self.heartbeat_interval = heartbeat_interval
+        self.latest: dict | None = None
+        self.closed = False
+        self._wakeup: asyncio.Future | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+
+    def _wake(self) -> None:
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+        self._wakeup = None
+
+    def publish(self, event: dict) -> None:
+        self.latest = event
+        self._wake()
+
+    def close(self) -> None:
+        """End all streams, e.g. at shutdown so that open connections do not delay it."""
+        self.closed = True
+        self._wake()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            self._wake()
+
+    async def _wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._wakeup is None or self._wakeup.get_loop() is not loop:
+            self._wakeup = loop.create_future()
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        await asyncio.shield(self._wakeup)  # Cancelling one subscriber must not cancel the shared future
+
+    def _format(self, event: dict) -> str:
+        return f"id: {event.get('generation', '')}\nevent: {self.event_name}\ndata: {json.dumps(event)}\n\n"
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Yield the latest event, then every newer one, as text/event-stream chunks."""
+        metrics.sse_subscribers.inc()
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            sent = None
+            while not self.closed:
+                if self.latest is not sent:
+                    sent = self.latest
+                    yield self._format(sent)
+                await self._wait()
+                if self.latest is sent and not self.closed:
+                    yield ": ping\n\n"
+        finally:
+            metrics.sse_subscribers.dec()
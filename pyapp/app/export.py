@@ -0,0 +1,134 @@
+import csv
+import io
+from collections.abc import Iterable, Iterator
+
+# CSV export of the cached data, generated row by row.
+#
+# The files are written for Swedish Excel, like the client's table export: UTF-8 with a
+# byte order mark, ";" as delimiter and CRLF line endings. Question ids are resolved to
+# the question text and choice ids to their labels through the project's questions map.
+# Rows are produced lazily from the cache and joined into chunks of about CHUNK_SIZE
+# characters, so memory use does not grow with the size of the project.
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+CHUNK_SIZE = 64 * 1024
+BOM = "\ufeff"
+INDIVIDUAL_FORMS = ("individual", "group_member")  # Forms answered per participant
+
+
+def csv_chunks(header: list[str], rows: Iterable[list]) -> Iterator[str]:
+    """Yield the header and rows as CSV text in chunks of about CHUNK_SIZE characters."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";", lineterminator="\r\n")
+    buffer.write(BOM)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _questions(project, forms: tuple[str, ...] | None, excluded: set[str]) -> list[tuple[int, int, dict]]:
+    """Return (section_id, question_id, question) of the exported questions, in questions map order."""
+    return [
+        (secnum, qnum, q)
+        for secnum, section in project.questions.items()
+        if forms is None or section.get("form_type") in forms
+        for qnum, q in section["questions"].items()
+        if str(qnum) not in excluded
+    ]
+
+
+def _label(q: dict, value) -> str:
+    """Resolve a choice id (or list of ids) to its label."""
+    if isinstance(value, list):
+        return ", ".join(_label(q, v) for v in value)
+    return q.get("choices", {}).get(str(value), str(value))
+
+
+def _text_counts(counts: dict) -> str:
+    return "\n".join(f"{text} ({count})" if count > 1 else text for text, count in counts.items())
+
+
+def group_table(project, group_ids: list[int], excluded: set[str]) -> tuple[list[str], Iterator[list]]:
+    """
+    Return the header and rows of the groups table: one row per group with its
+    participant count, the Kön/Avgift counts and each question's aggregated value.
+    Choice questions answered per participant get one count column per choice.
+    """
+    columns = []  # (section_id, question_id, choice, question)
+    header = ["Kår-id", "Kår", "Deltagare"]
+    for secnum in ("Kön", "Avgift"):
+        for value in sorted({v for g in project.groups.values() for v in g.aggregated.get(secnum, {})}):
+            columns.append((secnum, value, None, None))
+            header.append(f"{secnum}: {value}")
+    for secnum, qnum, q in _questions(project, None, excluded):
+        if q["type"] == "choice" and project.questions[secnum].get("form_type") in INDIVIDUAL_FORMS:
+            for choice, label in q.get("choices", {}).items():
+                columns.append((secnum, qnum, int(choice), q))
+                header.append(f"{q['text']}: {label}")
+        else:
+            columns.append((secnum, qnum, None, q))
+            header.append(q["text"])
+
+    def rows() -> Iterator[list]:
+        for gid in group_ids:
+            group = project.groups[gid]
+            row = [group.id, group.name, group.num_participants]
+            for secnum, qnum, choice, q in columns:
+                value = group.aggregated.get(secnum, {}).get(qnum)
+                if choice is not None:
+                    value = (value or {}).get(choice, 0) if isinstance(value, dict) else int(value == choice)
+                elif value is None:
+                    value = ""
+                elif q and q["type"] == "choice":
+                    value = _label(q, value)  # Group answer
+                elif isinstance(value, dict):
+                    value = _text_counts(value)
+                elif isinstance(value, float) and value.is_integer():
+                    value = int(value)
+                row.append(value)
+            yield row
+
+    return header, rows()
+
+
+def individual_table(project, group_ids: list[int], excluded: set[str]) -> tuple[list[str], Iterator[list]]:
+    """
+    Return the header and rows of the individuals table: one row per participant in the
+    groups with their details and answers. Choices are resolved to their labels and
+    checkboxes to "Ja"/"Nej".
+    """
+    questions = _questions(project, INDIVIDUAL_FORMS, excluded)
+    header = ["Medlemsnummer", "Namn", "Född", "Kår", "E-post", "Mobil"] + [q["text"] for _, _, q in questions]
+
+    def rows() -> Iterator[list]:
+        for gid in group_ids:
+            group = project.groups[gid]
+            for member_no, answers in group.raw_individual_answers.items():
+                if not (participant := project.participants.get(member_no)):
+                    continue
+                row = [
+                    member_no,
+                    participant.name,
+                    participant.born,
+                    group.name,
+                    participant.get("email") or "",
+                    participant.get("mobile") or "",
+                ]
+                answers = answers or {}
+                for _, qnum, q in questions:
+                    value = answers.get(str(qnum))
+                    if value is None or value == "":
+                        value = ""
+                    elif q["type"] == "boolean":
+                        value = {"1": "Ja", "0": "Nej"}.get(value, value)
+                    elif q["type"] == "choice":
+                        value = _label(q, value)
+                    row.append(value)
+                yield row
+
+    return header, rows()
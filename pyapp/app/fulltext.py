@@ -0,0 +1,120 @@
+import heapq
+import re
+from array import array
+
+from .search import WordIndex
+from .textutils import fold_text
+
+# Full-text search over the free-text answers of a project's members and groups.
+#
+# Each text answer is a row. Its words are folded like the member names (so "not" finds
+# "nöt") and indexed in a WordIndex, where a query word also finds the words containing it:
+# "nöt" finds "Nötter" and "jordnötsallergi". A member or group matches when every query
+# word matches one of its answers, and is scored like a member name (see search.py) by
+# the best match of each query word. Answers to questions the user may not see are skipped
+# at search time, so one index serves all permission tiers.
+
+_WORD = re.compile(r"\w+")
+SNIPPET_CONTEXT = 40  # Characters shown before the first highlighted word
+SNIPPET_LENGTH = 160
+
+
+def text_answers(project) -> list[tuple[tuple[str, int], str, str]]:
+    """Return ((kind, id), question id, answer) of the text answers of a CachedProject's members and groups."""
+    answers = []
+    for section in project.questions.values():
+        for qnum, question in section["questions"].items():
+            if question["type"] != "text":
+                continue
+            qid = str(qnum)
+            if project.answers is not None:
+                for member_no, value in project.answers.scan(qid):
+                    if isinstance(value, str) and value:
+                        answers.append((("member", member_no), qid, value))
+            for group_id, group in project.groups.items():
+                if isinstance(value := group.raw_group_answers.get(qid), str) and value:
+                    answers.append((("group", group_id), qid, value))
+    return answers
+
+
+class TextIndex:
+    """Search index of the text answers of one project version, see the module comment."""
+
+    def __init__(self, answers: list[tuple[tuple[str, int], str, str]]):
+        self.owners: list[tuple[str, int]] = []  # ("member", member_no) or ("group", group_id)
+        self.owner_rows: list[list[int]] = []  # Rows of each owner's answers
+        self.row_owners = array("I")  # Owner of each row, an index in owners
+        self.questions: list[str] = []  # Question id by row
+        self.texts: list[str] = []  # Answer by row
+        owner_index: dict[tuple[str, int], int] = {}
+        word_rows: dict[str, array] = {}
+        for row, (owner, qid, text) in enumerate(answers):
+            if (i := owner_index.get(owner)) is None:
+                i = owner_index[owner] = len(self.owners)
+                self.owners.append(owner)
+                self.owner_rows.append([])
+            self.owner_rows[i].append(row)
+            self.row_owners.append(i)
+            self.questions.append(qid)
+            self.texts.append(text)
+            for word in set(_WORD.findall(fold_text(text))):
+                word_rows.setdefault(word, array("I")).append(row)
+        self.vocabulary = WordIndex(word_rows)
+
+    def search(self, query: str, excluded: set[str], k: int) -> list[tuple[tuple[str, int], list[int], set[str]]]:
+        """
+        Return the k best matching members and groups, best first, as (owner, rows of the
+        matching answers, matched words). Answers to the excluded questions are skipped.
+        """
+        words = _WORD.findall(fold_text(query))
+        if not words:
+            return []
+        weight = sum(len(word) for word in words)
+        scores: dict[int, float] | None = None
+        matched_words: set[str] = set()
+        for word in words:
+            best: dict[int, float] = {}  # Owner -> best similarity of the query word
+            for i, similarity in self.vocabulary.match(word).items():
+                matched_words.add(self.vocabulary.words[i])
+                for row in self.vocabulary.word_rows[i]:
+                    if excluded and self.questions[row] in excluded:
+                        continue
+                    owner = self.row_owners[row]
+                    if best.get(owner, 0.0) < similarity:
+                        best[owner] = similarity
+            if scores is None:
+                scores = {owner: similarity * len(word) / weight for owner, similarity in best.items()}
+            else:  # Every query word must match
+                scores = {
+                    owner: score + best[owner] * len(word) / weight for owner, score in scores.items() if owner in best
+                }
+        results = []
+        for owner in heapq.nlargest(k, scores, key=lambda owner: (scores[owner], -owner)):
+            rows = [
+                row
+                for row in self.owner_rows[owner]
+                if self.questions[row] not in excluded
+                and not matched_words.isdisjoint(_WORD.findall(fold_text(self.texts[row])))
+            ]
+            results.append((self.owners[owner], rows, matched_words))
+        return results
+
+    def snippet(self, row: int, matched_words: set[str]) -> tuple[str, list[tuple[int, int]]]:
+        """Return a snippet of an answer around its first matching word, and the (start, end) of the matches in it."""
+        text = self.texts[row]
+        spans = [
+            m.span()
+            for m in _WORD.finditer(text)
+            if any(word in matched_words for word in _WORD.findall(fold_text(m.group())))
+        ]
+        first = spans[0][0] if spans else 0
+        start = max(0, first - SNIPPET_CONTEXT)
+        if start > 0 and (space := text.find(" ", start, first)) >= 0:
+            start = space + 1  # Start at a word
+        end = min(len(text), start + SNIPPET_LENGTH)
+        if end < len(text) and (space := text.rfind(" ", first, end)) > first:
+            end = space  # End at a word
+        prefix = "…" if start > 0 else ""
+        snippet = prefix + text[start:end] + ("…" if end < len(text) else "")
+        offset = len(prefix) - start
+        return snippet, [(s + offset, e + offset) for s, e in spans if s >= start and e <= end]
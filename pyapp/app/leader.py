@@ -0,0 +1,70 @@
+import fcntl
+import json
+import logging
+import os
+import socket
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshLease:
+    """
+    A lease stored as a small JSON file on the shared PERSIST_DIR volume.
+
+    The holder must renew the lease well within its time to live. When the holder stops
+    renewing (crash, pod deleted, network partition) the lease expires and any other
+    instance can take it. Updates are serialized with flock where the volume supports it,
+    and every write is read back to detect a concurrent writer that won the race.
+    """
+
+    def __init__(self, path: Path, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+
+    @contextmanager
+    def _mutex(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            except OSError:
+                pass  # Volume without lock support: rely on the read-back check
+            yield
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, lease: dict) -> None:
+        tmp = self.path.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps(lease))
+        os.replace(tmp, self.path)
+
+    def acquire(self) -> bool:
+        """Take or renew the lease. Returns True if this instance holds it afterwards."""
+        with self._mutex():
+            lease = self._read()
+            now = time.time()
+            if lease.get("holder") not in (None, self.holder) and lease.get("expires", 0) > now:
+                return False
+            self._write({"holder": self.holder, "expires": now + self.ttl})
+            return self._read().get("holder") == self.holder
+
+    def renew(self) -> bool:
+        """Extend the lease. Returns False if it has been lost to another instance."""
+        with self._mutex():
+            if self._read().get("holder") != self.holder:
+                return False
+            self._write({"holder": self.holder, "expires": time.time() + self.ttl})
+            return True
+
+    def release(self) -> None:
+        with self._mutex():
+            if self._read().get("holder") == self.holder:
+                self.path.unlink(missing_ok=True)
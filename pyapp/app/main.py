@@ -6,15 +6,17 @@ from pathlib import Path
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import FileResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
 from prometheus_fastapi_instrumentator import Instrumentator, metrics
 
 from .authenctication import AuthUser, require_auth_user
+from .compression import CompressionMiddleware
 from .config import get_settings
-from .scoutnet import scoutnet_init, scoutnet_router, scoutnet_shutdown
-from .stats import stats_router
+from .profiling import ProfilingMiddleware
+from .scoutnet import get_cache_status, scoutnet_init, scoutnet_router, scoutnet_shutdown
+from .static_assets import StaticAssets
+from .stats import stats_router, stats_shutdown
 
 # --- Create instrumentor, settings and logger objects ---
 instrumentator = Instrumentator(
@@ -44,6 +46,7 @@ async def lifespan(app: FastAPI):
     logger.info("Server ready to accept requests!")
     yield  # Run FastAPI!
     await scoutnet_shutdown()
+    stats_shutdown()  # Persist the request counts used for prewarming
 
 
 # --- Initialize FastAPI app with the lifespan manager and session middleware ---
@@ -61,6 +64,15 @@ instrumentator.instrument(app)  # Adds Prometheus middleware during initializati
 instrumentator.expose(app)  # Registers /metrics endpoint before other catch-all routes
 
 
+# --- Add response compression (br/gzip) ---
+app.add_middleware(CompressionMiddleware)
+
+
+# --- Add on-demand request profiling ---
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+
 # --- Include the API routers ---
 app.include_router(stats_router, prefix=settings.API_PREFIX)
 app.include_router(scoutnet_router, prefix=settings.API_PREFIX)
@@ -86,6 +98,26 @@ async def app_config(user: AuthUser = Depends(require_auth_user)):
     }
 
 
+# --- Liveness and readiness probes ---
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness: the server process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    """
+    Readiness: the cache holds data (possibly stale, see "stale" and "age_s").
+    Returns 503 until the first disk snapshot or Scoutnet refresh has been loaded.
+    """
+    cache_status = get_cache_status()
+    return JSONResponse(
+        cache_status,
+        status_code=status.HTTP_200_OK if cache_status["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
 # --- Custom Swagger UI route with configurable root path ---
 @app.get(f"{settings.API_PREFIX}/docs", include_in_schema=False)
 async def custom_swagger_ui_html(request: Request):
@@ -123,28 +155,21 @@ async def custom_openapi(request: Request):
 # because routes are matched in declaration order.
 STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
 if STATIC_DIR.exists():  # Yes! We are running in a container
-    # Mount the static directory for /assets
-    app.mount("/assets", StaticFiles(directory=str(STATIC_DIR / "assets")), name="assets")
-
-    templates = Jinja2Templates(directory=str(STATIC_DIR))  # For templating index.html
+    # index.html is templated with the settings once, then all files are served from memory
+    templates = Jinja2Templates(directory=str(STATIC_DIR))
+    index_html = templates.get_template("index.html").render(dict(settings)).encode()  # Add environment variables
+    static_assets = StaticAssets(STATIC_DIR, rendered={"index.html": index_html})
 
     @app.get("/{full_path:path}", include_in_schema=False)
     async def serve_react_app(request: Request, full_path: str):
         """
-        Catch-all endpoint to serve the React files outside 'assets'
+        Catch-all endpoint to serve the React files, including 'assets'
         """
         if not full_path:
             full_path = "index.html"
-        file_path = STATIC_DIR / full_path
-        if not file_path.exists():
+        if not (response := static_assets.response(request, full_path)):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
-
-        if full_path == "index.html":
-            return templates.TemplateResponse(
-                request=request, name="index.html", context=dict(settings)
-            )  # Add environment variables
-        else:
-            return FileResponse(str(file_path))
+        return response
 
 else:  # Running locally
     # --- Add a root endpoint for basic API health check ---
@@ -0,0 +1,112 @@
+import sys
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Prometheus metrics for the Scoutnet refresh pipeline and the project cache.
+# HTTP request metrics are handled by the instrumentator in main.py.
+
+_FETCH_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, float("inf"))
+_PHASE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+scoutnet_fetch_seconds = Histogram(
+    "signupinfo_scoutnet_fetch_seconds",
+    "Duration of Scoutnet API requests",
+    ["project", "endpoint"],
+    buckets=_FETCH_BUCKETS,
+)
+scoutnet_fetch_bytes = Gauge(
+    "signupinfo_scoutnet_fetch_bytes",
+    "Size of the last Scoutnet API response body",
+    ["project", "endpoint"],
+)
+scoutnet_fetch_errors = Counter(
+    "signupinfo_scoutnet_fetch_errors_total",
+    "Failed Scoutnet API requests",
+    ["project", "endpoint"],
+)
+scoutnet_circuit_open = Gauge(
+    "signupinfo_scoutnet_circuit_open",
+    "1 while the circuit breaker of a project's Scoutnet endpoint rejects requests",
+    ["project", "endpoint"],
+)
+decode_seconds = Histogram(
+    "signupinfo_decode_seconds",
+    "Duration of decoding one project's Scoutnet data",
+    ["project"],
+    buckets=_PHASE_BUCKETS,
+)
+persist_seconds = Histogram(
+    "signupinfo_persist_seconds",
+    "Duration of writing the cache to disk",
+    buckets=_PHASE_BUCKETS,
+)
+refresh_seconds = Histogram(
+    "signupinfo_refresh_seconds",
+    "Duration of a full cache refresh (fetch, decode and persist)",
+    buckets=_FETCH_BUCKETS,
+)
+refresh_failures = Counter("signupinfo_refresh_failures_total", "Failed project refreshes", ["project"])
+refresh_retries = Counter("signupinfo_refresh_retries_total", "Retries of failed scheduled cache refreshes")
+
+cache_participants = Gauge("signupinfo_cache_participants", "Number of cached participants", ["project"])
+cache_groups = Gauge("signupinfo_cache_groups", "Number of cached groups", ["project"])
+cache_bytes = Gauge("signupinfo_cache_bytes", "Approximate in-memory size of the cached project data", ["project"])
+cache_generation = Gauge("signupinfo_cache_generation", "Generation number of the cached data")
+cache_updated_timestamp = Gauge(
+    "signupinfo_cache_updated_timestamp_seconds", "Unix time when the cached data was fetched from Scoutnet"
+)
+cache_age = Gauge("signupinfo_cache_age_seconds", "Age of the cached data")
+
+response_cache_requests = Counter(
+    "signupinfo_response_cache_requests_total", "Lookups in a per-generation response cache", ["cache", "result"]
+)
+response_cache_evictions = Counter(
+    "signupinfo_response_cache_evictions_total", "Least recently used entries evicted from a response cache", ["cache"]
+)
+response_cache_entries = Gauge("signupinfo_response_cache_entries", "Entries in a response cache", ["cache"])
+
+sse_subscribers = Gauge("signupinfo_sse_subscribers", "Open server-sent event streams")
+
+
+def observe_cache_bytes(projects: dict) -> None:
+    """Update cache_bytes. Walks the whole cache, so run it in a worker thread."""
+    for project in projects.values():
+        cache_bytes.labels(str(project.project_id)).set(approx_size(project))
+
+
+def approx_size(obj) -> int:
+    """
+    Approximate the deep memory footprint of an object graph in bytes.
+    Shared objects (e.g. interned strings) are only counted once.
+    """
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__"):
+            stack.append(o.__dict__)
+        elif hasattr(o, "__slots__"):
+            stack.extend(getattr(o, name) for name in o.__slots__ if hasattr(o, name))
+    return size
+
+
+def observe_cache(cache) -> None:
+    """Update the cache gauges after a refresh or a load from disk, except cache_bytes, see observe_cache_bytes."""
+    for project in cache.projects.values():
+        label = str(project.project_id)
+        cache_participants.labels(label).set(len(project.participants))
+        cache_groups.labels(label).set(len(project.groups))
+    cache_generation.set(cache.generation)
+    cache_updated_timestamp.set(cache.updated_at)
+    cache_age.set_function(lambda: time.time() - cache.updated_at if cache.updated_at else 0.0)
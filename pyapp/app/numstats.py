@@ -0,0 +1,78 @@
+import math
+
+# Mergeable distribution statistics of the answers to a number question.
+#
+# Each group keeps the count, sum, min and max of its answers and a histogram, so the
+# statistics of any set of groups are the merge of the groups' statistics, without looking
+# at the individual answers. Small integers (the answers to most questions, such as the
+# number of tents) are counted exactly. Other values are counted in logarithmic buckets,
+# each represented by a value within RELATIVE_ACCURACY of every value in it, so the
+# histogram stays small for any range of values and quantiles are within that accuracy.
+
+EXACT_LIMIT = 1000  # Integers up to this magnitude are counted exactly
+RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+QUANTILES = {"p25": 0.25, "median": 0.5, "p75": 0.75, "p90": 0.9}
+
+
+def _bucket(value: float) -> float:
+    """Return the value counted for an answer: itself for small integers, else its bucket's."""
+    if value.is_integer() and abs(value) <= EXACT_LIMIT:
+        return value
+    index = math.ceil(math.log(abs(value)) / _LOG_GAMMA)  # Bucket (gamma^(index-1), gamma^index]
+    return math.copysign(2 * _GAMMA**index / (_GAMMA + 1), value)
+
+
+class NumberStats:
+    """Count, sum, min, max and histogram of number answers, see the module comment."""
+
+    __slots__ = ("count", "histogram", "max", "min", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.histogram: dict[float, int] = {}  # Counted value -> number of answers
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        key = _bucket(value)
+        self.histogram[key] = self.histogram.get(key, 0) + 1
+
+    def merge(self, other: "NumberStats") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for key, count in other.histogram.items():
+            self.histogram[key] = self.histogram.get(key, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """Return the nearest-rank q-quantile, None without answers."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        if rank == 1 or rank == self.count:
+            return self.min if rank == 1 else self.max  # Known exactly
+        seen = 0
+        for key in sorted(self.histogram):
+            seen += self.histogram[key]
+            if seen >= rank:
+                return min(max(key, self.min), self.max)  # A bucket's value may be just outside the answers
+        return self.max
+
+    def summary(self) -> dict:
+        """Return the statistics as JSON-able numbers, integers where they are whole."""
+        if not self.count:
+            return {"count": 0}
+        values = {"sum": self.total, "mean": self.total / self.count, "min": self.min, "max": self.max}
+        values |= {name: self.quantile(q) for name, q in QUANTILES.items()}
+        return {"count": self.count} | {
+            name: int(value) if value.is_integer() else round(value, 6) for name, value in values.items()
+        }
@@ -0,0 +1,150 @@
+import json
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columnar export of a project for analysis in pandas, polars, DuckDB etc.
+#
+# Each project is written as one Parquet file per table, with typed columns:
+#   participants: member_no, name, born (date), registration_group, member_group, email, mobile
+#   answers:      member_no, group_id and one column per individual question, named by its id
+#   groups:       group_id, name, num_participants, Kön/Avgift counts and one column per group question
+#   questions:    section and question ids and texts, question type and choice labels
+# Choices are stored as dictionary-encoded labels, checkboxes as booleans and numbers as
+# floats (answers) or ints (group answers). The answer columns are read straight from the
+# AnswerStore columns, without decoding the answers per member.
+
+TABLES = ("participants", "answers", "groups", "questions")
+_CHOICES_TYPE = pa.list_(pa.struct([("value", pa.string()), ("label", pa.string())]))
+
+
+def _date(value: str) -> date | None:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _question_map(project) -> dict[str, tuple[int, dict]]:
+    """Return question id -> (section_id, question) of all questions in the project."""
+    return {str(qnum): (secnum, q) for secnum, sec in project.questions.items() for qnum, q in sec["questions"].items()}
+
+
+def _labels(q: dict, values: list) -> pa.Array:
+    choices = q.get("choices", {})
+    labels = [None if v is None else choices.get(str(v), str(v)) for v in values]
+    return pa.array(labels, pa.string()).dictionary_encode()
+
+
+def participants_table(project) -> pa.Table:
+    participants = list(project.participants.items())
+    return pa.table(
+        {
+            "member_no": pa.array([m for m, _ in participants], pa.int64()),
+            "name": pa.array([p.name for _, p in participants], pa.string()),
+            "born": pa.array([_date(p.born) for _, p in participants], pa.date32()),
+            "registration_group": pa.array([p.registration_group for _, p in participants], pa.int64()),
+            "member_group": pa.array([p.member_group for _, p in participants], pa.int64()),
+            "email": pa.array([p.get("email") for _, p in participants], pa.string()),
+            "mobile": pa.array([p.get("mobile") for _, p in participants], pa.string()),
+        }
+    )
+
+
+def answers_table(project) -> pa.Table:
+    store = project.answers
+    questions = _question_map(project)
+    fields = [pa.field("member_no", pa.int64()), pa.field("group_id", pa.int64())]
+    if store is None:
+        return pa.Table.from_arrays([pa.array([], pa.int64())] * 2, schema=pa.schema(fields))
+    columns = [pa.array(store.row_members, pa.int64()), pa.array(store.row_groups, pa.int64())]
+    for qid in store.questions:
+        secnum, q = questions.get(qid, (None, {}))
+        kind, values = store.column(qid)
+        if kind == "choice":
+            column = _labels(q, values)
+        elif kind == "boolean":
+            column = pa.array(values, pa.bool_())
+        elif kind == "number":
+            column = pa.array(values, pa.float64())
+        elif q.get("type") == "choice":  # Multiple choice: a list of labels
+            choices = q.get("choices", {})
+            labels = [
+                None if v is None else [choices.get(str(c), str(c)) for c in (v if isinstance(v, list) else [v])]
+                for v in values
+            ]
+            column = pa.array(labels, pa.list_(pa.string()))
+        else:
+            column = pa.array([v if v is None or isinstance(v, str) else json.dumps(v) for v in values], pa.string())
+        metadata = {"question": q.get("text", ""), "section_id": str(secnum or "")}
+        fields.append(pa.field(qid, column.type, metadata=metadata))
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=pa.schema(fields))
+
+
+def groups_table(project) -> pa.Table:
+    groups = list(project.groups.values())
+    columns = {
+        "group_id": pa.array([g.id for g in groups], pa.int64()),
+        "name": pa.array([g.name for g in groups], pa.string()),
+        "num_participants": pa.array([g.num_participants for g in groups], pa.int64()),
+    }
+    for secnum in ("Kön", "Avgift"):
+        for value in sorted({v for g in groups for v in g.aggregated.get(secnum, {})}):
+            counts = [g.aggregated.get(secnum, {}).get(value, 0) for g in groups]
+            columns[f"{secnum}: {value}"] = pa.array(counts, pa.int64())
+    for secnum, sec in project.questions.items():
+        if sec.get("form_type") != "group":
+            continue
+        for qnum, q in sec["questions"].items():
+            values = [g.aggregated.get(secnum, {}).get(qnum) for g in groups]
+            if q["type"] == "choice":
+                column = _labels(q, values)
+            elif q["type"] == "boolean":
+                column = pa.array([None if v is None else v == "Ja" for v in values], pa.bool_())
+            elif q["type"] == "number":
+                column = pa.array(values, pa.int64())
+            else:
+                column = pa.array([None if v is None else str(v) for v in values], pa.string())
+            columns[str(qnum)] = column
+    return pa.table(columns)
+
+
+def questions_table(project) -> pa.Table:
+    rows = [(secnum, sec, qnum, q) for secnum, sec in project.questions.items() for qnum, q in sec["questions"].items()]
+    return pa.table(
+        {
+            "section_id": pa.array([secnum for secnum, _, _, _ in rows], pa.int64()),
+            "section": pa.array([sec["text"] for _, sec, _, _ in rows], pa.string()),
+            "form_type": pa.array([sec.get("form_type") for _, sec, _, _ in rows], pa.string()),
+            "question_id": pa.array([qnum for _, _, qnum, _ in rows], pa.int64()),
+            "question": pa.array([q["text"] for _, _, _, q in rows], pa.string()),
+            "type": pa.array([q["type"] for _, _, _, q in rows], pa.string()),
+            "choices": pa.array(
+                [[{"value": v, "label": label} for v, label in q.get("choices", {}).items()] for _, _, _, q in rows],
+                _CHOICES_TYPE,
+            ),
+        }
+    )
+
+
+def write_export(project, directory: Path) -> None:
+    """
+    Write all tables of a project as <table>.parquet files into a new directory.
+    The directory appears complete or not at all; if another process created it first, its files are kept.
+    """
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=directory.parent))
+    try:
+        for name, build in zip(TABLES, (participants_table, answers_table, groups_table, questions_table)):
+            pq.write_table(build(project), tmp / f"{name}.parquet", compression="zstd")
+        tmp.rename(directory)
+    except OSError:
+        if not directory.exists():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,79 @@
+import fcntl
+import json
+import logging
+import math
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Request counts per cached response, used to prewarm the most requested responses after
+# each refresh (see stats.py).
+#
+# Every worker counts its own requests and adds them to a JSON file in PERSIST_DIR on
+# save(), so the counts of all workers are combined and survive restarts. Counts decay
+# with a half-life of HALF_LIFE seconds: responses that were popular last week give way
+# to those popular today. Only the MAX_KEYS highest counts are kept, in the file and in
+# the pending counts of a worker.
+
+HALF_LIFE = 3 * 24 * 3600
+MAX_KEYS = 1000
+
+
+def _encode_key(key: tuple) -> str:
+    return json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode_key(text: str) -> tuple:
+    return tuple(tuple(part) if isinstance(part, list) else part for part in json.loads(text))
+
+
+class Popularity:
+    """Decaying request counts per key (a tuple of JSON values), see the module comment."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.counts: dict[tuple, float] = {}  # Combined counts as of the last load or save
+        self.pending: Counter = Counter()  # Requests to this worker since the last save
+
+    def record(self, key: tuple) -> None:
+        self.pending[key] += 1
+        if len(self.pending) > MAX_KEYS:  # E.g. many different group selections
+            self.pending = Counter(dict(self.pending.most_common(MAX_KEYS // 2)))  # Halved, to trim less often
+
+    def top(self, k: int) -> list[tuple]:
+        """Return the k most requested keys, most requested first."""
+        counts = Counter(self.counts)
+        counts.update(self.pending)
+        return [key for key, _ in counts.most_common(k)]
+
+    def _read(self) -> dict[tuple, float]:
+        try:
+            data = json.loads(self.path.read_text())
+            decay = math.pow(0.5, max(time.time() - data["t"], 0) / HALF_LIFE)
+            return {_decode_key(key): count * decay for key, count in data["counts"].items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:  # E.g. "{}" or another format
+            logger.warning("Ignoring unreadable %s: %s", self.path, exc)
+            return {}
+
+    def save(self) -> None:
+        """Add the pending counts to the file, and load the counts of all workers from it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # Serialize read-modify-write with other workers
+            except OSError:
+                pass  # Volume without lock support: a concurrent save may be lost
+            counts = Counter(self._read())
+            counts.update(self.pending)
+            counts = dict(counts.most_common(MAX_KEYS))
+            tmp = self.path.with_suffix(f".tmp{os.getpid()}")
+            data = {"t": time.time(), "counts": {_encode_key(key): round(n, 3) for key, n in counts.items()}}
+            tmp.write_text(json.dumps(data, ensure_ascii=False))
+            os.replace(tmp, self.path)
+        self.counts = counts
+        self.pending.clear()
@@ -0,0 +1,126 @@
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException, Request
+
+from .authenctication import require_auth_user
+from .config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = settings.PERSIST_DIR / "profiles"
+PROFILE_PERMISSION = "j26-signupinfo:all:read"
+SAMPLE_INTERVAL = 0.002  # Seconds between stack samples
+
+
+class _StackSampler:
+    """
+    Samples the call stack of one thread at a fixed interval from a background thread.
+    Stacks are stored in the "folded" format used by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self._stop.is_set():
+            self._stop.set()
+            self._thread.join()
+            self.duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_qualname} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def save(self, path: str) -> str:
+        """Write the folded stacks under PROFILE_DIR and return the file name."""
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+        name = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{slug}.folded"
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}" for stack, count in self.samples.most_common()]
+        (PROFILE_DIR / name).write_text("\n".join(lines) + "\n")
+        return name
+
+
+def _profile_requested(scope) -> bool:
+    for key, value in scope["headers"]:
+        if key == b"x-profile" and value.lower() in (b"1", b"true"):
+            return True
+    if b"profile=" in scope["query_string"]:
+        return parse_qs(scope["query_string"].decode()).get("profile", [""])[0].lower() in ("1", "true")
+    return False
+
+
+async def _is_privileged(scope) -> bool:
+    try:
+        user = await require_auth_user(Request(scope))
+    except HTTPException:
+        return False
+    return PROFILE_PERMISSION in user.permissions
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request when it carries an "X-Profile: 1" header or a "profile=1"
+    query parameter and the user has the j26-signupinfo:all:read permission.
+
+    The sampler runs from the start of the request until the response headers are sent,
+    which covers authentication, cache lookups, aggregation and JSON serialization.
+    The profile is stored under PERSIST_DIR/profiles and its file name is returned in
+    the "X-Profile-File" response header. Other concurrent requests on the event loop
+    will show up in the profile too.
+    Only installed when PROFILING_ENABLED is set, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope) or not await _is_privileged(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = _StackSampler(threading.get_ident())
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                sampler.stop()
+                name = sampler.save(scope["path"])
+                logger.info(
+                    "Profiled %s: %.1f ms, %d samples -> %s",
+                    scope["path"],
+                    sampler.duration * 1000,
+                    sum(sampler.samples.values()),
+                    name,
+                )
+                message["headers"] = [*message.get("headers", []), (b"x-profile-file", name.encode())]
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
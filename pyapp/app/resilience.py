@@ -0,0 +1,51 @@
+import random
+import time
+
+# Failure handling for the Scoutnet refresh pipeline.
+#
+# A failed project refresh is retried after an exponentially growing delay with jitter,
+# so that a flaky project neither waits a fixed hour nor retries in lockstep with the
+# others. A CircuitBreaker per project and Scoutnet endpoint stops sending requests to an
+# endpoint that keeps failing for the project: after FAILURE_THRESHOLD failures in a row it
+# opens and requests fail right away, until one trial request is let through after OPEN_SECONDS.
+
+FAILURE_THRESHOLD = 5  # Failures in a row that open a circuit
+OPEN_SECONDS = 300.0  # Seconds an open circuit rejects requests before the next trial
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Seconds to wait before retry number attempt (1, 2, ...): base doubling up to cap, minus up to half of it."""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """Consecutive failure counter for one endpoint, see the module comment."""
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, open_seconds: float = OPEN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.failures = 0  # Failures in a row
+        self.opened_at: float | None = None  # Monotonic time the circuit opened or let the last trial through
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.open_seconds:
+            return False
+        self.opened_at = time.monotonic()  # Let one trial through, the next one after another period
+        return True
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
@@ -0,0 +1,116 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from pydantic import BaseModel
+
+# Answer rules that patch the Scoutnet answers of a project before they are decoded.
+#
+# The J26 forms show some questions only after a certain answer to another question, but
+# Scoutnet keeps answers to questions that were later hidden again. The rules drop those
+# answers. A rule file has a list of rules for the individual and the group answers,
+# applied in order, and the ids of questions whose answers Scoutnet returns JSON encoded:
+#
+#   {
+#     "individual": [{"question": "90433", "value": "1", "drop": ["88201"], "note": "Health consent"}],
+#     "group": [],
+#     "decode_json": ["91453"]
+#   }
+#
+# A rule drops the "drop" answers when the answer to "question" is not "value", and adds
+# the "default" answers that are missing when it is. A dropped answer counts as missing
+# for the rules after it.
+#
+# Rules are compiled per refresh. The result of the rules only depends on whether each
+# rule's condition holds and whether each default answer is present. Compiling collects
+# the conditions and default answers in one tuple, so that this key is computed in one
+# comprehension, and applies the result computed for the first member with the same key:
+# the answers to drop and the answers to add, including those dropped by a rule because
+# an earlier rule dropped its question.
+
+DEFAULT_RULES = Path(__file__).with_name("j26_rules.json")
+_MISSING = object()  # The value of a missing answer in the key, see CompiledRules
+
+
+class AnswerRule(BaseModel):
+    question: str
+    value: str
+    drop: list[str] = []  # Dropped if the answer to question is not value
+    default: dict[str, str] = {}  # Added if missing and the answer to question is value
+    note: str = ""
+
+
+class AnswerRules(BaseModel):
+    individual: list[AnswerRule] = []
+    group: list[AnswerRule] = []
+    decode_json: list[str] = []
+
+
+def _decode_json(q: dict, key: str) -> None:
+    try:
+        decoded = json.loads(q[key])
+    except (json.JSONDecodeError, TypeError):
+        return
+    if isinstance(decoded, dict) and "value" in decoded:
+        q[key] = decoded["value"]
+
+
+class CompiledRules:
+    """A list of AnswerRules compiled for applying to many answer dicts, see the module comment."""
+
+    def __init__(self, rules: list[AnswerRule], decode_json: list[str] = ()):
+        self.rules = rules
+        self.conditions = tuple(dict.fromkeys((rule.question, rule.value) for rule in rules))
+        self.defaults = tuple(dict.fromkeys(key for rule in rules for key in rule.default))
+        self.decode_json = frozenset(decode_json)
+        # Key -> (answers to drop or decode, answers to drop, answers to add)
+        self.outcomes: dict[tuple, tuple[frozenset, frozenset, dict]] = {}
+        self.apply = self._compile()  # Applies the rules to a member's or group's answers, in place
+
+    def _compile(self) -> Callable[[dict], None]:
+        # The key of an answer dict: whether each condition holds and whether each default answer is missing
+        terms = self.conditions + tuple((key, _MISSING) for key in self.defaults)
+        outcomes, outcome = self.outcomes, self._outcome
+
+        def apply(q: dict) -> None:
+            get = q.get
+            key = tuple([get(question, _MISSING) == value for question, value in terms])
+            try:
+                touched, dropped, added = outcomes[key]
+            except KeyError:
+                touched, dropped, added = outcomes[key] = outcome(key)
+            if added:
+                q.update(added)
+            for answer in touched.intersection(q):
+                if answer in dropped:
+                    del q[answer]
+                else:
+                    _decode_json(q, answer)
+
+        return apply
+
+    def _outcome(self, key: tuple) -> tuple[frozenset, frozenset, dict]:
+        """Apply the rules one by one to the conditions and default answers of a key."""
+        holds = dict(zip(self.conditions, key))
+        present = {answer: not missing for answer, missing in zip(self.defaults, key[len(self.conditions) :])}
+        dropped, added = set(), {}
+        for rule in self.rules:
+            if rule.question in added:
+                matches = added[rule.question] == rule.value
+            else:
+                matches = rule.question not in dropped and holds[(rule.question, rule.value)]
+            if not matches:
+                dropped.update(rule.drop)
+                for answer in rule.drop:
+                    added.pop(answer, None)
+                continue
+            for answer, value in rule.default.items():
+                if answer not in added and (answer in dropped or not present[answer]):
+                    added[answer] = value
+                    dropped.discard(answer)
+        return self.decode_json | dropped, frozenset(dropped), added
+
+
+def load_rules(path: str | Path = "") -> AnswerRules:
+    """Load a rule file, default the J26 rules."""
+    return AnswerRules.model_validate_json(Path(path or DEFAULT_RULES).read_text())
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+# Minimal cron expressions for the refresh schedules: "minute hour day-of-month month day-of-week".
+# Each field is "*", a number, a range "a-b", a list "a,b" or any of those with a step "/n".
+# Day of week is 0-6 from Sunday (7 is Sunday too). As in cron, a time matches when both
+# day fields match, or either of them if neither is "*".
+
+_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_field(text: str, low: int, high: int) -> set[int]:
+    values = set()
+    for part in text.split(","):
+        part, _, step = part.partition("/")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+        else:
+            start = end = int(part)
+            if step:
+                end = high
+        if not low <= start <= end <= high:
+            raise ValueError(f"Value out of range {low}-{high}: {part}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return values
+
+
+class CronSchedule:
+    """A parsed cron expression, see the module comment."""
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(_FIELDS):
+            raise ValueError(f"Expected {len(_FIELDS)} fields in cron expression: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(text, low, high) for text, (_, low, high) in zip(parts, _FIELDS)
+        )
+        self.weekdays = {d % 7 for d in weekdays}
+        self.any_day, self.any_weekday = parts[2] == "*", parts[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day = dt.day in self.days
+        weekday = (dt.weekday() + 1) % 7 in self.weekdays  # Python counts from Monday
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, dt: datetime) -> datetime:
+        """Return the first matching time after dt, in the time zone of dt."""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=9 * 366)  # A matching expression matches within 8 years, e.g. on February 29
+        while dt <= limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
@@ -4,18 +4,41 @@ import hashlib
 import json
 import logging
 import os
+import random
+import shutil
+import sys
 import time
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable, Collection, Iterator, Mapping
 from contextlib import suppress
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from . import metrics
+from .answers import STORE_TYPES, AnswerStore
 from .authenctication import AuthUser, require_auth_user
+from .changes import ChangesUnavailable, diff_project, merge_diffs
 from .config import ProjectConfig, get_settings
+from .events import Broadcaster
+from .export import group_table, individual_table
+from .fulltext import TextIndex, text_answers
+from .leader import RefreshLease
+from .numstats import NumberStats
+from .parquet_export import write_export
+from .resilience import CircuitBreaker, backoff_delay
+from .schedule import CronSchedule
+from .search import MemberIndex
+from .snapshot import load_snapshot, read_snapshot_generation, write_snapshot
+from .textutils import normalize_text_answer
+from .trends import TrendStore
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -25,7 +48,19 @@ logging.getLogger("asyncio").setLevel(logging.ERROR)
 
 PROJECT_API = "https://www.scoutnet.se/api/project/get"
 CACHE_DIR = Path(".dev_cache")
-CACHE_FILE = settings.PERSIST_DIR / "project_cache.json"
+CACHE_FILE = settings.PERSIST_DIR / "project_cache.snapshot"
+LEASE_FILE = settings.PERSIST_DIR / "refresh.lease"
+REFRESH_REQUEST_FILE = settings.PERSIST_DIR / "refresh.request"
+REFRESH_STATUS_FILE = settings.PERSIST_DIR / "refresh.status"
+TREND_FILE = settings.PERSIST_DIR / "trends.jsonl"
+EXPORT_DIR = settings.PERSIST_DIR / "exports"  # Parquet exports, one directory per project version
+SNAPSHOT_POLL_INTERVAL = 5  # Seconds between checks for a new snapshot generation
+REFRESH_REQUEST_TIMEOUT = 300  # Seconds to wait for a refresh run by another worker
+FOLLOWER_START_TIMEOUT = 120  # Seconds a follower waits at startup for the first snapshot
+CHANGE_HISTORY = 60  # Number of generations to keep participant changes for
+REFRESH_RETRY_BASE = 60  # Seconds before the first retry of a failed project refresh, doubled per retry
+REFRESH_RETRY_MAX = 3600  # Max seconds between retries of a failed project refresh
+TIMEZONE = ZoneInfo("Europe/Stockholm")  # Time zone of the refresh schedules
 
 
 class ScoutnetRequestError(RuntimeError):
@@ -46,6 +81,75 @@ class ScoutnetProjectData:
     questions: dict  # Combined: {"sections": {...}, "questions": {...}}
 
 
+class Participant:
+    """
+    Compact record for one cached participant.
+
+    Uses __slots__ instead of a per-participant dict, interned strings and the birth date
+    stored as an int (YYYYMMDD). Supports the read-only dict interface the API layer uses
+    (p["name"], p.get(...), {**p}). Contact fields that were never set are absent, just as
+    when the participant was a plain dict.
+    """
+
+    __slots__ = ("_born", "email", "member_group", "mobile", "name", "registration_group")
+    _KEYS = ("name", "born", "registration_group", "member_group", "email", "mobile")
+
+    def __init__(self, name: str, born: str, registration_group: int, member_group: int, **contact):
+        self.name = sys.intern(name)
+        self._born = _encode_date(born)
+        self.registration_group = registration_group
+        self.member_group = member_group
+        self.update(contact)
+
+    @property
+    def born(self) -> str:
+        if isinstance(self._born, int):
+            return f"{self._born // 10000:04d}-{self._born // 100 % 100:02d}-{self._born % 100:02d}"
+        return self._born
+
+    def update(self, values: dict) -> None:
+        for key, value in values.items():
+            if key not in ("email", "mobile"):
+                raise KeyError(key)
+            setattr(self, key, value)
+
+    def keys(self) -> list[str]:
+        return [k for k in self._KEYS if k == "born" or hasattr(self, k)]
+
+    def items(self) -> list[tuple]:
+        return [(k, getattr(self, k)) for k in self.keys()]
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self._KEYS else default
+
+    def __getitem__(self, key: str):
+        if key not in self._KEYS or not hasattr(self, key):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEYS and hasattr(self, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Participant) and self.items() == other.items()
+
+    def __repr__(self) -> str:
+        return f"Participant({dict(self.items())!r})"
+
+
+def _encode_date(date: str) -> int | str:
+    """Encode an ISO date (YYYY-MM-DD) as an int (YYYYMMDD). Anything else is kept as a string."""
+    if len(date) == 10 and date[4] == date[7] == "-" and (digits := date[:4] + date[5:7] + date[8:]).isdigit():
+        return int(digits)
+    return sys.intern(date)
+
+
 @dataclass
 class CachedGroup:
     """Decoded data for a single group within a project."""
@@ -54,9 +158,10 @@ class CachedGroup:
     name: str
     num_participants: int = 0
     aggregated: dict = field(default_factory=dict)  # section_title -> {question_key: counts/values}
-    raw_individual_answers: dict = field(default_factory=dict)  # member_no -> {question_key: value}
+    raw_individual_answers: Mapping = field(default_factory=dict)  # member_no -> {question_key: value}, GroupAnswers
     raw_group_answers: dict = field(default_factory=dict)  # question_key -> raw value
     contact: dict | None = None
+    number_stats: dict | None = None  # Number question -> NumberStats of its answers, None in old snapshots
 
 
 @dataclass
@@ -65,9 +170,13 @@ class CachedProject:
 
     project_id: int
     project_name: str
-    participants: dict = field(default_factory=dict)  # member_no -> {name, born, ...}
+    participants: dict = field(default_factory=dict)  # member_no -> Participant
     questions: dict = field(default_factory=dict)  # decoded questions dict from Scoutnet
     groups: dict = field(default_factory=dict)  # group_id -> CachedGroup
+    answers: AnswerStore | None = None  # Encoded individual answers of all participants
+    fingerprint: str = ""  # Hash of the raw Scoutnet data, changes when anything in the project changed
+    member_hashes: dict | None = None  # member_no -> details and answers hash, see changes.py
+    updated_at: float = 0.0  # Unix time this project was last fetched from Scoutnet, 0 in old snapshots
 
 
 @dataclass
@@ -76,25 +185,46 @@ class ProjectCache:
 
     projects: dict = field(default_factory=dict)  # project_id -> CachedProject
     group_map: dict[int, str] = field(default_factory=dict)  # A non project related map of all groups in Scoutnet
+    generation: int = 0  # Incremented on every successful refresh
+    updated_at: float = 0.0  # Unix time of the last successful refresh
+    changes: dict = field(default_factory=dict)  # generation -> project_id -> diff from the previous generation
+
+
+# Classes of the instances in the cache, the only ones a disk snapshot can hold
+_SNAPSHOT_TYPES = {
+    cls.__name__: cls for cls in (ProjectCache, CachedProject, CachedGroup, Participant, NumberStats, *STORE_TYPES)
+}
 
 
 # --- Globals ---
 
 _project_cache = ProjectCache()  # Project cache
-_refresh_task: asyncio.Task | None = None  # Nightly cache refresh task
+_refresh_task: asyncio.Task | None = None  # Nightly cache refresh task, only run by the leader
+_sync_task: asyncio.Task | None = None  # Lease and snapshot follower task
+_background_tasks: set[asyncio.Task] = set()  # Keeps references to fire-and-forget tasks
+_refresh_lock = asyncio.Lock()  # Serializes cache refreshes within this process
+_lease = RefreshLease(LEASE_FILE, settings.REFRESH_LEASE_TTL)
+_is_leader = False  # True while this instance holds the refresh lease
+_generation_events = Broadcaster("generation")  # Announces new cache generations to SSE clients
+_trends = TrendStore(TREND_FILE)  # Registration statistics over time, appended to by the leader
+_scoutnet_slots = asyncio.Semaphore(settings.SCOUTNET_MAX_CONCURRENCY)  # Bounds all concurrent Scoutnet requests
+_host_slots: dict[str, asyncio.Semaphore] = {}  # Bounds concurrent Scoutnet requests per host
+_export_lock = asyncio.Lock()  # Serializes writing Parquet exports within this process
+_circuits: dict[tuple[str, str], CircuitBreaker] = {}  # (project, endpoint) -> its circuit breaker
+_refresh_errors: dict[int, dict] = {}  # project_id -> {"failures", "error", "failed_at"} since the last success
+_prewarm_hooks: list[Callable[[], Awaitable[None]]] = []  # Awaited before a new generation is announced
+_member_indexes: dict[int, tuple] = {}  # project_id -> (project, group map, MemberIndex of them)
+_text_indexes: dict[int, tuple] = {}  # project_id -> (project, TextIndex of its text answers)
+_member_registrations: dict[int, list[tuple[int, int]]] = {}  # member_no -> [(project_id, group_id)], all projects
 
 
 # --- Disk cache persistence ---
 
 
 def _save_cache_to_disk(path: Path) -> None:
-    from dataclasses import asdict
-
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(asdict(_project_cache)))
-        tmp.rename(path)
+        with metrics.persist_seconds.time():
+            write_snapshot(path, _project_cache, _SNAPSHOT_TYPES)
         logger.info("Saved cache to disk: %d projects", len(_project_cache.projects))
     except Exception as exc:
         logger.warning("Failed to save cache to disk: %s", exc)
@@ -102,65 +232,257 @@ def _save_cache_to_disk(path: Path) -> None:
 
 def _load_cache_from_disk(path: Path) -> bool:
     try:
-        data = json.loads(path.read_text())
-        _project_cache.group_map = {int(k): v for k, v in data["group_map"].items()}
-        _project_cache.projects = {
-            int(pid): CachedProject(
-                project_id=p["project_id"],
-                project_name=p["project_name"],
-                participants=p["participants"],
-                questions=p["questions"],
-                groups={int(gid): CachedGroup(**g) for gid, g in p["groups"].items()},
-            )
-            for pid, p in data["projects"].items()
-        }
-        logger.info("Loaded cache from disk: %d projects", len(_project_cache.projects))
+        cache = load_snapshot(path, _SNAPSHOT_TYPES)
+        previous = _cache_version()
+        for f in fields(ProjectCache):
+            setattr(_project_cache, f.name, getattr(cache, f.name, getattr(ProjectCache(), f.name)))
+        _observe_cache()
+        _index_members()
+        _announce_generation(*previous)
+        logger.info(
+            "Loaded cache from disk: %d projects, generation %d", len(_project_cache.projects), cache.generation
+        )
         return True
     except Exception as exc:
         logger.warning("Failed to load cache from disk: %s", exc)
         return False
 
 
-# --- Init / shutdown ---
+def _observe_cache() -> None:
+    metrics.observe_cache(_project_cache)
+    # Measuring the size walks every object in the cache, too slow for the event loop
+    task = asyncio.create_task(asyncio.to_thread(metrics.observe_cache_bytes, _project_cache.projects))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+# --- Cache generation announcements ---
+
+
+def _cache_version() -> tuple[int, dict[int, str]]:
+    return _project_cache.generation, {pid: p.fingerprint for pid, p in _project_cache.projects.items()}
+
+
+def _announce_generation(previous_generation: int, previous_fingerprints: dict[int, str]) -> None:
+    """Publish the current generation and the projects that changed since the previous one."""
+    fingerprints = _cache_version()[1]
+    changed = sorted(
+        pid
+        for pid in fingerprints.keys() | previous_fingerprints.keys()
+        if fingerprints.get(pid) != previous_fingerprints.get(pid)
+    )
+    event = {
+        "generation": _project_cache.generation,
+        "previous_generation": previous_generation,
+        "updated_at": _project_cache.updated_at,
+        "changed_projects": changed,
+    }
+    task = asyncio.create_task(_prewarm_and_publish(event))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def add_prewarm_hook(hook: Callable[[], Awaitable[None]]) -> None:
+    """Have hook() awaited after each cache update, before the new generation is announced."""
+    _prewarm_hooks.append(hook)
+
+
+async def _prewarm_and_publish(event: dict) -> None:
+    for hook in _prewarm_hooks:
+        try:
+            await hook()
+        except Exception:
+            logger.exception("Prewarm hook %s failed", getattr(hook, "__qualname__", hook))
+    latest = _generation_events.latest
+    if latest is None or latest["generation"] <= event["generation"]:  # Not overtaken by a newer generation
+        _generation_events.publish(event)
+
+
+# --- Refresh leader election ---
+# Only one instance across all pods and worker processes, the holder of the refresh lease
+# on the shared PERSIST_DIR volume, fetches from Scoutnet and writes the disk snapshot.
+# The others load each new snapshot generation and forward manual refresh requests by
+# adding a token to REFRESH_REQUEST_FILE. The leader runs the requested refresh and writes
+# its outcome for those tokens to REFRESH_STATUS_FILE. The leader renews its lease on every
+# poll. If it stops doing so the lease expires and another instance takes over.
+
+
+def _lease_step() -> None:
+    """Renew or try to take the refresh lease, follow new snapshots and start requested refreshes."""
+    global _is_leader, _refresh_task
+    if _is_leader and not _lease.renew():
+        logger.warning("Lost the refresh lease, following disk snapshots instead")
+        _is_leader = False
+        if _refresh_task:
+            _refresh_task.cancel()
+            _refresh_task = None
+
+    if not _is_leader:
+        generation = read_snapshot_generation(CACHE_FILE)
+        if generation is not None and generation != _project_cache.generation:
+            _load_cache_from_disk(CACHE_FILE)
+        if _lease.acquire():
+            logger.info("Acquired the refresh lease, taking over cache refreshes")
+            _is_leader = True
+            _refresh_task = asyncio.create_task(_scheduled_cache_refresh(refresh_now=not _project_cache.generation))
+
+    if _is_leader and REFRESH_REQUEST_FILE.exists():
+        tokens = _claim_refresh_requests()
+        logger.info("Running cache refresh requested by another instance")
+        task = asyncio.create_task(_requested_cache_refresh(tokens))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+def _claim_refresh_requests() -> list[str]:
+    """Take the pending refresh requests and return their tokens."""
+    claimed = REFRESH_REQUEST_FILE.with_suffix(f".claimed{os.getpid()}")
+    try:
+        REFRESH_REQUEST_FILE.rename(claimed)  # Requests made from now on go to a new file
+        tokens = claimed.read_text().split()
+        claimed.unlink()
+    except OSError:
+        return []
+    return tokens
+
+
+async def _requested_cache_refresh(tokens: list[str]) -> None:
+    outcome = {"requests": tokens}
+    try:
+        failed = await _update_project_cache()
+        outcome |= {"generation": _project_cache.generation, "failed": _failed_projects(failed)}
+    except Exception as exc:
+        logger.error("Requested cache refresh failed")
+        outcome["error"] = _describe_error(exc)
+    try:
+        tmp = REFRESH_STATUS_FILE.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps(outcome))
+        os.replace(tmp, REFRESH_STATUS_FILE)
+    except OSError as exc:
+        logger.warning("Failed to write the refresh status: %s", exc)
+
+
+def _request_refresh(token: str) -> None:
+    """Ask the leader for a refresh, see _claim_refresh_requests."""
+    with open(REFRESH_REQUEST_FILE, "a") as f:
+        f.write(token + "\n")
+
+
+def _read_refresh_status() -> dict:
+    """Return the outcome of the latest requested refresh, see _requested_cache_refresh."""
+    try:
+        return json.loads(REFRESH_STATUS_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
 
 
-async def _scheduled_cache_refresh() -> None:
+async def _lease_loop() -> None:
     while True:
-        now = datetime.now(tz=ZoneInfo("Europe/Stockholm"))
-        next_run = now.replace(hour=3, minute=0, second=0, microsecond=0)
-        if next_run <= now:
-            next_run += timedelta(days=1)
-        await asyncio.sleep((next_run - now).total_seconds())
-        logger.info("Running scheduled cache refresh")
-        while True:  # Retry loop: keep retrying every hour until successful
-            try:
-                await _update_project_cache()
-                break
-            except Exception:
-                logger.error("Cache refresh failed, will retry in 1 hour")
-                await asyncio.sleep(3600)
+        await asyncio.sleep(SNAPSHOT_POLL_INTERVAL)
+        try:
+            _lease_step()
+        except Exception as exc:
+            logger.warning("Refresh lease update failed: %s", exc)
 
 
-async def scoutnet_init() -> None:
-    global _refresh_task
+# --- Init / shutdown ---
+
+
+def _refresh_schedules() -> dict[int, CronSchedule]:
+    """Return the refresh schedule of every configured project."""
+    default = CronSchedule(settings.REFRESH_SCHEDULE)
+    return {
+        p.id: CronSchedule(p.refresh_schedule) if p.refresh_schedule else default for p in settings.SCOUTNET_PROJECTS
+    }
+
+
+def _next_refresh(schedule: CronSchedule, after: datetime) -> datetime:
+    # The jitter spreads the requests of projects (and deployments) sharing a schedule
+    return schedule.next_after(after) + timedelta(seconds=random.uniform(0, settings.REFRESH_JITTER_S))
+
+
+def _next_retry(pid: int, now: datetime) -> datetime:
+    attempt = _refresh_errors.get(pid, {}).get("failures", 1)
+    delay = backoff_delay(attempt, REFRESH_RETRY_BASE, REFRESH_RETRY_MAX)
+    logger.error("Refresh of project %d failed, will retry in %d seconds", pid, delay)
+    metrics.refresh_retries.inc()
+    return now + timedelta(seconds=delay)
+
+
+async def _scheduled_cache_refresh(refresh_now: bool = False, failed: Collection[int] = ()) -> None:
+    """
+    Refresh every project on its own schedule. Projects due at the same time are fetched
+    in one refresh, but each succeeds or fails on its own. A failed project is retried
+    with exponential backoff until it succeeds, then follows its schedule again. The
+    failed projects of a refresh before, such as the one at startup, start with a retry.
+    """
+    schedules = _refresh_schedules()
+    now = datetime.now(tz=TIMEZONE)
+    next_runs = {
+        pid: now if refresh_now else _next_retry(pid, now) if pid in failed else _next_refresh(schedule, now)
+        for pid, schedule in schedules.items()
+    }
+    while next_runs:
+        next_run = min(next_runs.values())
+        await asyncio.sleep(max((next_run - datetime.now(tz=TIMEZONE)).total_seconds(), 0))
+        now = datetime.now(tz=TIMEZONE)
+        due = sorted(pid for pid, run in next_runs.items() if run <= now)
+        logger.info("Running scheduled cache refresh of projects %s", due)
+        try:
+            failed = await _update_project_cache(due)
+        except Exception:
+            failed = due
+        now = datetime.now(tz=TIMEZONE)
+        for pid in due:
+            next_runs[pid] = _next_retry(pid, now) if pid in failed else _next_refresh(schedules[pid], now)
+
+
+async def _initial_cache_refresh() -> None:
     await _load_initial_group_map()  # Retrive an initial group map
+    await _scheduled_cache_refresh(refresh_now=True)
+
+
+async def scoutnet_init() -> None:
+    global _refresh_task, _sync_task, _is_leader
     disk_cache_loaded = _load_cache_from_disk(CACHE_FILE)
-    try:
-        await _update_project_cache()  # Fill cache at start
-    except ScoutnetRequestError:
-        if disk_cache_loaded:
-            logger.warning("Scoutnet unavailable at startup — serving stale disk cache")
+    if _lease.acquire():
+        _is_leader = True
+        if settings.FAST_START:  # Serve the disk cache (if any) and refresh in the background
+            logger.info("Fast start: refreshing cache in the background")
+            _refresh_task = asyncio.create_task(_initial_cache_refresh())
         else:
-            logger.critical("Initial cache load failed and no disk cache, shutting down")
-            os._exit(1)  # Kill app without a stack trace. K8S will eventually restart it.
-    _refresh_task = asyncio.create_task(_scheduled_cache_refresh())
+            await _load_initial_group_map()  # Retrive an initial group map
+            try:
+                failed = await _update_project_cache()  # Fill cache at start
+            except ScoutnetRequestError:
+                failed = [p.id for p in settings.SCOUTNET_PROJECTS]
+                if disk_cache_loaded:
+                    logger.warning("Scoutnet unavailable at startup — serving stale disk cache")
+                else:
+                    logger.critical("Initial cache load failed and no disk cache, shutting down")
+                    os._exit(1)  # Kill app without a stack trace. K8S will eventually restart it.
+            _refresh_task = asyncio.create_task(_scheduled_cache_refresh(failed=failed))
+    else:
+        logger.info("Another instance holds the refresh lease, following its disk snapshots")
+        deadline = time.monotonic() + FOLLOWER_START_TIMEOUT
+        while not _project_cache.generation and not settings.FAST_START:  # Wait for the first snapshot
+            if time.monotonic() > deadline:  # Not ready (see /readyz) until the leader writes one
+                logger.warning("No cache snapshot after %d seconds, starting without data", FOLLOWER_START_TIMEOUT)
+                break
+            await asyncio.sleep(SNAPSHOT_POLL_INTERVAL)
+            _lease_step()
+    _sync_task = asyncio.create_task(_lease_loop())
 
 
 async def scoutnet_shutdown() -> None:
-    if _refresh_task:
-        _refresh_task.cancel()
-        with suppress(asyncio.CancelledError):
-            await _refresh_task
+    _generation_events.close()  # End open event streams
+    for task in (_sync_task, _refresh_task):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    if _is_leader:
+        _lease.release()  # Let another instance take over right away
 
 
 def dev_cache(func):
@@ -171,7 +493,7 @@ def dev_cache(func):
     """
 
     @functools.wraps(func)
-    async def wrapper(url: str) -> dict:
+    async def wrapper(url: str, *args, **kwargs) -> dict:
         CACHE_DIR.mkdir(exist_ok=True)
         url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
         cache_file = CACHE_DIR / f"{url_hash}.json"
@@ -180,7 +502,7 @@ def dev_cache(func):
             logger.debug("Using cached response for %s", url)
             return json.loads(cache_file.read_text())
 
-        result = await func(url)
+        result = await func(url, *args, **kwargs)
         cache_file.write_text(json.dumps(result, indent=2))
         logger.debug("Cached response for %s", url)
         return result
@@ -192,49 +514,79 @@ def dev_cache(func):
 
 
 # @dev_cache
-async def _scoutnet_get(url) -> dict:
+async def _scoutnet_get(url, project: str = "", endpoint: str = "") -> dict:
+    """
+    GET a Scoutnet API url and return the decoded JSON.
+    The project and endpoint label the metrics and select the circuit breaker, so that a
+    project whose requests keep failing does not stop the requests of the other projects.
+    """
+    url_path = url.split("?")[0]  # Strip query params (API keys)
+    host = urlparse(url).hostname or ""
+    host_slots = _host_slots.setdefault(host, asyncio.Semaphore(settings.SCOUTNET_MAX_PER_HOST))
+    circuit = _circuits.setdefault((project, endpoint), CircuitBreaker())
+    if not circuit.allow():
+        metrics.scoutnet_fetch_errors.labels(project, endpoint).inc()
+        raise ScoutnetRequestError(f"Scoutnet endpoint failing, request skipped: {url_path}")
     try:
-        async with httpx.AsyncClient(timeout=20.0) as http_client:
-            response = await http_client.get(url)
-            response.raise_for_status()
-            return response.json()
+        async with _scoutnet_slots, host_slots:
+            with metrics.scoutnet_fetch_seconds.labels(project, endpoint).time():
+                async with httpx.AsyncClient(timeout=20.0) as http_client:
+                    response = await http_client.get(url)
+                    response.raise_for_status()
+        metrics.scoutnet_fetch_bytes.labels(project, endpoint).set(len(response.content))
+        result = response.json()
     except Exception as exc:
-        url_path = url.split("?")[0]  # Strip query params (API keys)
+        if isinstance(exc, httpx.HTTPStatusError) and exc.response.is_client_error:
+            circuit.success()  # The endpoint is up, the request was wrong (e.g. an invalid key)
+        else:
+            circuit.failure()
+        metrics.scoutnet_fetch_errors.labels(project, endpoint).inc()
+        metrics.scoutnet_circuit_open.labels(project, endpoint).set(circuit.is_open)
         logger.error("Failed to fetch %s: %s: %s", url_path, type(exc).__name__, exc)
         raise ScoutnetRequestError(f"Scoutnet request failed: {url_path}") from exc
+    circuit.success()
+    metrics.scoutnet_circuit_open.labels(project, endpoint).set(0)
+    return result
 
 
-async def _get_all_projectdata_from_scoutnet() -> list[ScoutnetProjectData]:
+async def _get_all_projectdata_from_scoutnet(
+    projects: list[ProjectConfig] | None = None,
+) -> dict[int, ScoutnetProjectData | Exception]:
     """
-    Retrieves project data from Scoutnet for all configured projects.
+    Retrieves project data from Scoutnet for the given or all configured projects.
     Each project's form questions are combined into one dict.
+    A failed request only fails the project it belongs to.
 
-    :return: List of project data, one per configured project
+    :param projects: the projects to fetch, default all configured projects
+    :return: project_id -> project data, or the exception that failed the project
     """
 
     async def fetch_project(project: ProjectConfig) -> ScoutnetProjectData:
-        # Start questions request first - we need its response to discover form URLs
-        questions_url = f"{PROJECT_API}/questions?id={project.id}&key={project.question_key}"
-        questions_task = asyncio.create_task(_scoutnet_get(questions_url))
-
-        # Start other requests in parallel
-        groups_task = None
-        if project.group_key:
-            url = f"{PROJECT_API}/groups?flat=true&id={project.id}&key={project.group_key}"
-            groups_task = asyncio.create_task(_scoutnet_get(url))
-
-        participants_url = f"{PROJECT_API}/participants?id={project.id}&key={project.member_key}"
-        participants_task = asyncio.create_task(_scoutnet_get(participants_url))
-
-        # Wait for questions first (usually fast), then immediately start form fetches
-        questions_forms = await questions_task
-        forms = list(questions_forms["forms"].values())
-        form_tasks = [asyncio.create_task(_scoutnet_get(f["endpoint_url"])) for f in forms]
-
-        # Now wait for everything else in parallel
-        participants = await participants_task
-        groups = await groups_task if groups_task else {}
-        form_results = await asyncio.gather(*form_tasks)
+        pid = str(project.id)
+        # The task group cancels the project's other requests as soon as one of them fails
+        async with asyncio.TaskGroup() as tasks:
+            # Start questions request first - we need its response to discover form URLs
+            questions_url = f"{PROJECT_API}/questions?id={project.id}&key={project.question_key}"
+            questions_task = tasks.create_task(_scoutnet_get(questions_url, pid, "questions"))
+
+            # Start other requests in parallel
+            groups_task = None
+            if project.group_key:
+                url = f"{PROJECT_API}/groups?flat=true&id={project.id}&key={project.group_key}"
+                groups_task = tasks.create_task(_scoutnet_get(url, pid, "groups"))
+
+            participants_url = f"{PROJECT_API}/participants?id={project.id}&key={project.member_key}"
+            participants_task = tasks.create_task(_scoutnet_get(participants_url, pid, "participants"))
+
+            # Wait for questions first (usually fast), then immediately start form fetches
+            questions_forms = await questions_task
+            forms = list(questions_forms["forms"].values())
+            form_tasks = [tasks.create_task(_scoutnet_get(f["endpoint_url"], pid, "form")) for f in forms]
+
+        # Everything has completed when the task group exits
+        participants = participants_task.result()
+        groups = groups_task.result() if groups_task else {}
+        form_results = [task.result() for task in form_tasks]
 
         questions = {"sections": {}, "questions": {}}
         for forms_data in form_results:
@@ -253,22 +605,107 @@ async def _get_all_projectdata_from_scoutnet() -> list[ScoutnetProjectData]:
             questions=questions,
         )
 
-    # Fetch all configured projects in parallel
-    results = await asyncio.gather(*[fetch_project(p) for p in settings.SCOUTNET_PROJECTS])
-    return list(results)
+    # Fetch the projects in parallel, within the concurrency limits of _scoutnet_get
+    if projects is None:
+        projects = settings.SCOUTNET_PROJECTS
+    results = await asyncio.gather(*[fetch_project(p) for p in projects], return_exceptions=True)
+    return {p.id: result for p, result in zip(projects, results)}
 
 
 # --- Local functions ---
 
 
-async def _update_project_cache() -> None:
+async def _update_project_cache(project_ids: list[int] | None = None) -> list[int]:
+    """
+    Fetch and decode the given projects, default all configured projects, into a new cache generation.
+    Projects that fail keep their cached data. Raises ScoutnetRequestError if all of them fail.
+
+    :return: the ids of the projects that failed
+    """
     from .scoutnet_forms import scoutnet_forms_decoder
 
-    logger.info("Start cache update")
-    all_data = await _get_all_projectdata_from_scoutnet()
-    scoutnet_forms_decoder(all_data, _project_cache)
-    logger.info("Finish cache update")
-    _save_cache_to_disk(CACHE_FILE)
+    configured = {p.id: p for p in settings.SCOUTNET_PROJECTS}
+    projects = [configured[pid] for pid in project_ids] if project_ids is not None else list(configured.values())
+    async with _refresh_lock:
+        logger.info("Start cache update of projects %s", [p.id for p in projects])
+        start = time.perf_counter()
+        fetched = await _get_all_projectdata_from_scoutnet(projects)
+        previous = _cache_version()
+        previous_projects = _project_cache.projects
+        now = time.time()
+        failed = []
+        for pid, data in fetched.items():
+            if isinstance(data, ScoutnetProjectData):
+                try:
+                    scoutnet_forms_decoder([data], _project_cache)
+                    _project_cache.projects[pid].updated_at = now
+                    _refresh_errors.pop(pid, None)
+                    continue
+                except Exception as exc:
+                    logger.exception("Failed to decode project %d", pid)
+                    data = exc
+            failed.append(pid)
+            errors = _refresh_errors.setdefault(pid, {"failures": 0})
+            errors |= {"failures": errors["failures"] + 1, "error": _describe_error(data), "failed_at": now}
+            logger.warning("Refresh of project %d failed, keeping its cached data: %s", pid, errors["error"])
+        for pid in failed:
+            metrics.refresh_failures.labels(str(pid)).inc()
+        if len(failed) == len(fetched):
+            raise ScoutnetRequestError(f"Refresh failed for all projects {failed}")
+        _project_cache.projects = {pid: p for pid, p in _project_cache.projects.items() if pid in configured}
+        _project_cache.generation += 1
+        _project_cache.updated_at = now
+        _record_changes(previous_projects)
+        logger.info("Finish cache update, generation %d", _project_cache.generation)
+        if _lease.renew():  # Another leader may have taken over during the fetch, and writes its own
+            _save_cache_to_disk(CACHE_FILE)
+            _append_trends()
+        else:
+            logger.warning("Lost the refresh lease during the refresh, not writing its snapshot")
+        metrics.refresh_seconds.observe(time.perf_counter() - start)
+        _observe_cache()
+        _index_members()
+        _announce_generation(*previous)
+        return failed
+
+
+def _index_members() -> None:
+    """Rebuild the index of each member's registrations across all projects."""
+    global _member_registrations
+    registrations = {}
+    for pid, project in _project_cache.projects.items():
+        for member_no, participant in project.participants.items():
+            registrations.setdefault(member_no, []).append((pid, participant.registration_group))
+    _member_registrations = registrations
+
+
+def _failed_projects(failed: list[int]) -> dict[int, str]:
+    """Return the error of each failed project."""
+    return {pid: _refresh_errors[pid]["error"] for pid in failed}
+
+
+def _describe_error(exc: BaseException) -> str:
+    if isinstance(exc, ExceptionGroup):  # From the task group in fetch_project
+        exc = exc.exceptions[0]
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _append_trends() -> None:
+    try:
+        _trends.append(_project_cache.generation, _project_cache.updated_at, _project_cache.projects)
+    except Exception as exc:
+        logger.warning("Failed to append to the trend store: %s", exc)
+
+
+def _record_changes(previous_projects: dict) -> None:
+    """Store the participant changes of the new generation and drop the oldest ones."""
+    diffs = {}
+    for pid, project in _project_cache.projects.items():
+        if (diff := diff_project(previous_projects.get(pid), project)) is not None:
+            diffs[pid] = diff
+    _project_cache.changes[_project_cache.generation] = diffs
+    for generation in [g for g in _project_cache.changes if g <= _project_cache.generation - CHANGE_HISTORY]:
+        del _project_cache.changes[generation]
 
 
 async def _load_initial_group_map() -> None:
@@ -276,23 +713,64 @@ async def _load_initial_group_map() -> None:
     if settings.SCOUTNET_BODYLIST_KEY:  # Fetch map from Scoutnet
         try:
             url = f"https://scoutnet.se/api/body_key_list?id={settings.SCOUTNET_BODYLIST_ID}&key={settings.SCOUTNET_BODYLIST_KEY}"
-            raw_map = await _scoutnet_get(url)
+            raw_map = await _scoutnet_get(url, endpoint="body_key_list")
             group_map = {g["body_id"]: g["body_name"] for g in raw_map.values() if g.get("body_type") == "group"}
         except Exception:
-            logger.warning("Failed to fetch group_map from Scoutnet, falling back to local file")
-    if not group_map:
-        try:  # Fall back to persisted disk cache
-            data = json.loads(CACHE_FILE.read_text())
-            group_map = {int(k): v for k, v in data["group_map"].items()}
-            logger.info("Loaded group_map from disk cache")
-        except Exception:
-            logger.warning("Failed to load group_map from disk cache, using empty initial map")
-
-    _project_cache.group_map = group_map
+            logger.warning("Failed to fetch group_map from Scoutnet, falling back to disk cache")
+    if group_map:
+        _project_cache.group_map = group_map
+    elif _project_cache.group_map:  # Keep the map loaded with the disk cache
+        logger.info("Using group_map from disk cache")
+    else:
+        logger.warning("No group_map in disk cache, using empty initial map")
     logger.info("Loaded group_map with %d entries", len(_project_cache.group_map))
 
 
-# --- Functions called from the API handlers in stats.py ---
+# --- Functions called from the API handlers in stats.py and main.py ---
+
+
+def _freshness(updated_at: float) -> dict:
+    age = time.time() - updated_at if updated_at else None
+    return {
+        "updated_at": updated_at or None,
+        "age_s": round(age) if age is not None else None,
+        "stale": age is None or age > settings.CACHE_STALE_AFTER_H * 3600,
+    }
+
+
+def _project_updated_at(project: CachedProject) -> float:
+    return project.updated_at or _project_cache.updated_at  # Snapshots from before per-project refreshes
+
+
+def get_cache_status() -> dict:
+    """
+    Return readiness and freshness info about the cache and each project.
+    The cache is stale if any project is. Failed project refreshes are only known by the leader.
+    """
+    projects = {
+        pid: {
+            "participants": len(p.participants),
+            "groups": len(p.groups),
+            **_freshness(_project_updated_at(p)),
+            "refresh_error": _refresh_errors.get(pid),
+        }
+        for pid, p in _project_cache.projects.items()
+    }
+    freshness = _freshness(_project_cache.updated_at)
+    return {
+        "ready": bool(_project_cache.generation),
+        "stale": freshness["stale"] or any(p["stale"] for p in projects.values()),
+        "leader": _is_leader,
+        "generation": _project_cache.generation,
+        "updated_at": freshness["updated_at"],
+        "age_s": freshness["age_s"],
+        "projects": projects,
+    }
+
+
+def get_cache_generation() -> int:
+    """Return the generation of the cached data, for caches derived from it"""
+    return _project_cache.generation
 
 
 async def get_projects_info() -> dict[int, str]:
@@ -316,9 +794,18 @@ async def get_project_groups(project_id: int) -> dict | None:
     return groups
 
 
-async def get_group_summary(project_id: int, group_id: int | list[int] | None) -> dict | None:
+TEXT_OTHER_KEY = "_other"  # Summary key for text answers outside the top-N
+
+
+async def get_group_summary(
+    project_id: int, group_id: int | list[int] | None, text_top: int | None = None
+) -> dict | None:
     """
     Aggregate stats across the requested groups and return a summary.
+    Text answers are returned as {answer: count}. With text_top, only the text_top most
+    common answers are kept and the rest are summed under TEXT_OTHER_KEY.
+    Number questions also get count, sum, mean, min, max and quantiles in number_stats,
+    merged from the groups' NumberStats.
     """
     if not (project := _project_cache.projects.get(project_id)):
         return None
@@ -333,6 +820,7 @@ async def get_group_summary(project_id: int, group_id: int | list[int] | None) -
 
     total_participants = sum(project.groups[gid].num_participants for gid in group_id)
     stats: dict = {}
+    number_stats: dict = {}  # Section -> number question -> distribution of the answers
     for secnum in ["Kön", "Avgift"]:
         sec = stats[secnum] = {}
         for gid in group_id:
@@ -357,14 +845,25 @@ async def get_group_summary(project_id: int, group_id: int | list[int] | None) -
                         else:
                             q[val] = q.get(val, 0) + 1  # Group choice: count groups per choice
             elif qinfo["type"] == "text":
-                sec[qnum] = [
-                    v
-                    for gid in group_id
-                    if (v := project.groups[gid].aggregated.get(secnum, {}).get(qnum)) and isinstance(v, str)
-                ]
+                counts = Counter()
+                for gid in group_id:
+                    if val := project.groups[gid].aggregated.get(secnum, {}).get(qnum):
+                        if isinstance(val, dict):
+                            counts.update(val)  # Individual answers: sum counts
+                        elif isinstance(val, str):
+                            counts[normalize_text_answer(val)] += 1  # Group answer: count groups per answer
+                if text_top is not None and len(counts) > text_top:
+                    top = counts.most_common(text_top)
+                    counts = dict(top) | {TEXT_OTHER_KEY: counts.total() - sum(n for _, n in top)}
+                sec[qnum] = dict(counts)
             elif qinfo["type"] == "number":
-                sec[qnum] = sum(int(project.groups[gid].aggregated.get(secnum, {}).get(qnum, 0)) for gid in group_id)
-                pass
+                total = sum(project.groups[gid].aggregated.get(secnum, {}).get(qnum, 0) for gid in group_id)
+                sec[qnum] = int(total) if float(total).is_integer() else total
+                merged = NumberStats()
+                for gid in group_id:
+                    if group_stats := (project.groups[gid].number_stats or {}).get(qnum):
+                        merged.merge(group_stats)
+                number_stats.setdefault(secnum, {})[qnum] = merged.summary()
             elif qinfo["type"] == "leader_select":
                 pass
             elif qinfo["type"] == "other_unsupported_by_api":
@@ -377,7 +876,13 @@ async def get_group_summary(project_id: int, group_id: int | list[int] | None) -
             else:
                 pass
 
-    return {"total_participants": total_participants, "num_groups": len(group_id), "stats": stats}
+    return {
+        "total_participants": total_participants,
+        "num_groups": len(group_id),
+        "updated_at": _project_updated_at(project),
+        "stats": stats,
+        "number_stats": number_stats,
+    }
 
 
 async def get_group_responses(project_id: int, group_id: int | list[int] | None) -> list | None:
@@ -470,6 +975,34 @@ async def get_individual_responses(project_id: int, member_id: int) -> dict | No
     return response
 
 
+async def get_member_registrations(member_id: int) -> list[dict] | None:
+    """
+    Return the registrations of a member in all projects, with their details and answers.
+    """
+    if not (registrations := _member_registrations.get(member_id)):
+        return None  # Not registered in any project
+
+    group_names = _project_cache.group_map
+    results = []
+    for project_id, group_id in registrations:
+        project = _project_cache.projects[project_id]
+        participant = dict(project.participants[member_id])
+        participant["member_group"] = group_names.get(participant["member_group"], participant["member_group"])
+        del participant["registration_group"]
+        group = project.groups.get(group_id)
+        results.append(
+            {
+                "project_id": project_id,
+                "project_name": project.project_name,
+                "group_id": group_id,
+                "group_name": group.name if group else group_names.get(group_id, ""),
+                "participant": participant,
+                "answers": (group.raw_individual_answers.get(member_id) if group else None) or {},
+            }
+        )
+    return results
+
+
 async def get_individuals_by_group(
     project_id: int, group_id: int, remove_health_and_food: bool = False
 ) -> list[dict] | None:
@@ -481,11 +1014,7 @@ async def get_individuals_by_group(
     if not (group := project.groups.get(group_id)):
         return None
 
-    rq = []  # Create a list of all food and health related questions
-    if remove_health_and_food:
-        for qsec in project.questions.values():
-            if any(hfq in qsec["text"] for hfq in ["Allergier", "Allergener", "Hälsa", "Kost", "Mat"]):
-                rq.extend(list(qsec["questions"].keys()))
+    rq = _health_and_food_questions(project) if remove_health_and_food else []
 
     results = []
     for member_no, response in group.raw_individual_answers.items():
@@ -512,30 +1041,101 @@ async def get_individuals_by_group(
     return results
 
 
-async def find_members(project_id: int, name: str, born: str, group: str) -> list[dict] | None:
+def _health_and_food_questions(project: CachedProject) -> list[int]:
+    """Return the ids of all food and health related questions"""
+    rq = []
+    for qsec in project.questions.values():
+        if any(hfq in qsec["text"] for hfq in ["Allergier", "Allergener", "Hälsa", "Kost", "Mat"]):
+            rq.extend(list(qsec["questions"].keys()))
+    return rq
+
+
+async def get_groups_export(
+    project_id: int, group_ids: list[int] | None, excluded_questions: set[str]
+) -> tuple[list[str], Iterator[list]] | None:
+    """
+    Return the header and a lazy row iterator of the groups table export (see export.py),
+    without the excluded question ids.
+    """
+    if not (project := _project_cache.projects.get(project_id)):
+        return None
+    if group_ids is None:
+        group_ids = list(project.groups)
+    if not all(gid in project.groups for gid in group_ids):
+        return None
+    return group_table(project, list(dict.fromkeys(group_ids)), excluded_questions)
+
+
+async def get_individuals_export(
+    project_id: int, group_ids: list[int] | None, remove_health_and_food: bool = False
+) -> tuple[list[str], Iterator[list]] | None:
+    """
+    Return the header and a lazy row iterator of the individuals table export (see export.py).
+    """
+    if not (project := _project_cache.projects.get(project_id)):
+        return None
+    if group_ids is None:
+        group_ids = list(project.groups)
+    if not all(gid in project.groups for gid in group_ids):
+        return None
+    excluded = {str(q) for q in _health_and_food_questions(project)} if remove_health_and_food else set()
+    return individual_table(project, list(dict.fromkeys(group_ids)), excluded)
+
+
+async def get_project_export(project_id: int, table: str) -> Path | None:
+    """
+    Return the Parquet file of a table of the project (see parquet_export.py).
+    The files are written on the first request for each version of the project's data,
+    replacing those of the previous version.
+    """
+    if not (project := _project_cache.projects.get(project_id)):
+        return None
+    directory = EXPORT_DIR / str(project_id) / (project.fingerprint or f"generation-{_project_cache.generation}")
+    async with _export_lock:
+        if not directory.exists():
+            logger.info("Writing Parquet export of project %d", project_id)
+            await asyncio.to_thread(write_export, project, directory)
+            for old in directory.parent.iterdir():
+                if old != directory and not old.name.startswith("."):
+                    shutil.rmtree(old, ignore_errors=True)
+    return directory / f"{table}.parquet"
+
+
+async def _member_index(project: CachedProject) -> MemberIndex:
+    """Return the search index of the project's current data, building it if needed."""
+    cached = _member_indexes.get(project.project_id)
+    if cached and cached[0] is project and cached[1] is _project_cache.group_map:
+        return cached[2]
+    group_map = _project_cache.group_map
+    index = await asyncio.to_thread(MemberIndex, project.participants, group_map)
+    _member_indexes[project.project_id] = (project, group_map, index)
+    return index
+
+
+async def _build_member_indexes() -> None:
+    for project in list(_project_cache.projects.values()):
+        await _member_index(project)
+    for pid in _member_indexes.keys() - _project_cache.projects.keys():
+        del _member_indexes[pid]
+
+
+add_prewarm_hook(_build_member_indexes)
+
+
+async def find_members(project_id: int, name: str, born: str, group: str, max_hits: int) -> list[dict] | None:
     """
-    Find and return a list of participants that match the provided criteria.
+    Find and return the max_hits participants that best match the provided criteria, best match first.
+    See search.py for how names are matched.
     """
     if not (project := _project_cache.projects.get(project_id)):
         return None
 
-    group_lower = group.lower()
-    name_lower = name.lower()
     group_names = _project_cache.group_map
+    index = await _member_index(project)
 
     results = []
-    for member_no, p in project.participants.items():
-        if name_lower and name_lower not in p["name"].lower():
-            continue
-        if born and not p["born"].startswith(born):
-            continue
-        if group_lower:
-            if group_lower not in group_names.get(p.get("registration_group", 0), "").lower() and (
-                p.get("member_group") == p.get("registration_group")
-                or group_lower not in group_names.get(p.get("member_group", 0), "").lower()
-            ):
-                continue
-        result = {"member_no": member_no, **p}
+    for member_no in index.search(name, born, group, max_hits):
+        result = {"member_no": member_no, **project.participants[member_no]}
         result["member_group"] = group_names.get(result["member_group"], result["member_group"])
         result["registration_group"] = group_names.get(result["registration_group"], result["registration_group"])
         results.append(result)
@@ -543,6 +1143,110 @@ async def find_members(project_id: int, name: str, born: str, group: str) -> lis
     return results
 
 
+async def _text_index(project: CachedProject) -> TextIndex:
+    """Return the full-text index of the project's current data, building it if needed."""
+    cached = _text_indexes.get(project.project_id)
+    if cached and cached[0] is project:
+        return cached[1]
+    index = await asyncio.to_thread(lambda: TextIndex(text_answers(project)))
+    _text_indexes[project.project_id] = (project, index)
+    return index
+
+
+async def _build_text_indexes() -> None:
+    for project in list(_project_cache.projects.values()):
+        await _text_index(project)
+    for pid in _text_indexes.keys() - _project_cache.projects.keys():
+        del _text_indexes[pid]
+
+
+add_prewarm_hook(_build_text_indexes)
+
+
+async def search_text_answers(project_id: int, query: str, excluded: set[str], max_hits: int) -> list[dict] | None:
+    """
+    Find the max_hits members and groups whose text answers best match the query, best match first,
+    with a highlighted snippet of each matching answer. Answers to the excluded question ids are not searched.
+    See fulltext.py for how answers are matched.
+    """
+    if not (project := _project_cache.projects.get(project_id)):
+        return None
+
+    index = await _text_index(project)
+    question_texts = {
+        str(qnum): q["text"] for section in project.questions.values() for qnum, q in section["questions"].items()
+    }
+    group_names = _project_cache.group_map
+
+    results = []
+    for (kind, owner_id), rows, matched_words in index.search(query, excluded, max_hits):
+        answers = []
+        for row in rows:
+            snippet, highlights = index.snippet(row, matched_words)
+            qid = index.questions[row]
+            answers.append(
+                {
+                    "question_id": qid,
+                    "question": question_texts.get(qid, ""),
+                    "answer": index.texts[row],
+                    "snippet": snippet,
+                    "highlights": highlights,
+                }
+            )
+        if kind == "member":
+            participant = project.participants[owner_id]
+            group_id = participant.registration_group
+            result = {"type": kind, "member_no": owner_id, "name": participant.name}
+        else:
+            group_id = owner_id
+            result = {"type": kind}
+        group_name = project.groups[group_id].name if group_id in project.groups else group_names.get(group_id, "")
+        result |= {"group_id": group_id, "group_name": group_name, "answers": answers}
+        results.append(result)
+
+    return results
+
+
+async def get_project_changes(project_id: int, since: int) -> dict | None:
+    """
+    Return the net participant changes in a project between generation since and the current one.
+    Raises ChangesUnavailable if they are not recorded for all generations in between.
+    """
+    if not (project := _project_cache.projects.get(project_id)):
+        return None
+
+    generations = range(since + 1, _project_cache.generation + 1)
+    if not all(project_id in _project_cache.changes.get(g, {}) for g in generations):
+        raise ChangesUnavailable(f"No changes recorded since generation {since}")
+    changes = merge_diffs([_project_cache.changes[g][project_id] for g in generations])
+
+    def member(member_no: int, **extra) -> dict:
+        p = project.participants[member_no]
+        return {"member_no": member_no, "name": p.name, "group_id": p.registration_group, **extra}
+
+    return {
+        "since": since,
+        "generation": _project_cache.generation,
+        "added": [member(m) for m in changes["added"]],
+        "removed": [{"member_no": m, **info} for m, info in changes["removed"].items()],
+        "moved": [member(m, from_group_id=moved[0]) for m, moved in changes["moved"].items()],
+        "changed_details": [member(m, fields=f) for m, f in changes["changed_details"].items()],
+        "changed_answers": [member(m, questions=q) for m, q in changes["changed_answers"].items()],
+    }
+
+
+async def get_project_trend(
+    project_id: int, series: list[str], interval: str, since: float | None = None
+) -> dict | None:
+    """
+    Return the named trend series of a project downsampled to the interval, see TrendStore.query.
+    """
+    if project_id not in _project_cache.projects:
+        return None
+    timestamps, values = _trends.query(project_id, series, interval, since)
+    return {"interval": interval, "timestamps": timestamps, "series": values}
+
+
 # --- API routes ---
 
 scoutnet_router = APIRouter(prefix="/scoutnet", tags=["Scoutnet"])
@@ -556,10 +1260,51 @@ scoutnet_router = APIRouter(prefix="/scoutnet", tags=["Scoutnet"])
 )
 async def scoutnet_refresh(user: AuthUser = Depends(require_auth_user)):
     """
-    Refetches all data from Scoutnet and fills cache
+    Refetches all data from Scoutnet and fills cache.
+    If another instance holds the refresh lease, the refresh is run there and this call waits for the new data.
+    Returns 207 with {"failed": {project_id: error}} if some projects failed and kept their cached data,
+    and 502 with the error if all of them failed.
     """
+    if not _is_leader:
+        generation = _project_cache.generation
+        token = uuid.uuid4().hex
+        await asyncio.to_thread(_request_refresh, token)
+        deadline = time.monotonic() + REFRESH_REQUEST_TIMEOUT
+        while True:
+            refresh_status = await asyncio.to_thread(_read_refresh_status)
+            if token in refresh_status.get("requests", ()):
+                if "error" in refresh_status:
+                    raise HTTPException(status_code=502, detail=f"Cache refresh failed - {refresh_status['error']}")
+                if _project_cache.generation >= refresh_status["generation"]:  # The new snapshot is loaded
+                    return _refresh_response(refresh_status["failed"])
+            elif _project_cache.generation != generation:  # Refreshed anyway, e.g. by a leader without statuses
+                return
+            if time.monotonic() > deadline:
+                raise HTTPException(status_code=504, detail="Cache refresh timed out")
+            await asyncio.sleep(1)
+
     try:
-        await _update_project_cache()
-    except Exception:
-        raise HTTPException(status_code=500, detail="Cache refresh failed - Scoutnet unavailable")
-    return
+        failed = await _update_project_cache()
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Cache refresh failed - {_describe_error(exc)}")
+    return _refresh_response(_failed_projects(failed))
+
+
+def _refresh_response(failed: Mapping) -> JSONResponse | None:
+    return JSONResponse({"failed": failed}, status_code=status.HTTP_207_MULTI_STATUS) if failed else None
+
+
+@scoutnet_router.get("/events", response_class=StreamingResponse, response_description="Event stream")
+async def scoutnet_events(user: AuthUser = Depends(require_auth_user)):
+    """
+    Server-sent events announcing new cache generations.
+    On connect the current generation is sent, then one "generation" event per refresh:
+    {"generation", "previous_generation", "updated_at", "changed_projects": [project_id, ...]}.
+    If previous_generation is not the generation the client last saw, it missed an event
+    and should treat all projects as changed.
+    """
+    return StreamingResponse(
+        _generation_events.stream(),
+        media_type="text/event-stream",
+        headers={"cache-control": "no-cache", "x-accel-buffering": "no"},
+    )
@@ -1,77 +1,127 @@
+import hashlib
 import json
 import logging
-
-from .scoutnet import CachedGroup, CachedProject, ProjectCache, ScoutnetProjectData
-
+import math
+
+from . import metrics
+from .answers import AnswerStore, GroupAnswers
+from .changes import member_hash
+from .config import get_settings
+from .numstats import NumberStats
+from .rules import AnswerRules, CompiledRules, load_rules
+from .scoutnet import CachedGroup, CachedProject, Participant, ProjectCache, ScoutnetProjectData
+from .textutils import normalize_text_answer
+
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
 # --- Grouped project decoder (has group_member + group sections) ---
 
-
-def _j26_question_hack_individual(q: dict) -> None:
-    if q.get("90519", None) != "61935":  # "Ålder/roll vid anmälan" is not "Jag är vårdnadshavare och anmäler mitt barn"
-        q.pop("90426", None)  # Remove  "Jag samtycker till publicering av bilder på mitt barn"
-    else:
-        if "90426" not in q:
-            q["90426"] = "0"  # count this as NO if above is true and this one does not exist in the api response.
-
-    if q.get("88181", None) != "60136":  # "Vilken åldersgrupp eller funktion tillhör du/ditt barn?" is not "Ledare"
-        for key in ("88212", "89316", "89317"):
-            q.pop(key, None)  # Remove "Extra frågor för ledare"
-
-    if q.get("90433") != "1":  # "Jag samtycker till behandling av hälsoinformation"
-        for key in ("88201", "88205", "89284", "89285", "89286", "90446", "90447", "90449"):
-            q.pop(key, None)  # Remove health relates responses if not consent
-    if q.get("90447") != "1":  # "Är du/ditt barn allergisk mot något läkemedel?"
-        q.pop("90448", None)  # Remove "Vilket/vilka läkemedel är du/ditt barn allergisk mot?"
-    if q.get("89285") != "1":  # "Tar du/ditt barn någon medicin som jamboreens sjukvårdsteam bör känna till?)"
-        q.pop("88213", None)  # Remove "Vilken medicin tar du/ditt barn som jamboreens sjukvårdsteam bör känna till?"
-    if q.get("90449") != "1":  # "Har du/ditt barn annan allergi som jamboreens sjukvårdsteam bör känna till?"
-        q.pop("90450", None)  # Remove "Beskriv din/ditt barn icke-kostrelaterade allergi"
-    if q.get("89284") != "1":  # "Har du/ditt barn behov av interntransport?"
-        q.pop("88190", None)  # Remove "Beskriv ditt/ditt barns behov av interntransport"
-    if q.get("89286") != "1":  # "Har du/ditt barn ett medicinskt behov av elektricitet vid boplatsen?""
-        q.pop("88192", None)  # Remove "Vad behöver du/ditt barn elektricitet till?"
-
-    if q.get("90424") != "1":  # "Jag samtycker till behandling av kostinformation"
-        q.pop("88199", None)  # Remove "Allergier och medicinsk specialkost"
-        q.pop("89292", None)  # Remove "Kostpreferenser"
-    if q.get("88199") != "1":  # "Allergier och medicinsk specialkost" take 1
-        for key in ("88189", "88202", "88206", "88207", "88209", "88210", "88215"):
-            q.pop(key, None)  # If not, remove related responses
-    if q.get("88199") != "1":  # "Allergier och medicinsk specialkost" take 2
-        for key in ("88218", "88219", "89287", "89288", "89289", "89290", "89291"):
-            q.pop(key, None)  # If not, remove related responses
-    if q.get("89292") != "1":  # "Kostpreferenser"
-        for key in ("89293", "89294", "89295", "89296", "89297", "89298"):
-            q.pop(key, None)  # If not, remove related responses
-
-    for qpatch in ["91453", "91454", "91458", "91455", "91456", "91459", "91457", "91460"]:
-        # Decode and patch some of the "other_unsupported_by_api" types
-        if qpatch in q:
-            try:
-                decoded = json.loads(q[qpatch])
-            except (json.JSONDecodeError, TypeError):
-                continue
-            if isinstance(decoded, dict) and "value" in decoded:
-                q[qpatch] = decoded["value"]
-    return
-
-
-def _j26_question_hack_group(q: dict) -> None:
-    if q.get("88180") != "60133":  # "Transportsätt för gods is not "Gods på pall"
-        for key in ("88197", "88211", "88221", "90422", "90423"):
-            q.pop(key, None)  # Remove gods related responses
-
-    return
-
-
-def _decode_project(project: ScoutnetProjectData) -> CachedProject:
-    participants = {}
+# Text questions whose answers are not counted, and answers that mean no answer
+_UNCOUNTED_TEXT_QUESTIONS = frozenset(
+    {
+        "Övriga önskemål på arbetsuppgifter",
+        "Önskemål om personer att jobba tillsammans med:",
+        "Om du har varit i kontakt med oss innan och förbokat vad du ska jobba med i Jamboreen, vem har du varit i kontakt med och inom vilket område ska du jobba?",
+        "Vad är namnet på den nationella scoutorganisation som du tillhör?",
+    }
+)
+_EMPTY_TEXT_ANSWERS = frozenset({"no", "none", "n/a", "na", "n/a`", "ingen", "-"})
+
+
+# Aggregators of an individual answer into a group section, by question type.
+# Called as aggregate(group_section, qnum, qval, data) with the data prepared by _decode_plan.
+
+
+def _count_checked(group_section: dict, qnum: int, qval: str, checked: frozenset) -> None:
+    if qval in checked:
+        group_section[qnum] = group_section.get(qnum, 0) + 1
+
+
+def _count_choices(group_section: dict, qnum: int, qval: str | list, codes: dict[str, int]) -> None:
+    choice_counts = group_section.setdefault(qnum, {})
+    for qsel in qval if type(qval) is list else (qval,):
+        if (code := codes.get(qsel)) is not None:
+            choice_counts[code] = choice_counts.get(code, 0) + 1
+
+
+def _count_text(group_section: dict, qnum: int, qval: str, _) -> None:
+    if qval and qval.lower() not in _EMPTY_TEXT_ANSWERS and (text := normalize_text_answer(qval)):
+        text_counts = group_section.setdefault(qnum, {})  # Normalized answer -> count
+        text_counts[text] = text_counts.get(text, 0) + 1
+
+
+def _sum_number(group_section: dict, qnum: int, qval: str, _) -> None:
+    if qval:
+        group_section[qnum] = group_section.get(qnum, 0) + float(qval)
+
+
+def _skip(group_section: dict, qnum: int, qval, _) -> None:
+    pass
+
+
+def _log_unhandled(group_section: dict, qnum: int, qval, qtype: str) -> None:
+    logger.info("Unhandled question type: %s", qtype)
+
+
+def _decode_plan(qdata: dict) -> dict[str, tuple]:
+    """Prepare question id -> (question number, section id, aggregator, aggregator data) once per project."""
+    plan = {}
+    for qid, q in qdata.items():
+        qtype = q["type"]
+        if qtype == "boolean":
+            aggregate, data = _count_checked, frozenset(k for k, c in q["choices"].items() if c["option"] == "checked")
+        elif qtype == "choice":
+            aggregate, data = _count_choices, {k: int(k) for k in q.get("choices", {})}
+        elif qtype == "text":
+            aggregate, data = (_skip if q["question"] in _UNCOUNTED_TEXT_QUESTIONS else _count_text), None
+        elif qtype == "number":
+            aggregate, data = _sum_number, None
+        elif qtype == "other_unsupported_by_api":
+            aggregate, data = _skip, None
+        else:
+            aggregate, data = _log_unhandled, qtype
+        plan[qid] = (int(qid), q["section_id"], aggregate, data)
+    return plan
+
+
+def _collect_number_stats(groups: dict[int, CachedGroup], answers: AnswerStore, qdata: dict) -> None:
+    """Add the individual answers to number questions to the NumberStats of their groups."""
+    for qid, q in qdata.items():
+        if q["type"] != "number" or qid not in answers.questions:
+            continue
+        qnum = int(qid)
+        _, values = answers.column(qid)  # Floats, or the original strings if some did not round-trip
+        for group_id, value in zip(answers.row_groups, values):
+            if value is not None and value != "" and math.isfinite(number := float(value)):
+                groups[group_id].number_stats.setdefault(qnum, NumberStats()).add(number)
+
+
+def _save_question(questions: dict, sections: dict, qnum: int, q: dict) -> None:
+    section_id = q["section_id"]
+    secq = questions.setdefault(
+        section_id, {"text": sections[section_id][1], "form_type": sections[section_id][0], "questions": {}}
+    )["questions"]
+    if qnum not in secq:
+        secq[qnum] = {"text": q["question"], "type": q["type"]}
+        if q["type"] == "choice":
+            secq[qnum]["choices"] = {c["value"]: c["option"] for c in q.get("choices", {}).values()}
+
+
+def _decode_project(project: ScoutnetProjectData, rules: AnswerRules | None = None) -> CachedProject:
+    rules = rules or load_rules()
+    individual_rules = CompiledRules(rules.individual, rules.decode_json)
+    group_rules = CompiledRules(rules.group)
+    participants: dict[int, Participant] = {}
+    group_ids: dict[int, int] = {}
+    individual_answers: list[tuple[int, int, dict | None]] = []  # (member_no, group_id, answers)
+    member_hashes: dict[int, int] = {}  # member_no -> details and answers hash
     questions = {}
     groups: dict[int, CachedGroup] = {}
     qdata = project.questions["questions"]
+    plan = _decode_plan(qdata)
+    registered: set[int] = set()  # Questions saved in questions
     sex_values = project.participants["labels"]["sex"]
     fee_values = project.participants["labels"]["project_fee"]
     grouped_project = bool("group_member" in project.questions["sections"])
@@ -87,14 +137,16 @@ def _decode_project(project: ScoutnetProjectData) -> CachedProject:
             continue  # Only handle confirmed participants
 
         group_id = p["group_registration_info"]["group_id"] if grouped_project else 0
+        group_id = group_ids.setdefault(group_id, group_id)  # Share one int object per group id
+        member_group = p["primary_membership_info"]["group_id"] if p["primary_membership_info"] else group_id
 
         # Add responder to participants list
-        participants[p["member_no"]] = {
-            "name": f"{p['first_name']} {p['last_name']}",
-            "born": p["date_of_birth"],
-            "registration_group": group_id,
-            "member_group": p["primary_membership_info"]["group_id"] if p["primary_membership_info"] else group_id,
-        }
+        participants[p["member_no"]] = Participant(
+            name=f"{p['first_name']} {p['last_name']}",
+            born=p["date_of_birth"],
+            registration_group=group_id,
+            member_group=group_ids.setdefault(member_group, member_group),
+        )
         if p["date_of_birth"] < "2008-07-25":  # Over 18, also add contact info
             participants[p["member_no"]].update(
                 {"email": p["primary_email"], "mobile": p["contact_info"].get("1") if p["contact_info"] else None}
@@ -106,6 +158,7 @@ def _decode_project(project: ScoutnetProjectData) -> CachedProject:
                 id=group_id,
                 name=p["group_registration_info"]["group_name"] if grouped_project else project.project_name,
                 aggregated={"Kön": {}, "Avgift": {}},
+                number_stats={},
             )
 
         group = groups[group_id]
@@ -119,71 +172,32 @@ def _decode_project(project: ScoutnetProjectData) -> CachedProject:
         fee = fee_values.get(str(p["fee_id"]), "Okänd")  # Fee key is a string the values?
         group.aggregated["Avgift"][fee] = group.aggregated["Avgift"].get(fee, 0) + 1
 
+        if p["questions"]:
+            individual_rules.apply(p["questions"])  # Drop answers to hidden questions of the J26 forms
+
         # Save raw individual responses
-        group.raw_individual_answers[p["member_no"]] = p["questions"]
+        individual_answers.append((p["member_no"], group_id, p["questions"]))
+        member_hashes[p["member_no"]] = member_hash(participants[p["member_no"]], p["questions"])
 
         # Aggregate question responses
         if p["questions"]:
-            _j26_question_hack_individual(p["questions"])  # Hack for error in J26 question forms
-            for qnum, qval in p["questions"].items():
-                q = qdata[qnum]
-                qnum = int(qnum)
-                # if qnum == 88181:
-                #     pass
-                section_id = q["section_id"]
-
-                # Save all questions separately
-                secq = questions.setdefault(
-                    section_id, {"text": sections[section_id][1], "form_type": sections[section_id][0], "questions": {}}
-                )["questions"]
-                if qnum not in secq:
-                    secq[qnum] = {"text": q["question"], "type": q["type"]}
-                    if q["type"] == "choice":
-                        secq[qnum]["choices"] = {c["value"]: c["option"] for c in q.get("choices", {}).values()}
-
-                # Add response section to group
-                group_section = group.aggregated.setdefault(section_id, {})
-
-                # Check question type and handle response accordingly
-                if q["type"] == "boolean":
-                    if q["choices"][qval]["option"] == "checked":
-                        group_section[qnum] = group_section.get(qnum, 0) + 1
-
-                elif q["type"] == "choice":
-                    choice_counts = group_section.setdefault(qnum, {})
-                    if type(qval) is not list:
-                        qval = [qval]
-                    for qsel in qval:
-                        if qsel not in q["choices"]:
-                            continue
-                        choice_counts[int(qsel)] = choice_counts.get(int(qsel), 0) + 1
-
-                elif q["type"] == "text":
-                    if (
-                        # sections[section_id] != "Hälsa" and
-                        q["question"]
-                        not in [
-                            "Övriga önskemål på arbetsuppgifter",
-                            "Önskemål om personer att jobba tillsammans med:",
-                            "Om du har varit i kontakt med oss innan och förbokat vad du ska jobba med i Jamboreen, vem har du varit i kontakt med och inom vilket område ska du jobba?",
-                            "Vad är namnet på den nationella scoutorganisation som du tillhör?",
-                        ]
-                        and qval
-                        and qval.lower() not in ["no", "none", "n/a", "na", "n/a`", "ingen", "-"]
-                    ):
-                        group_section.setdefault(qnum, []).append(qval)
-
-                elif q["type"] == "number":
-                    if qval:
-                        # if float(qval) > 100:
-                        #     pass
-                        group_section[qnum] = group_section.get(qnum, 0) + float(qval)
-
-                elif q["type"] == "other_unsupported_by_api":
-                    pass
-                    # logger.info('Unhandled question "%s" of type: %s', qval, q["type"])
-                else:
-                    logger.info("Unhandled question type: %s", q["type"])
+            aggregated = group.aggregated
+            for qid, qval in p["questions"].items():
+                qnum, section_id, aggregate, data = plan[qid]
+                if qnum not in registered:  # Save all questions separately, in the order first answered
+                    registered.add(qnum)
+                    _save_question(questions, sections, qnum, qdata[qid])
+                group_section = aggregated.setdefault(section_id, {})  # Add response section to group
+                aggregate(group_section, qnum, qval, data)
+
+    # Encode the raw individual responses into a column store, with a view per group
+    answers = AnswerStore({qid: q["type"] for qid, q in qdata.items()}, individual_answers)
+    group_members: dict[int, list[int]] = {}
+    for member_no, group_id, _ in individual_answers:
+        group_members.setdefault(group_id, []).append(member_no)
+    for group_id, members in group_members.items():
+        groups[group_id].raw_individual_answers = GroupAnswers(answers, group_id, members)
+    _collect_number_stats(groups, answers, qdata)
 
     # Process group-level answers
     if grouped_project:
@@ -193,11 +207,11 @@ def _decode_project(project: ScoutnetProjectData) -> CachedProject:
         for gid_str, g in gdata.items():
             gid = int(gid_str)
             if gid not in groups:
-                groups[gid] = CachedGroup(id=gid, name=g["name"])
+                groups[gid] = CachedGroup(id=gid, name=g["name"], number_stats={})
 
             group = groups[gid]
             if g["questions"]:
-                _j26_question_hack_group(g["questions"])  # Hack for error in J26 question forms
+                group_rules.apply(g["questions"])  # Drop answers to hidden questions of the J26 forms
                 group.raw_group_answers = g["questions"]  # Store raw group answers
 
                 # Also compute aggregated group-level answers
@@ -231,6 +245,8 @@ def _decode_project(project: ScoutnetProjectData) -> CachedProject:
                         group_section[qnum] = qval
                     elif q["type"] == "number":
                         group_section[qnum] = int(qval) if qval else 0
+                        if qval:
+                            group.number_stats.setdefault(qnum, NumberStats()).add(float(qval))
                     else:
                         if qval:
                             if (qnum == 88195 or qnum == 88203) and int(
@@ -255,20 +271,41 @@ def _decode_project(project: ScoutnetProjectData) -> CachedProject:
         participants=participants,
         questions=questions,
         groups=dict(sorted(groups.items())),
+        answers=answers,
+        member_hashes=member_hashes,
     )
 
 
 # --- Main decoder ---
 
 
+def _fingerprint(project: ScoutnetProjectData, rules: AnswerRules) -> str:
+    """
+    Hash the raw project data and the rules it is decoded with, since a rule change changes
+    the decoded data too. Must run before decoding, which patches the answers in place.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in (project.project_name, project.groups, project.participants, project.questions):
+        h.update(json.dumps(part).encode())
+    h.update(rules.model_dump_json().encode())
+    return h.hexdigest()
+
+
 def scoutnet_forms_decoder(all_project_data: list[ScoutnetProjectData], cache: ProjectCache) -> None:
+    """Decode the fetched projects into the cache, replacing them but keeping the other cached projects."""
     projects: dict[int, CachedProject] = {}
+    configs = {p.id: p for p in settings.SCOUTNET_PROJECTS}
 
     for project in all_project_data:
-        projects[project.project_id] = _decode_project(project)
+        with metrics.decode_seconds.labels(str(project.project_id)).time():
+            config = configs.get(project.project_id)
+            rules = load_rules(config.answer_rules if config else "")  # Read per refresh, may change without a deploy
+            fingerprint = _fingerprint(project, rules)
+            projects[project.project_id] = _decode_project(project, rules)
+            projects[project.project_id].fingerprint = fingerprint
         cache.group_map |= {
             gid: g.name for gid, g in projects[project.project_id].groups.items()
         }  # Merge project group map with existing cache
         pass
 
-    cache.projects = projects
+    cache.projects = cache.projects | projects  # A new dict: the previous one is still used for diffing
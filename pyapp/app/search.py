@@ -0,0 +1,116 @@
+import heapq
+from array import array
+from bisect import bisect_left
+
+from .textutils import fold_text, trigrams
+
+# Ranked member search over the names of a project's participants.
+#
+# Names are folded once per project version (casefolded and without diacritics, so "Asa"
+# finds "Åsa") and split into words. Each query word is matched against the distinct
+# words of all names: whole words rank above word prefixes, prefixes above words that
+# contain the query word, and those above misspellings, which match when the word has at
+# least MIN_SIMILARITY of the query word's trigrams ("Andersen" finds "Andersson"). A
+# name's score is the matches of the query words weighted by their length, and the k best
+# names are kept in a bounded heap.
+#
+# There are far fewer distinct words than names, and only words sharing one of the query
+# word's rarest trigrams can match, so a search looks at a few short posting lists rather
+# than at every name. The word matching (WordIndex) is also used for the free-text
+# answers, see fulltext.py.
+
+MIN_SIMILARITY = 0.5  # Share of the query word's trigrams a misspelled word must contain, and min name score
+
+
+class WordIndex:
+    """Distinct words, each with the rows they occur in, and the trigrams to find them by."""
+
+    def __init__(self, word_rows: dict[str, array]):
+        self.words = sorted(word_rows)  # Sorted for prefix lookups
+        self.word_rows = [word_rows[word] for word in self.words]
+        self.word_trigrams = [trigrams(word) for word in self.words]
+        self.postings: dict[str, array] = {}  # Trigram -> words containing it
+        for i, word_trigrams in enumerate(self.word_trigrams):
+            for trigram in word_trigrams:
+                self.postings.setdefault(trigram, array("I")).append(i)
+
+    def match(self, query: str) -> dict[int, float]:
+        """Return word -> similarity of the words matching a query word."""
+        matches = {}
+        i = bisect_left(self.words, query)
+        while i < len(self.words) and self.words[i].startswith(query):
+            matches[i] = 1.0 if self.words[i] == query else 0.9
+            i += 1
+        query_trigrams = trigrams(query)
+        if len(query) < 3:
+            return matches  # Too short for trigrams, match word prefixes only
+        # A word containing the query word has all its trigrams but the first and last
+        inner = query_trigrams - {f" {query[:2]}", f"{query[-2:]} "}
+        # A word with MIN_SIMILARITY of the query word's trigrams contains one of the rarest of them
+        needed = max(1, int(len(query_trigrams) * MIN_SIMILARITY + 0.999))
+        rarest = sorted(query_trigrams, key=lambda t: len(self.postings.get(t, ())))
+        selected = rarest[: len(query_trigrams) - needed + 1]
+        selected.append(min(inner, key=lambda t: len(self.postings.get(t, ()))))
+        for i in {i for t in selected for i in self.postings.get(t, ())}:
+            if i in matches:
+                continue
+            if query in self.words[i]:
+                matches[i] = 0.8
+            elif (shared := len(query_trigrams & self.word_trigrams[i]) / len(query_trigrams)) >= MIN_SIMILARITY:
+                matches[i] = 0.7 * shared
+        return matches
+
+
+class MemberIndex:
+    """Search keys of the participants of one project version."""
+
+    def __init__(self, participants: dict, group_names: dict[int, str]):
+        self.member_nos = array("q")
+        self.names: list[str] = []  # Folded names, by row
+        self.born: list[str] = []
+        self.group_rows: dict[int, array] = {}  # Registration or member group id -> rows
+        self.group_names = {gid: fold_text(name) for gid, name in group_names.items()}
+        word_rows: dict[str, array] = {}
+        for row, (member_no, p) in enumerate(participants.items()):
+            self.member_nos.append(member_no)
+            name = fold_text(p.name)
+            self.names.append(name)
+            self.born.append(p.born)
+            for word in set(name.split()):
+                word_rows.setdefault(word, array("I")).append(row)
+            for gid in {p.registration_group, p.member_group}:
+                self.group_rows.setdefault(gid, array("I")).append(row)
+
+        self.vocabulary = WordIndex(word_rows)
+
+    def _group_filter(self, group: str) -> set[int]:
+        key = fold_text(group)
+        return {row for gid, name in self.group_names.items() if key in name for row in self.group_rows.get(gid, ())}
+
+    def search(self, name: str, born: str, group: str, k: int) -> list[int]:
+        """Return the member numbers of the k best matches, best first."""
+        query = fold_text(name).split()
+        if query:
+            weight = sum(len(word) for word in query)
+            scores: dict[int, float] = {}
+            for word in query:
+                best: dict[int, float] = {}  # Row -> best similarity of the query word
+                for i, similarity in self.vocabulary.match(word).items():
+                    for row in self.vocabulary.word_rows[i]:
+                        if best.get(row, 0.0) < similarity:
+                            best[row] = similarity
+                for row, similarity in best.items():
+                    scores[row] = scores.get(row, 0.0) + similarity * len(word) / weight
+            rows = [row for row, score in scores.items() if score >= MIN_SIMILARITY]
+        else:
+            rows = range(len(self.names))
+        if group:
+            rows = self._group_filter(group).intersection(rows)
+        if born:
+            rows = [row for row in rows if self.born[row].startswith(born)]
+
+        if query:
+            best_rows = heapq.nlargest(k, rows, key=lambda row: (scores[row], -len(self.names[row])))
+        else:
+            best_rows = heapq.nsmallest(k, rows, key=lambda row: self.names[row])
+        return [self.member_nos[row] for row in best_rows]
@@ -0,0 +1,172 @@
+import dataclasses
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+# On-disk snapshot of the project cache, shared by all worker processes.
+#
+# Layout: a fixed header (magic, generation, updated_at, schema version, length of the
+# structure), the cache structure as JSON, then the typed arrays as raw, 8-byte aligned
+# blocks. Readers only need the header to detect a new generation. The file is read
+# through a read-only memory map, and the arrays (the answer columns, most of the cache)
+# are loaded as memoryviews of it, so all processes share the same page cache pages
+# instead of holding a copy each.
+#
+# The format holds data only. The JSON tags every value that is not a JSON scalar:
+#   ["d", [[key, value], ...]]       dict, keeping int keys
+#   ["l", [...]], ["t", [...]], ["s", [...]], ["f", [...]]   list, tuple, set, frozenset
+#   ["o", "ClassName", n, {attribute: value}]   n-th instance of one of the classes passed in
+#   ["r", n]                         the n-th instance again, e.g. the AnswerStore of each group
+#   ["a", typecode, offset, length]  array or bytearray (typecode "B"), in the array blocks
+# Loading only sets the attributes of the known classes, so a snapshot cannot run code.
+# A dataclass whose fields no longer match the snapshot fails the load, like a snapshot of
+# another SCHEMA_VERSION, and the cache is fetched from Scoutnet instead.
+#
+# Snapshots are written to a temporary file and renamed into place, so readers never see
+# a partially written file. A reader's memory map keeps the replaced file alive.
+
+MAGIC = b"J26SNAP2"
+SCHEMA_VERSION = 1  # Increase when the meaning of cached data changes without a field change
+HEADER = struct.Struct("<8sQdIQ")  # magic, generation, updated_at, schema version, JSON length
+_ALIGN = 8
+
+
+class _Encoder:
+    def __init__(self, types: dict[str, type]):
+        self.types = {cls: name for name, cls in types.items()}
+        self.refs: dict[int, int] = {}  # id of an instance -> its n
+        self.blocks: list[bytes] = []
+        self.size = 0  # Bytes of array blocks so far, aligned
+
+    def _block(self, typecode: str, data: bytes, length: int) -> list:
+        offset = self.size
+        self.blocks.append(data + bytes(-len(data) % _ALIGN))
+        self.size += len(self.blocks[-1])
+        return ["a", typecode, offset, length]
+
+    def encode(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, dict):
+            return ["d", [[self.encode(k), self.encode(v)] for k, v in value.items()]]
+        if isinstance(value, list):
+            return ["l", [self.encode(v) for v in value]]
+        if isinstance(value, tuple):
+            return ["t", [self.encode(v) for v in value]]
+        if isinstance(value, (set, frozenset)):
+            return ["f" if isinstance(value, frozenset) else "s", [self.encode(v) for v in value]]
+        if isinstance(value, array):
+            return self._block(value.typecode, value.tobytes(), len(value))
+        if isinstance(value, (bytearray, bytes)):
+            return self._block("B", bytes(value), len(value))
+        if isinstance(value, memoryview):  # An array of a loaded snapshot
+            return self._block(value.format, value.tobytes(), len(value))
+        if (n := self.refs.get(id(value))) is not None:
+            return ["r", n]
+        if (name := self.types.get(type(value))) is None:
+            raise TypeError(f"Cannot store {type(value).__name__} in a snapshot")
+        n = self.refs[id(value)] = len(self.refs)  # The instances are kept alive by the cache
+        return ["o", name, n, {attr: self.encode(v) for attr, v in _attributes(value).items()}]
+
+
+def _attributes(obj) -> dict:
+    """Return the attributes of a dataclass or of a class with __slots__."""
+    if dataclasses.is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    return {attr: getattr(obj, attr) for attr in obj.__slots__ if hasattr(obj, attr)}
+
+
+class _Decoder:
+    def __init__(self, types: dict[str, type], blocks: memoryview):
+        self.types = types
+        self.blocks = blocks
+        self.refs: list = []
+        # Class name -> (attributes it can have, whether it must have them all)
+        self.attributes = {
+            name: (frozenset(f.name for f in dataclasses.fields(cls)), True)
+            if dataclasses.is_dataclass(cls)
+            else (frozenset(getattr(cls, "__slots__", ())), False)
+            for name, cls in types.items()
+        }
+
+    def decode(self, value):
+        if type(value) is str:
+            return sys.intern(value)  # Like the decoded Scoutnet data, and shared by all the instances
+        if type(value) is not list:
+            return value
+        tag, decode = value[0], self.decode
+        if tag == "d":
+            return {decode(k): decode(v) for k, v in value[1]}
+        if tag == "o":
+            return self._object(*value[1:])
+        if tag == "l":
+            return [decode(v) for v in value[1]]
+        if tag == "t":
+            return tuple(decode(v) for v in value[1])
+        if tag in ("s", "f"):
+            return (set if tag == "s" else frozenset)(decode(v) for v in value[1])
+        if tag == "a":
+            _, typecode, offset, length = value
+            return self.blocks[offset : offset + length * array(typecode).itemsize].cast(typecode)
+        if tag == "r":
+            return self.refs[value[1]]
+        raise ValueError(f"Unknown snapshot tag {tag!r}")
+
+    def _object(self, name: str, n: int, attributes: dict):
+        if (cls := self.types.get(name)) is None:
+            raise ValueError(f"Unknown snapshot class {name!r}")
+        allowed, exact = self.attributes[name]
+        if not (attributes.keys() == allowed if exact else attributes.keys() <= allowed):
+            raise ValueError(f"Snapshot attributes of {name} do not match the current class")
+        if n != len(self.refs):
+            raise ValueError("Damaged snapshot")
+        obj = cls.__new__(cls)
+        self.refs.append(obj)
+        for attr, v in attributes.items():
+            object.__setattr__(obj, attr, self.decode(v))
+        return obj
+
+
+def write_snapshot(path: Path, cache, types: dict[str, type]) -> None:
+    """Write the cache to a snapshot at path. It may only contain instances of types (name -> class)."""
+    encoder = _Encoder(types)
+    structure = json.dumps(encoder.encode(cache), ensure_ascii=False, separators=(",", ":")).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, cache.generation, cache.updated_at, SCHEMA_VERSION, len(structure)))
+        f.write(structure)
+        f.write(bytes(-f.tell() % _ALIGN))
+        f.writelines(encoder.blocks)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot_generation(path: Path) -> int | None:
+    """Return the generation of the snapshot at path, or None if there is no valid snapshot."""
+    try:
+        with open(path, "rb") as f:
+            magic, generation, _, schema, _ = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    return generation if magic == MAGIC and schema == SCHEMA_VERSION else None
+
+
+def load_snapshot(path: Path, types: dict[str, type]):
+    """Load and return the cache stored in the snapshot at path, see write_snapshot."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # Stays open while its arrays are used
+    magic, _, _, schema, length = HEADER.unpack_from(mm)
+    if magic != MAGIC:
+        raise ValueError(f"Not a cache snapshot: {path}")
+    if schema != SCHEMA_VERSION:
+        raise ValueError(f"Snapshot schema {schema} is not {SCHEMA_VERSION}: {path}")
+    end = HEADER.size + length
+    structure = json.loads(mm[HEADER.size : end])
+    blocks = memoryview(mm)[end + -end % _ALIGN :]
+    return _Decoder(types, blocks).decode(structure)
@@ -0,0 +1,51 @@
+import hashlib
+import logging
+import mimetypes
+import re
+from pathlib import Path
+
+from fastapi import Request, Response, status
+
+from .compression import EncodedBody
+
+logger = logging.getLogger(__name__)
+
+# The built client is small and never changes while the server runs, so every file is
+# read, compressed and hashed once at startup and then served from memory.
+# Vite names bundled assets "<name>-<content hash>.<ext>": those never change under the
+# same URL and may be cached forever. Everything else is revalidated with the ETag.
+
+HASHED_ASSET = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[a-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class StaticAssets:
+    """In-memory, precompressed copy of the files in a directory."""
+
+    def __init__(self, directory: Path, rendered: dict[str, bytes] | None = None):
+        """
+        :param directory: the directory to serve
+        :param rendered: content to serve instead of the file on disk, by relative path
+        """
+        self.files: dict[str, tuple[EncodedBody, dict]] = {}
+        rendered = rendered or {}
+        for path in sorted(p for p in directory.rglob("*") if p.is_file()):
+            name = path.relative_to(directory).as_posix()
+            body = rendered[name] if name in rendered else path.read_bytes()
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            headers = {
+                "cache-control": IMMUTABLE if HASHED_ASSET.match(name) else REVALIDATE,
+                "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            }
+            self.files[name] = (EncodedBody(body, media_type), headers)
+        logger.info("Loaded %d static files from %s", len(self.files), directory)
+
+    def response(self, request: Request, name: str) -> Response | None:
+        """Return the response for the file with the given relative path, or None if there is none."""
+        if not (entry := self.files.get(name)):
+            return None
+        body, headers = entry
+        if request.headers.get("if-none-match") == headers["etag"]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**headers, "vary": "Accept-Encoding"})
+        return body.response(request, headers)
@@ -1,24 +1,42 @@
+import asyncio
 import logging
 import math
-from typing import Any
+from datetime import datetime
+from typing import Any, Literal
 
-from async_lru import alru_cache
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from .authenctication import AuthUser, require_auth_user
+from .changes import ChangesUnavailable
+from .compression import EncodedBody, ResponseCache
 from .config import get_settings
+from .export import CSV_MEDIA_TYPE, csv_chunks
+from .popularity import Popularity
 from .scoutnet import (
+    add_prewarm_hook,
     find_members,
+    get_cache_generation,
     get_group_responses,
     get_group_summary,
+    get_groups_export,
     get_individual_responses,
     get_individuals_by_group,
+    get_individuals_export,
+    get_member_registrations,
+    get_project_changes,
+    get_project_export,
     get_project_groups,
     get_project_questions,
+    get_project_trend,
     get_projects_info,
     get_question_summary,
+    search_text_answers,
 )
+from .trends import TIMEZONE, TooManyBuckets
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -34,6 +52,158 @@ class Page(BaseModel):
     pages: int
 
 
+# Encoded responses that only depend on the cached data and the user's permission tier.
+# They are serialized and compressed once per cache generation. Summaries of group
+# selections have their own cache, so that many different selections do not evict the
+# other responses.
+#
+# A key is (kind, *arguments of its builder in _BUILDERS). The keys requested most often
+# are counted in _popularity, and after each cache update the PREWARM_TOP_K most popular
+# responses are built before the new generation is announced, so that clients reloading
+# on the announcement find them in the cache.
+_response_cache = ResponseCache("responses")
+_summary_cache = ResponseCache("summaries", max_entries=512)
+_building: dict[tuple, asyncio.Task] = {}  # (key, generation) -> task building the body
+_popularity = Popularity(settings.PERSIST_DIR / "popularity.json")
+
+
+def _tier(user: AuthUser) -> str:
+    return "all" if "j26-signupinfo:all:read" in user.permissions else "summaries"
+
+
+async def _build_questions(project_id: int) -> dict:
+    project_questions = await get_project_questions(project_id)
+    if not project_questions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return project_questions
+
+
+async def _build_groups(project_id: int) -> dict:
+    project_groups = await get_project_groups(project_id)
+    if not project_groups:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return project_groups
+
+
+async def _build_summary(project_id: int, group_ids: tuple[int, ...] | None, tier: str, text_top: int | None) -> dict:
+    summary = await get_group_summary(project_id, list(group_ids) if group_ids is not None else None, text_top)
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project or one or more groups not found.",
+        )
+
+    if tier != "all":  # Need to filter out values
+        summary["stats"] = _restricted_stats(summary["stats"])
+        summary["number_stats"] = _restricted_stats(summary["number_stats"])
+
+    return summary
+
+
+async def _build_groupinfo(project_id: int, tier: str, page: int, size: int, group_id: list[int] | None = None) -> Page:
+    responses = await get_group_responses(project_id, group_id)
+    if not responses:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project or one or more groups not found.",
+        )
+
+    total = len(responses)
+    skip = (page - 1) * size
+    items = responses[skip : skip + size]
+
+    if tier != "all":  # Need to filter out values
+        for group in items:
+            group["stats"] = _restricted_stats(group["stats"])
+
+    return Page(
+        items=items,
+        total=total,
+        page=page,
+        size=size,
+        pages=math.ceil(total / size) if total > 0 else 0,
+    )
+
+
+_BUILDERS = {
+    "questions": _build_questions,
+    "groups": _build_groups,
+    "summary": _build_summary,
+    "groupinfo": _build_groupinfo,
+}
+
+
+async def _encode(key: tuple) -> EncodedBody:
+    content = jsonable_encoder(await _BUILDERS[key[0]](*key[1:]))
+    return await run_in_threadpool(lambda: EncodedBody(JSONResponse(content).body))
+
+
+async def _cached_body(key: tuple) -> EncodedBody:
+    """
+    Return the body cached under key for the current cache generation.
+    On a miss, the content is built by the key's builder and encoded off the event loop.
+    Concurrent misses for the same key share one build.
+    """
+    cache = _summary_cache if key[0] == "summary" else _response_cache
+    generation = get_cache_generation()
+    if (body := cache.get(key, generation)) is None:
+        if (task := _building.get((key, generation))) is None:
+            task = _building[(key, generation)] = asyncio.ensure_future(_encode(key))
+            task.add_done_callback(lambda _: _building.pop((key, generation), None))
+        body = await asyncio.shield(task)  # A disconnecting client must not cancel the others' build
+        cache.put(key, generation, body)
+    return body
+
+
+async def _cached_response(request: Request, key: tuple) -> Response:
+    body = await _cached_body(key)
+    _popularity.record(key)
+    return body.response(request)
+
+
+async def _prewarm() -> None:
+    """Build the most requested responses for the new cache generation."""
+    await run_in_threadpool(_popularity.save)  # Also picks up the counts of the other workers
+    for key in _popularity.top(settings.PREWARM_TOP_K):
+        if key[0] not in _BUILDERS:
+            continue  # Counted by an older version
+        try:
+            await _cached_body(key)
+        except HTTPException:
+            pass  # E.g. a project or group that no longer exists
+
+
+add_prewarm_hook(_prewarm)
+
+
+def stats_shutdown() -> None:
+    _popularity.save()
+
+
+# Health and diet questions that require j26-signupinfo:all:read, besides those in section 21334 "Hälsa"
+RESTRICTED_QUESTIONS = frozenset(
+    {88206, 88190, 88192, 88201, 88205, 88213, 89284, 89285, 89286, 90443, 90446, 90447, 90448, 90449, 90450}
+)
+
+# Participant details shown without j26-signupinfo:all:read, which is required for contact details
+PUBLIC_PARTICIPANT_FIELDS = frozenset({"name"})
+
+
+def _restricted_stats(stats: dict) -> dict:
+    """Return a copy of group stats without section "Hälsa" and the RESTRICTED_QUESTIONS, which require all:read."""
+    return {
+        secnum: {qnum: val for qnum, val in sec.items() if qnum not in RESTRICTED_QUESTIONS}
+        for secnum, sec in stats.items()
+        if secnum != 21334
+    }
+
+
 # --- API route to get existing projects (based on configuration) ---
 
 
@@ -59,17 +229,11 @@ async def projects(user: AuthUser = Depends(require_auth_user)):
     status_code=status.HTTP_200_OK,
     response_description="Projects questions",
 )
-async def project_questions(project_id: int, user: AuthUser = Depends(require_auth_user)):
+async def project_questions(project_id: int, request: Request, user: AuthUser = Depends(require_auth_user)):
     """
     Return projects questions.
     """
-    project_questions = await get_project_questions(project_id)
-    if not project_questions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    return project_questions
+    return await _cached_response(request, ("questions", project_id))
 
 
 @stats_router.get(
@@ -78,17 +242,11 @@ async def project_questions(project_id: int, user: AuthUser = Depends(require_au
     status_code=status.HTTP_200_OK,
     response_description="Projects groups",
 )
-async def project_groups(project_id: int, user: AuthUser = Depends(require_auth_user)):
+async def project_groups(project_id: int, request: Request, user: AuthUser = Depends(require_auth_user)):
     """
     Return project groups.
     """
-    project_groups = await get_project_groups(project_id)
-    if not project_groups:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    return project_groups
+    return await _cached_response(request, ("groups", project_id))
 
 
 # --- API route to get aggregated information for one or more groups ---
@@ -102,29 +260,26 @@ async def project_groups(project_id: int, user: AuthUser = Depends(require_auth_
 )
 async def project_groupinfo_summary(
     project_id: int,
+    request: Request,
     group_ids: list[int] | None = Query(default=None),
+    text_top: int | None = Query(default=None, ge=1, description="Max distinct answers per text question"),
     user: AuthUser = Depends(require_auth_user),
 ):
     """
     Return pre-aggregated statistics across the requested groups.
     If no group_id is given, all groups are included.
+    Text questions are returned as {answer: count}; with text_top, the remaining
+    answers are summed under "_other".
+    Number questions also have their count, sum, mean, min, max and quantiles under
+    "number_stats".
     """
     if not any(
         permission in user.permissions for permission in ["j26-signupinfo:summaries:read", "j26-signupinfo:all:read"]
     ):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
 
-    summary = await get_group_summary(project_id, group_ids)
-    if not summary:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project or one or more groups not found.",
-        )
-
-    if "j26-signupinfo:all:read" not in user.permissions:  # Need to filter out values
-        summary["stats"].pop(21334, None)  # Delete section "Hälsa"
-
-    return summary
+    group_set = tuple(sorted(set(group_ids))) if group_ids is not None else None  # The same for any order
+    return await _cached_response(request, ("summary", project_id, group_set, _tier(user), text_top))
 
 
 @stats_router.get(
@@ -150,11 +305,7 @@ async def project_groupinfo_groupid(project_id: int, group_id: int, user: AuthUs
         )
 
     if "j26-signupinfo:all:read" not in user.permissions:  # Need to filter out values
-        stats = responses[0]["stats"]
-        stats.pop(21334, None)  # Delete section "Hälsa"
-        stats.get(21335, {}).pop(
-            88206, None
-        )  # Delete question "Annan relevant kostinformation" in section "Allergener"
+        responses[0]["stats"] = _restricted_stats(responses[0]["stats"])
 
     return responses[0]
 
@@ -167,6 +318,7 @@ async def project_groupinfo_groupid(project_id: int, group_id: int, user: AuthUs
 )
 async def project_groupinfo(
     project_id: int,
+    request: Request,
     group_id: list[int] | None = Query(default=None),
     page: int = Query(default=1, ge=1, description="Page number"),
     size: int = Query(default=50, ge=1, le=100, description="Page size"),
@@ -182,32 +334,9 @@ async def project_groupinfo(
     ):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
 
-    responses = await get_group_responses(project_id, group_id)
-    if not responses:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project or one or more groups not found.",
-        )
-
-    total = len(responses)
-    skip = (page - 1) * size
-    items = responses[skip : skip + size]
-
-    if "j26-signupinfo:all:read" not in user.permissions:  # Need to filter out values
-        for group in items:
-            stats = group["stats"]
-            stats.pop(21334, None)  # Delete section "Hälsa"
-            stats.get(21335, {}).pop(
-                88206, None
-            )  # Delete question "Annan relevant kostinformation" in section "Allergener"
-
-    return Page(
-        items=items,
-        total=total,
-        page=page,
-        size=size,
-        pages=math.ceil(total / size) if total > 0 else 0,
-    )
+    if group_id is None:  # Page of all groups
+        return await _cached_response(request, ("groupinfo", project_id, _tier(user), page, size))
+    return await _build_groupinfo(project_id, _tier(user), page, size, group_id)
 
 
 # --- API route to get responses on specific question for one or more groups ---
@@ -233,23 +362,9 @@ async def groupinfo_response_question_id(
         permission in user.permissions for permission in ["j26-signupinfo:summaries:read", "j26-signupinfo:all:read"]
     ):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
-    if "j26-signupinfo:all:read" not in user.permissions and question_id in [
-        88206,
-        88190,
-        88192,
-        88201,
-        88205,
-        88213,
-        89284,
-        89285,
-        89286,
-        90443,
-        90446,
-        90447,
-        90448,
-        90449,
-        90450,
-    ]:
+    if "j26-signupinfo:all:read" not in user.permissions and str(question_id) in await _restricted_question_ids(
+        project_id
+    ):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
 
     summary = await get_question_summary(project_id, question_id, group_ids)
@@ -277,8 +392,8 @@ async def individual_responses(project_id: int, member_id: int, user: AuthUser =
     j26-photography permission.
 
     Users with only j26-signupinfo:summaries:read see the same response-filtering
-    applied to the aggregated endpoints: section 21334 "Hälsa" and question 88206
-    "Annan relevant kostinformation" are stripped from the response.
+    applied to the aggregated endpoints: section 21334 "Hälsa" and the health/diet
+    questions in RESTRICTED_QUESTIONS are stripped from the response.
     Users with only j26-photography see only the photo-permission question (90426).
     """
     allowed = [
@@ -303,14 +418,20 @@ async def individual_responses(project_id: int, member_id: int, user: AuthUser =
         return {"90426": responses["90426"]} if "90426" in responses else {}  # Return only photo permission
 
     # j26-signupinfo:summaries:read — strip the same restricted health/diet questions
+    restricted_qids = await _restricted_question_ids(project_id)
+    responses = {k: v for k, v in responses.items() if str(k) not in restricted_qids}
+
+    return responses
+
+
+async def _restricted_question_ids(project_id: int) -> set[str]:
+    """Return the ids of the questions that require j26-signupinfo:all:read."""
     project_questions = await get_project_questions(project_id) or {}
-    restricted_qids = {"88206"}  # "Annan relevant kostinformation"
+    restricted_qids = {str(qnum) for qnum in RESTRICTED_QUESTIONS}
     health_section = project_questions.get(21334) or project_questions.get("21334") or {}
     for qid in health_section.get("questions") or {}:
         restricted_qids.add(str(qid))
-    responses = {k: v for k, v in responses.items() if str(k) not in restricted_qids}
-
-    return responses
+    return restricted_qids
 
 
 @stats_router.get(
@@ -356,6 +477,240 @@ async def individuals_by_group(
     )
 
 
+@stats_router.get(
+    "/members/{member_id}",
+    response_model=list[dict],
+    status_code=status.HTTP_200_OK,
+    response_description="A member's registrations in all projects",
+)
+async def member_registrations(member_id: int, user: AuthUser = Depends(require_auth_user)):
+    """
+    Return a member's registrations in all projects (e.g. as participant and as staff),
+    each with its project, group, participant details and answers.
+    Same permissions and filtering of the answers as /{project_id}/individualinfo/{member_id}.
+    Without j26-signupinfo:all:read the participant details are only the name.
+    """
+    allowed = [
+        "j26-signupinfo:all:read",
+        "j26-signupinfo:summaries:read",
+        "j26-photography",
+    ]
+    if not any(permission in user.permissions for permission in allowed):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
+
+    registrations = await get_member_registrations(member_id)
+    if not registrations:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Member not found in any project.",
+        )
+
+    if "j26-signupinfo:all:read" in user.permissions:
+        return registrations  # Return everything
+
+    for registration in registrations:
+        participant = registration["participant"]
+        registration["participant"] = {k: v for k, v in participant.items() if k in PUBLIC_PARTICIPANT_FIELDS}
+        answers = registration["answers"]
+        if "j26-photography" in user.permissions:
+            registration["answers"] = {"90426": answers["90426"]} if "90426" in answers else {}
+        else:
+            restricted_qids = await _restricted_question_ids(registration["project_id"])
+            registration["answers"] = {k: v for k, v in answers.items() if str(k) not in restricted_qids}
+
+    return registrations
+
+
+# --- API routes to export tables as CSV ---
+
+
+def _csv_response(table: tuple, filename: str) -> StreamingResponse:
+    header, rows = table
+    return StreamingResponse(
+        csv_chunks(header, rows),
+        media_type=CSV_MEDIA_TYPE,
+        headers={"content-disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@stats_router.get(
+    "/{project_id}/export/groups.csv",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    response_description="Groups table as CSV",
+)
+async def export_groups(
+    project_id: int,
+    group_id: list[int] | None = Query(default=None),
+    user: AuthUser = Depends(require_auth_user),
+):
+    """
+    Return one row per group with its participant count and aggregated answers, as CSV
+    for Excel (";"-separated, UTF-8 with BOM). Questions and choices are given by their text.
+    If no group_id is given, all groups are included.
+    """
+    if not any(
+        permission in user.permissions for permission in ["j26-signupinfo:summaries:read", "j26-signupinfo:all:read"]
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
+
+    excluded = set() if "j26-signupinfo:all:read" in user.permissions else await _restricted_question_ids(project_id)
+    table = await get_groups_export(project_id, group_id, excluded)
+    if table is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project or one or more groups not found.",
+        )
+    return _csv_response(table, f"karoversikt-{project_id}.csv")
+
+
+@stats_router.get(
+    "/{project_id}/export/individuals.csv",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    response_description="Individuals table as CSV",
+)
+async def export_individuals(
+    project_id: int,
+    group_id: list[int] | None = Query(default=None),
+    user: AuthUser = Depends(require_auth_user),
+):
+    """
+    Return one row per participant with their details and answers, as CSV for Excel.
+    If no group_id is given, all groups are included.
+    Same permissions as /individualinfo/group/{group_id}.
+    """
+    has_all_read = "j26-signupinfo:all:read" in user.permissions
+    if not (has_all_read or ("j26-signupinfo:summaries:read" in user.permissions and project_id == 52716)):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
+
+    table = await get_individuals_export(project_id, group_id, not has_all_read)
+    if table is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project or one or more groups not found.",
+        )
+    return _csv_response(table, f"personer-{project_id}.csv")
+
+
+@stats_router.get(
+    "/{project_id}/export/{table}.parquet",
+    response_class=FileResponse,
+    status_code=status.HTTP_200_OK,
+    response_description="Table as Parquet",
+)
+async def export_parquet(
+    project_id: int,
+    table: Literal["participants", "answers", "groups", "questions"],
+    user: AuthUser = Depends(require_auth_user),
+):
+    """
+    Return a table of the project as a Parquet file with typed columns, for analysis in e.g.
+    pandas: participants, answers (one column per individual question, named by its id),
+    groups (with the group questions) and questions (texts and choice labels of all questions).
+    Requires the j26-signupinfo:all:read permission.
+    """
+    if "j26-signupinfo:all:read" not in user.permissions:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
+
+    path = await get_project_export(project_id, table)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    return FileResponse(path, media_type="application/vnd.apache.parquet", filename=f"{table}-{project_id}.parquet")
+
+
+# --- API route to get participant changes between cache generations ---
+
+
+@stats_router.get(
+    "/{project_id}/changes",
+    response_model=dict,
+    status_code=status.HTTP_200_OK,
+    response_description="Participant changes",
+)
+async def project_changes(
+    project_id: int,
+    since: int = Query(ge=0, description="Cache generation to list the changes since"),
+    user: AuthUser = Depends(require_auth_user),
+):
+    """
+    Return the participants that were added, removed, moved to another group or changed
+    details or answers since the given cache generation (see /scoutnet/events or /readyz).
+    Returns 410 if the changes since that generation are no longer kept.
+    Users without j26-signupinfo:all:read do not see changes to the restricted health/diet questions.
+    """
+    if not any(
+        permission in user.permissions for permission in ["j26-signupinfo:summaries:read", "j26-signupinfo:all:read"]
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
+
+    try:
+        changes = await get_project_changes(project_id, since)
+    except ChangesUnavailable as exc:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(exc))
+    if changes is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    if "j26-signupinfo:all:read" not in user.permissions:  # Need to filter out values
+        restricted_qids = await _restricted_question_ids(project_id)
+        changed_answers = []
+        for member in changes["changed_answers"]:
+            if questions := [q for q in member["questions"] if q not in restricted_qids]:
+                changed_answers.append({**member, "questions": questions})
+        changes["changed_answers"] = changed_answers
+
+    return changes
+
+
+# --- API route to get registration statistics over time ---
+
+
+@stats_router.get(
+    "/{project_id}/trend",
+    response_model=dict,
+    status_code=status.HTTP_200_OK,
+    response_description="Statistics over time",
+)
+async def project_trend(
+    project_id: int,
+    series: list[str] = Query(default=["total"], description='E.g. "total", "group", "group:1001", "Kön", "q:88181"'),
+    interval: Literal["hour", "day", "week"] = Query(default="day"),
+    since: datetime | None = Query(
+        default=None, description="Start time, Swedish time without a zone, default the first recorded refresh"
+    ),
+    user: AuthUser = Depends(require_auth_user),
+):
+    """
+    Return statistics recorded at each refresh, with one value per interval (the value at its end).
+    Series: "total" participants, "group:<id>" participants per group, "Kön:<value>",
+    "Avgift:<value>", "q:<id>" checked boolean questions and "q:<id>:<choice>" choice counts.
+    A name without the last part selects all series below it.
+    """
+    if not any(
+        permission in user.permissions for permission in ["j26-signupinfo:summaries:read", "j26-signupinfo:all:read"]
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
+
+    if since and since.tzinfo is None:
+        since = since.replace(tzinfo=TIMEZONE)  # Local time in Sweden
+    try:
+        trend = await get_project_trend(project_id, series, interval, since.timestamp() if since else None)
+    except TooManyBuckets as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    if trend is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    if "j26-signupinfo:all:read" not in user.permissions:  # Need to filter out values
+        restricted_qids = await _restricted_question_ids(project_id)
+        trend["series"] = {
+            key: values
+            for key, values in trend["series"].items()
+            if not (key.startswith("q:") and key.split(":")[1] in restricted_qids)
+        }
+
+    return trend
+
+
 # --- API route to search for a participant ---
 
 
@@ -375,17 +730,47 @@ async def search_member(
 ):
     """
     Search for a member according to the search critera.
-    If more then "max_hits" participants matches, an error is returned.
+    Names match regardless of case and diacritics ("asa" finds "Åsa"), and also when
+    slightly misspelled. Returns the "max_hits" best matches, best first.
     """
-    responses = await find_members(project_id, name, born, group)
+    responses = await find_members(project_id, name, born, group, max_hits)
     if not responses:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Incorrect project or no members found that match the criteria.",
         )
-    if len(responses) > max_hits:
-        raise HTTPException(
-            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
-            detail=f"More then {max_hits} participants match the criteria.",
-        )
+    return responses
+
+
+@stats_router.get(
+    "/{project_id}/search_answers",
+    response_model=list[dict],
+    status_code=status.HTTP_200_OK,
+    response_description="Members and groups with matching text answers",
+)
+async def search_answers(
+    project_id: int,
+    q: str = Query(min_length=1, description='Words to find, e.g. "nöt" or "epipen"'),
+    max_hits: int = Query(default=20, ge=1, le=100, description="Maximum returned hits"),
+    user: AuthUser = Depends(require_auth_user),
+):
+    """
+    Search the free-text answers of the members and groups in a project.
+    Words match regardless of case and diacritics, also inside longer words ("nöt" finds
+    "jordnötsallergi"), and every word must match. Returns the "max_hits" best matching
+    members and groups, best first, each with its matching answers, a snippet of each
+    and the (start, end) of the matching words in the snippet.
+
+    Users with only j26-signupinfo:summaries:read do not search the restricted
+    health/diet questions.
+    """
+    if not any(
+        permission in user.permissions for permission in ["j26-signupinfo:summaries:read", "j26-signupinfo:all:read"]
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
+
+    excluded = set() if "j26-signupinfo:all:read" in user.permissions else await _restricted_question_ids(project_id)
+    responses = await search_text_answers(project_id, q, excluded, max_hits)
+    if responses is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     return responses
@@ -0,0 +1,27 @@
+import sys
+import unicodedata
+
+# Text normalization shared by the forms decoder and the API handlers.
+
+
+def normalize_text_answer(text: str) -> str:
+    """
+    Normalize a free-text answer so repeated answers count as one value:
+    collapse whitespace, drop trailing punctuation and capitalize the first letter.
+    """
+    text = " ".join(text.split()).rstrip(".,;!")
+    return sys.intern(text[:1].upper() + text[1:])
+
+
+def fold_text(text: str) -> str:
+    """
+    Return a search key for a name or text: casefolded, without diacritics and with
+    collapsed whitespace, so that "Åsa  Öberg" and "asa oberg" are the same key.
+    """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join("".join(c for c in text if not unicodedata.combining(c)).split())
+
+
+def trigrams(key: str) -> set[str]:
+    """Return the trigrams of the words of a folded key, each word padded with one space on both sides."""
+    return {f" {word} "[i : i + 3] for word in key.split() for i in range(len(word))}
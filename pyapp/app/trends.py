@@ -0,0 +1,167 @@
+import json
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# Append-only store of registration statistics over time.
+#
+# Every refresh that changed something appends one JSON line to a file in PERSIST_DIR:
+#   {"g": generation, "t": unix time, "p": {project_id: {series: value, ...}}}
+# Series are flat keys such as "total", "group:1001", "Kön:Kvinna" or "q:88181:60136".
+# A line only holds the series that changed since the previous line (0 when a series
+# disappeared), so the file grows with the amount of change, not with the number of
+# refreshes or groups. Readers replay the file once into per-series change points and
+# then only read lines appended since, so queries never touch the disk again.
+
+INTERVALS = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}
+TIMEZONE = ZoneInfo("Europe/Stockholm")
+MAX_BUCKETS = 5000  # Per query, e.g. about 7 months of hours
+
+
+class TooManyBuckets(ValueError):
+    """The requested time range has more than MAX_BUCKETS intervals."""
+
+
+def trend_values(project) -> dict[str, int]:
+    """Return the series values of a CachedProject."""
+    values = {"total": len(project.participants)}
+    for gid, group in project.groups.items():
+        values[f"group:{gid}"] = group.num_participants
+        for secnum in ("Kön", "Avgift"):
+            for value, count in group.aggregated.get(secnum, {}).items():
+                key = f"{secnum}:{value}"
+                values[key] = values.get(key, 0) + count
+    if project.answers is not None:
+        for section in project.questions.values():
+            for qnum, q in section["questions"].items():
+                if q["type"] == "boolean":
+                    values[f"q:{qnum}"] = project.answers.value_counts(str(qnum))["1"]
+                elif q["type"] == "choice":
+                    for choice, count in project.answers.value_counts(str(qnum)).items():
+                        values[f"q:{qnum}:{choice}"] = count
+    return values
+
+
+class TrendStore:
+    """The trend file and the series replayed from it, see the module comment."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._offset = 0  # Bytes of the file replayed so far
+        self._latest: dict[int, dict[str, int]] = {}  # project_id -> current value per series
+        self._series: dict[int, dict[str, tuple[list[float], list[int]]]] = {}  # change points per series
+        self.first_timestamp: float | None = None
+
+    def _reset(self) -> None:
+        self._offset = 0
+        self._latest = {}
+        self._series = {}
+        self.first_timestamp = None
+
+    def _replay(self, line: bytes) -> None:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            logger.warning("Skipping damaged line in %s", self.path)
+            return
+        t = record["t"]
+        if self.first_timestamp is None:
+            self.first_timestamp = t
+        for pid, changes in record["p"].items():
+            latest = self._latest.setdefault(int(pid), {})
+            series = self._series.setdefault(int(pid), {})
+            for key, value in changes.items():
+                latest[key] = value
+                times, values = series.setdefault(key, ([], []))
+                times.append(t)
+                values.append(value)
+
+    def refresh(self) -> None:
+        """Replay the lines appended to the file since the last call."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self._offset:  # File was replaced
+            self._reset()
+        if size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        end = data.rfind(b"\n") + 1  # Leave a partially written last line for the next call
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._replay(line)
+        self._offset += end
+
+    def append(self, generation: int, timestamp: float, projects: dict) -> None:
+        """Append the values of the changed series of all projects (project_id -> CachedProject)."""
+        self.refresh()
+        record = {}
+        for pid, project in projects.items():
+            latest = self._latest.get(pid, {})
+            values = trend_values(project)
+            changes = {key: value for key, value in values.items() if latest.get(key) != value}
+            changes |= {key: 0 for key, value in latest.items() if key not in values and value != 0}
+            if changes:
+                record[str(pid)] = changes
+        if not record:
+            return
+        line = json.dumps({"g": generation, "t": timestamp, "p": record}, ensure_ascii=False, separators=(",", ":"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            if f.tell() and self._offset < f.tell():  # Terminate a partially written line
+                f.write(b"\n")
+            f.write(line.encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.refresh()
+
+    def query(
+        self, project_id: int, names: list[str], interval: str, start: float | None = None, end: float | None = None
+    ) -> tuple[list[int], dict[str, list[int | None]]]:
+        """
+        Downsample the named series to one value per interval: the value at the end of each
+        bucket. A name also selects the series below it, e.g. "group" all "group:<id>".
+        Buckets start at local midnight (hour: full hours, week: Mondays), from start but not
+        before the first recorded refresh. Raises TooManyBuckets above MAX_BUCKETS.
+        Returns (bucket start timestamps, {series: values}).
+        """
+        self.refresh()
+        series = self._series.get(project_id, {})
+        if self.first_timestamp is None:
+            return [], {}
+        start = max(start, self.first_timestamp) if start is not None else self.first_timestamp
+        end = end or datetime.now(tz=TIMEZONE).timestamp()
+
+        step = INTERVALS[interval]
+        bucket = datetime.fromtimestamp(start, tz=TIMEZONE).replace(minute=0, second=0, microsecond=0)
+        if interval != "hour":
+            bucket = bucket.replace(hour=0)
+        if interval == "week":
+            bucket -= timedelta(days=bucket.weekday())
+        if (end - bucket.timestamp()) / step.total_seconds() >= MAX_BUCKETS:  # A DST change is at most an hour
+            raise TooManyBuckets(f"More than {MAX_BUCKETS} intervals of one {interval}, use a later since")
+        buckets = []
+        while bucket.timestamp() <= end:
+            buckets.append(bucket)
+            bucket += step  # Wall clock arithmetic, so days stay aligned to midnight across DST changes
+
+        prefixes = tuple(f"{name}:" for name in names)
+        keys = sorted(key for key in series if key in names or key.startswith(prefixes))
+        result = {}
+        for key in keys:
+            times, values = series[key]
+            points = []
+            for b in buckets:
+                bucket_end = (b + step).timestamp()
+                i = (bisect_left(times, bucket_end) if bucket_end <= end else bisect_right(times, end)) - 1
+                points.append(values[i] if i >= 0 else None)
+            result[key] = points
+        return [int(b.timestamp()) for b in buckets], result
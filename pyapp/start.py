@@ -4,6 +4,7 @@ import os
 import uvicorn
 
 DEBUG_MODE = os.getenv("DEBUG", "false") == "true"  # Global DEBUG logging
+WORKERS = int(os.getenv("WORKERS", "1"))  # Worker processes, sharing one cache snapshot in PERSIST_DIR
 LOGFORMAT = "%(asctime)s [%(name)-10s] [%(levelname)-5s] %(message)s"
 
 logging.basicConfig(level=logging.DEBUG if DEBUG_MODE else logging.INFO, format=LOGFORMAT)
@@ -15,7 +16,15 @@ logging.getLogger("uvicorn.access").setLevel(logging.INFO)
 
 logging.info("Starting SignUpInfo app")
 try:
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, log_config=None, proxy_headers=True, forwarded_allow_ips="*")
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=WORKERS,
+        log_config=None,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
 except Exception as e:
     logging.fatal("Fatal error: %s", str(e), exc_info=True)
 
@@ -26,3 +26,28 @@ def client():
 
         with TestClient(app) as c:
             yield c
+
+
+@pytest.fixture
+def project():
+    """
+    A decoded synthetic project in the cache, where every member also answers "Epipen" to
+    each restricted question (see stats.RESTRICTED_QUESTIONS), outside the health section.
+    """
+    from benchmarks.scoutnet_data import make_project
+    from pyapp.app import scoutnet
+    from pyapp.app.rules import AnswerRules
+    from pyapp.app.scoutnet_forms import _decode_project
+    from pyapp.app.stats import RESTRICTED_QUESTIONS
+
+    data = make_project(project_id=7001, num_participants=200, num_groups=10)
+    questions = data.questions["questions"]
+    for qnum in RESTRICTED_QUESTIONS:
+        questions.setdefault(str(qnum), {"section_id": 21335, "question": f"Fråga {qnum}", "type": "text"})
+    restricted_text = [str(qnum) for qnum in RESTRICTED_QUESTIONS if questions[str(qnum)]["type"] == "text"]
+    for p in data.participants["participants"].values():
+        p["questions"] |= dict.fromkeys(restricted_text, "Epipen")
+    decoded = _decode_project(data, AnswerRules())
+    scoutnet._project_cache.projects[7001] = decoded
+    yield decoded
+    del scoutnet._project_cache.projects[7001]
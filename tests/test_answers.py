@@ -0,0 +1,38 @@
+"""
+The encoded answer store must give back exactly the answers it was built from.
+"""
+
+import pickle
+
+from pyapp.app.answers import AnswerStore, GroupAnswers
+
+QUESTION_TYPES = {"1": "choice", "2": "boolean", "3": "number", "4": "text", "5": "choice", "6": "number"}
+ANSWERS = [
+    (100, 10, {"1": "60136", "2": "1", "3": "4", "4": "Gluten", "5": ["1", "2"], "6": "2.5"}),
+    (101, 10, {"1": "60135", "2": "0", "4": "Gluten", "6": "5.0"}),
+    (102, 11, {"3": "12", "4": "Laktos"}),
+    (103, 11, {}),
+]
+
+
+def test_answer_store_round_trip():
+    store = AnswerStore(QUESTION_TYPES, ANSWERS)
+    for member_no, _, response in ANSWERS:
+        assert store.get(member_no) == response
+    assert store.get(999) is None
+    assert pickle.loads(pickle.dumps(store)).get(100) == ANSWERS[0][2]
+
+
+def test_answer_store_value_counts():
+    store = AnswerStore(QUESTION_TYPES, ANSWERS)
+    assert store.value_counts("4") == {"Gluten": 2, "Laktos": 1}
+    assert store.value_counts("2") == {"1": 1, "0": 1}
+    assert store.value_counts("1", [101]) == {"60135": 1}
+    assert list(store.scan("3")) == [(100, "4"), (102, "12")]
+
+
+def test_group_answers_view():
+    store = AnswerStore(QUESTION_TYPES, ANSWERS)
+    group = GroupAnswers(store, 11, [102, 103])
+    assert dict(group) == {102: ANSWERS[2][2], 103: {}}
+    assert 100 not in group and group.get(100) is None
@@ -0,0 +1,41 @@
+from pyapp.app.answers import AnswerStore
+from pyapp.app.changes import diff_project, member_hash, merge_diffs
+from pyapp.app.scoutnet import CachedProject, Participant
+
+
+def _project(members: dict[int, tuple[int, str | None, dict]]) -> CachedProject:
+    """members: member_no -> (group_id, email, answers)"""
+    participants = {
+        m: Participant(name=f"Scout {m}", born="2000-01-01", registration_group=g, member_group=g, email=email)
+        for m, (g, email, _) in members.items()
+    }
+    answers = [(m, g, a) for m, (g, _, a) in members.items()]
+    return CachedProject(
+        project_id=1,
+        project_name="Test",
+        participants=participants,
+        answers=AnswerStore({"1": "text"}, answers),
+        member_hashes={m: member_hash(participants[m], a) for m, (_, _, a) in members.items()},
+    )
+
+
+def test_diff_project():
+    old = _project({1: (10, None, {"1": "a"}), 2: (10, None, {"1": "b"}), 3: (10, None, {}), 4: (10, "x@y.se", {})})
+    new = _project({1: (10, None, {"1": "a"}), 2: (10, None, {"1": "c"}), 4: (11, "z@y.se", {}), 5: (11, None, {})})
+    diff = diff_project(old, new)
+    assert diff["added"] == [5]
+    assert diff["removed"] == {3: {"name": "Scout 3", "group_id": 10}}
+    assert diff["moved"] == {4: [10, 11]}
+    assert diff["changed_details"] == {4: ["email", "member_group"]}
+    assert diff["changed_answers"] == {2: ["1"]}
+    assert diff_project(None, new) is None
+
+
+def test_merge_diffs():
+    empty = {"added": [], "removed": {}, "moved": {}, "changed_details": {}, "changed_answers": {}}
+    first = {**empty, "added": [5], "removed": {3: {}}, "moved": {4: [10, 11]}, "changed_answers": {2: ["1"]}}
+    second = {**empty, "added": [3], "removed": {5: {}}, "moved": {4: [11, 12]}, "changed_answers": {2: ["2"]}}
+    merged = merge_diffs([first, second])
+    assert merged["added"] == [] and merged["removed"] == {}  # 5 came and went, 3 went and came back
+    assert merged["moved"] == {4: [10, 12]}
+    assert merged["changed_answers"] == {2: ["1", "2"]}
@@ -0,0 +1,80 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from pyapp.app.compression import CompressionMiddleware, ResponseCache, choose_encoding
+
+BODY = "Scoutkår " * 1000
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware)
+
+
+@app.get("/text")
+async def text():
+    return PlainTextResponse(BODY)
+
+
+@app.get("/small")
+async def small():
+    return PlainTextResponse("ok")
+
+
+@app.get("/stream")
+async def stream():
+    return StreamingResponse(iter([BODY, BODY]), media_type="text/event-stream")
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, gzip;q=0") is None
+    assert choose_encoding("*") == "br"
+    assert choose_encoding("") is None
+
+
+def test_compression_middleware():
+    client = TestClient(app)
+    r = client.get("/text", headers={"accept-encoding": "br"})
+    assert r.headers["content-encoding"] == "br"
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.text == BODY  # Decoded by the client
+    r = client.get("/text", headers={"accept-encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.text == BODY
+    assert int(r.headers["content-length"]) < len(gzip.compress(BODY.encode(), compresslevel=1))
+    assert "content-encoding" not in client.get("/small", headers={"accept-encoding": "gzip"}).headers
+    r = client.get("/stream", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+    assert r.text == BODY * 2
+
+
+def test_response_cache_generation():
+    cache = ResponseCache(max_entries=2)
+    assert cache.get(("a",), 1) is None
+    cache.put(("a",), 1, "body-a")
+    cache.put(("b",), 1, "body-b")
+    assert cache.get(("a",), 1) == "body-a"
+    cache.put(("c",), 1, "body-c")  # Evicts "b", the least recently used
+    assert cache.get(("b",), 1) is None
+    assert cache.get(("a",), 2) is None  # New generation drops everything
+    cache.put(("a",), 1, "stale")
+    assert cache.get(("a",), 2) is None
+
+
+def test_response_cache_metrics():
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(f"signupinfo_response_cache_{name}", {"cache": "test", **labels}) or 0
+
+    cache = ResponseCache("test", max_entries=1)
+    cache.get(("a",), 1)
+    cache.put(("a",), 1, "body-a")
+    cache.get(("a",), 1)
+    cache.put(("b",), 1, "body-b")
+    assert sample("requests_total", result="miss") == 1
+    assert sample("requests_total", result="hit") == 1
+    assert sample("evictions_total") == 1
+    assert sample("entries") == 1
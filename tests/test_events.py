@@ -0,0 +1,42 @@
+import asyncio
+
+from pyapp.app.events import Broadcaster
+
+
+def test_broadcaster_fan_out():
+    async def run():
+        broadcaster = Broadcaster("generation", heartbeat_interval=60)
+        broadcaster.publish({"generation": 1})
+
+        async def subscriber():
+            return [chunk async for chunk in broadcaster.stream()]
+
+        subscribers = [asyncio.create_task(subscriber()) for _ in range(100)]
+        await asyncio.sleep(0)
+        broadcaster.publish({"generation": 2})
+        await asyncio.sleep(0.01)
+        broadcaster.close()
+        return await asyncio.gather(*subscribers)
+
+    for chunks in asyncio.run(run()):
+        events = [c for c in chunks if c.startswith("id:")]
+        assert events[0].startswith("id: 1\nevent: generation\n")
+        assert events[-1] == 'id: 2\nevent: generation\ndata: {"generation": 2}\n\n'
+
+
+def test_broadcaster_cancelled_subscriber():
+    async def run():
+        broadcaster = Broadcaster("generation", heartbeat_interval=60)
+        streams = [broadcaster.stream(), broadcaster.stream()]
+        tasks = [asyncio.create_task(anext(s)) for s in streams]  # retry: line
+        await asyncio.gather(*tasks)
+        waiting = [asyncio.create_task(anext(s)) for s in streams]
+        await asyncio.sleep(0)
+        waiting[0].cancel()  # A disconnecting client must not affect the others
+        await asyncio.sleep(0)
+        broadcaster.publish({"generation": 3})
+        chunk = await waiting[1]
+        broadcaster.close()
+        return chunk
+
+    assert asyncio.run(run()).startswith("id: 3\n")
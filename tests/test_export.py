@@ -0,0 +1,70 @@
+import csv
+import io
+
+from pyapp.app.export import csv_chunks, group_table, individual_table
+from pyapp.app.scoutnet import CachedGroup, CachedProject, Participant
+
+
+def _project() -> CachedProject:
+    questions = {
+        1: {
+            "text": "Om dig",
+            "form_type": "individual",
+            "questions": {
+                10: {"text": "Roll", "type": "choice", "choices": {"100": "Deltagare", "101": "Ledare"}},
+                11: {"text": "Badar", "type": "boolean"},
+                12: {"text": "Kost", "type": "text"},
+            },
+        },
+        2: {
+            "text": "Gods",
+            "form_type": "group",
+            "questions": {20: {"text": "Transport", "type": "choice", "choices": {"200": "Lastbil"}}},
+        },
+    }
+    group = CachedGroup(
+        id=5,
+        name="Kåren",
+        num_participants=2,
+        aggregated={
+            "Kön": {"Kvinna": 2},
+            1: {10: {100: 1, 101: 1}, 11: 1, 12: {"Laktos": 2, 'Nötter; "allt"': 1}},
+            2: {20: 200},
+        },
+        raw_individual_answers={
+            1001: {"10": "100", "11": "1", "12": "Laktos"},
+            1002: {"10": "101", "11": "0"},
+        },
+    )
+    participants = {
+        1001: Participant("Ada A", "2010-01-02", 5, 5),
+        1002: Participant("Bo B", "1990-03-04", 5, 5, email="bo@example.com"),
+    }
+    return CachedProject(
+        project_id=1, project_name="Test", participants=participants, questions=questions, groups={5: group}
+    )
+
+
+def _read(table) -> list[list[str]]:
+    text = "".join(csv_chunks(*table))
+    assert text.startswith("\ufeff")
+    return list(csv.reader(io.StringIO(text[1:]), delimiter=";"))
+
+
+def test_group_table():
+    header, *rows = _read(group_table(_project(), [5], set()))
+    assert header[:4] == ["Kår-id", "Kår", "Deltagare", "Kön: Kvinna"]
+    assert header[4:] == ["Roll: Deltagare", "Roll: Ledare", "Badar", "Kost", "Transport"]
+    assert rows == [["5", "Kåren", "2", "2", "1", "1", "1", 'Laktos (2)\nNötter; "allt"', "Lastbil"]]
+
+    header, *rows = _read(group_table(_project(), [5], {"12", "20"}))
+    assert "Kost" not in header and "Transport" not in header and len(rows[0]) == len(header)
+
+
+def test_individual_table():
+    header, *rows = _read(individual_table(_project(), [5], {"11"}))
+    assert header == ["Medlemsnummer", "Namn", "Född", "Kår", "E-post", "Mobil", "Roll", "Kost"]
+    assert rows == [
+        ["1001", "Ada A", "2010-01-02", "Kåren", "", "", "Deltagare", "Laktos"],
+        ["1002", "Bo B", "1990-03-04", "Kåren", "bo@example.com", "", "Ledare", ""],
+    ]
@@ -0,0 +1,44 @@
+from pyapp.app.fulltext import TextIndex
+
+INDEX = TextIndex(
+    [
+        (("member", 1), "88189", "Jordnötsallergi, har alltid med Epipen"),
+        (("member", 2), "88189", "Nötter"),
+        (("member", 2), "88213", "Astmamedicin"),
+        (("member", 3), "88206", "Vegetarian, ingen nöt"),
+        (("group", 10), "88197", "Tre pallar"),
+    ]
+)
+
+
+def _owners(query, excluded=frozenset()):
+    return [owner for owner, _, _ in INDEX.search(query, set(excluded), 10)]
+
+
+def test_words_inside_words_and_diacritics():
+    assert _owners("nöt") == [("member", 3), ("member", 2), ("member", 1)]  # Whole word, prefix, inside a word
+    assert _owners("EPIPEN") == [("member", 1)]
+    assert _owners("pallar") == [("group", 10)]
+    assert _owners("") == [] and _owners("kaffe") == []
+
+
+def test_every_word_must_match():
+    assert _owners("nöt epipen") == [("member", 1)]
+    owner, rows, _ = INDEX.search("nöt astma", set(), 10)[0]
+    assert owner == ("member", 2) and rows == [1, 2]  # Both matching answers
+
+
+def test_excluded_questions():
+    assert _owners("nöt", {"88206"}) == [("member", 2), ("member", 1)]
+
+
+def test_snippet():
+    _, rows, matched = INDEX.search("epipen nöt", set(), 10)[0]
+    snippet, highlights = INDEX.snippet(rows[0], matched)
+    assert [snippet[s:e] for s, e in highlights] == ["Jordnötsallergi", "Epipen"]
+
+    index = TextIndex([(("member", 1), "1", "Lorem ipsum dolor " * 10 + "epipen" + " sit amet" * 30)])
+    _, rows, matched = index.search("epipen", set(), 1)[0]
+    snippet, highlights = index.snippet(rows[0], matched)
+    assert snippet.startswith("…") and snippet.endswith("…") and len(snippet) < 170
+    assert [snippet[s:e] for s, e in highlights] == ["epipen"]
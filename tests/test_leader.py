@@ -0,0 +1,34 @@
+import time
+
+from pyapp.app.leader import RefreshLease
+
+
+def _leases(tmp_path, ttl: float = 60) -> tuple[RefreshLease, RefreshLease]:
+    a, b = RefreshLease(tmp_path / "refresh.lease", ttl), RefreshLease(tmp_path / "refresh.lease", ttl)
+    a.holder, b.holder = "pod-a:1", "pod-b:1"  # Like two pods
+    return a, b
+
+
+def test_acquire_and_renew(tmp_path):
+    a, b = _leases(tmp_path)
+    assert a.acquire()
+    assert a.acquire()  # Already held
+    assert not b.acquire()
+    assert a.renew()
+    assert not b.renew()
+    a.release()
+    assert b.acquire()
+    assert not a.renew()
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    a, b = _leases(tmp_path, ttl=0.1)
+    assert a.acquire()
+    assert not b.acquire()
+    time.sleep(0.2)  # a stops renewing
+    assert b.acquire()
+    assert not a.renew()  # a learns it lost the lease
+    assert not a.acquire()
+    b.release()
+    a.release()  # Not the holder: no effect
+    assert not (tmp_path / "refresh.lease").exists()
@@ -0,0 +1,69 @@
+import asyncio
+
+from benchmarks.scoutnet_data import make_project
+from pyapp.app import scoutnet
+from pyapp.app.authenctication import AuthUser, require_auth_user
+from pyapp.app.main import app
+from pyapp.app.scoutnet import _SNAPSHOT_TYPES, ProjectCache
+from pyapp.app.snapshot import write_snapshot
+from pyapp.app.stats import RESTRICTED_QUESTIONS
+
+
+def _use_empty_cache(monkeypatch) -> None:
+    monkeypatch.setattr(scoutnet, "_project_cache", ProjectCache())
+    monkeypatch.setattr(scoutnet, "_member_registrations", {})
+    monkeypatch.setattr(scoutnet, "_announce_generation", lambda *previous: None)
+    monkeypatch.setattr(scoutnet, "_observe_cache", lambda: None)
+
+
+def test_indexed_after_refresh(monkeypatch):
+    _use_empty_cache(monkeypatch)
+    data = make_project(project_id=1, num_participants=20, num_groups=2)
+
+    async def fetch(projects=None):
+        return {1: data}
+
+    monkeypatch.setattr(scoutnet, "_get_all_projectdata_from_scoutnet", fetch)
+    asyncio.run(scoutnet._update_project_cache())
+    participants = scoutnet._project_cache.projects[1].participants
+    assert scoutnet._member_registrations == {
+        member_no: [(1, participant["registration_group"])] for member_no, participant in participants.items()
+    }
+
+
+def test_member_registrations(client, project, monkeypatch, tmp_path):
+    path = tmp_path / "cache.snapshot"
+    write_snapshot(path, ProjectCache(projects={7001: project}, generation=5), _SNAPSHOT_TYPES)
+    _use_empty_cache(monkeypatch)
+    assert scoutnet._load_cache_from_disk(path)
+    member_no, participant = next(iter(project.participants.items()))
+    assert scoutnet._member_registrations[member_no] == [(7001, participant["registration_group"])]
+
+    restricted = {str(qnum) for qnum in RESTRICTED_QUESTIONS}
+    restricted |= {str(qnum) for qnum in project.questions[21334]["questions"]}  # Section "Hälsa"
+    [registration] = _registrations(client, member_no, "j26-signupinfo:all:read")
+    assert (registration["project_id"], registration["group_id"]) == (7001, participant["registration_group"])
+    assert {"name", "born", "member_group"} <= registration["participant"].keys()
+    assert registration["answers"].keys() & restricted
+
+    [registration] = _registrations(client, member_no, "j26-signupinfo:summaries:read")
+    assert registration["participant"] == {"name": participant["name"]}
+    assert registration["answers"] and not registration["answers"].keys() & restricted
+
+    [registration] = _registrations(client, member_no, "j26-photography")
+    assert registration["participant"] == {"name": participant["name"]}
+    assert registration["answers"].keys() == {"90426"}
+
+    assert client.get("/api/stats/members/999999999").status_code == 404
+
+
+def _registrations(client, member_no: int, permission: str) -> list[dict]:
+    app.dependency_overrides[require_auth_user] = lambda: AuthUser(
+        subject="test", name="Test", preferred_username="test", permissions=[permission]
+    )
+    try:
+        r = client.get(f"/api/stats/members/{member_no}")
+    finally:
+        del app.dependency_overrides[require_auth_user]
+    assert r.status_code == 200
+    return r.json()
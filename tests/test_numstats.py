@@ -0,0 +1,43 @@
+import random
+import statistics
+
+from pyapp.app.numstats import RELATIVE_ACCURACY, NumberStats
+
+
+def test_small_integers_are_exact():
+    group1, group2 = NumberStats(), NumberStats()
+    for tents in (1, 2, 2, 3):
+        group1.add(float(tents))
+    for tents in (5, 8):
+        group2.add(float(tents))
+    group1.merge(group2)
+    assert group1.summary() == {
+        "count": 6,
+        "sum": 21,
+        "mean": 3.5,
+        "min": 1,
+        "max": 8,
+        "p25": 2,
+        "median": 2,
+        "p75": 5,
+        "p90": 8,
+    }
+    assert NumberStats().summary() == {"count": 0}
+
+
+def test_merge_is_the_same_as_adding_all():
+    rnd = random.Random(49)
+    values = [rnd.lognormvariate(5, 2) for _ in range(5000)]
+    merged, single = NumberStats(), NumberStats()
+    for i in range(0, len(values), 100):
+        group = NumberStats()
+        for value in values[i : i + 100]:
+            group.add(value)
+            single.add(value)
+        merged.merge(group)
+    assert merged.histogram == single.histogram and merged.count == single.count
+    assert len(merged.histogram) < 1000  # Bounded by the range, not by the number of answers
+
+    median = statistics.median_low(values)
+    assert abs(merged.quantile(0.5) - median) <= median * RELATIVE_ACCURACY
+    assert merged.quantile(0) == min(values) and merged.quantile(1) == max(values)
@@ -0,0 +1,78 @@
+from datetime import date
+
+import pyarrow.parquet as pq
+
+from pyapp.app.answers import AnswerStore
+from pyapp.app.parquet_export import TABLES, write_export
+from pyapp.app.scoutnet import CachedGroup, CachedProject, Participant
+
+
+def _project() -> CachedProject:
+    questions = {
+        1: {
+            "text": "Om dig",
+            "form_type": "individual",
+            "questions": {
+                10: {"text": "Roll", "type": "choice", "choices": {"100": "Deltagare", "101": "Ledare"}},
+                11: {"text": "Badar", "type": "boolean"},
+                12: {"text": "Nätter", "type": "number"},
+                13: {"text": "Kost", "type": "text"},
+            },
+        },
+        2: {
+            "text": "Gods",
+            "form_type": "group",
+            "questions": {20: {"text": "Transport", "type": "choice", "choices": {"200": "Lastbil"}}},
+        },
+    }
+    answers = AnswerStore(
+        {"10": "choice", "11": "boolean", "12": "number", "13": "text"},
+        [(1001, 5, {"10": "100", "11": "1", "12": "3", "13": "Laktos"}), (1002, 5, {"10": "101", "11": "0"})],
+    )
+    group = CachedGroup(id=5, name="Kåren", num_participants=2, aggregated={"Kön": {"Kvinna": 2}, 2: {20: 200}})
+    participants = {
+        1001: Participant("Ada A", "2010-01-02", 5, 5),
+        1002: Participant("Bo B", "1990-03-04", 5, 5, email="bo@example.com"),
+    }
+    return CachedProject(
+        project_id=1,
+        project_name="Test",
+        participants=participants,
+        questions=questions,
+        groups={5: group},
+        answers=answers,
+    )
+
+
+def test_write_export(tmp_path):
+    directory = tmp_path / "1" / "abc"
+    write_export(_project(), directory)
+    assert sorted(p.name for p in directory.iterdir()) == sorted(f"{t}.parquet" for t in TABLES)
+
+    participants = pq.read_table(directory / "participants.parquet").to_pylist()
+    assert participants[1] == {
+        "member_no": 1002,
+        "name": "Bo B",
+        "born": date(1990, 3, 4),
+        "registration_group": 5,
+        "member_group": 5,
+        "email": "bo@example.com",
+        "mobile": None,
+    }
+
+    answers = pq.read_table(directory / "answers.parquet")
+    assert answers.schema.field("13").metadata == {b"question": b"Kost", b"section_id": b"1"}
+    assert answers.to_pylist() == [
+        {"member_no": 1001, "group_id": 5, "10": "Deltagare", "11": True, "12": 3.0, "13": "Laktos"},
+        {"member_no": 1002, "group_id": 5, "10": "Ledare", "11": False, "12": None, "13": None},
+    ]
+
+    groups = pq.read_table(directory / "groups.parquet").to_pylist()
+    assert groups == [{"group_id": 5, "name": "Kåren", "num_participants": 2, "Kön: Kvinna": 2, "20": "Lastbil"}]
+
+    questions = pq.read_table(directory / "questions.parquet").to_pylist()
+    assert [q["question_id"] for q in questions] == [10, 11, 12, 13, 20]
+    assert questions[0]["choices"] == [{"value": "100", "label": "Deltagare"}, {"value": "101", "label": "Ledare"}]
+
+    write_export(_project(), directory)  # Already written, e.g. by another worker: kept
+    assert not [p for p in directory.parent.iterdir() if p.name.startswith(".")]
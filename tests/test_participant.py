@@ -0,0 +1,29 @@
+"""
+The compact participant record must behave like the dict it replaced for the API layer.
+"""
+
+import pickle
+
+from pyapp.app.scoutnet import Participant
+
+
+def test_participant_dict_interface():
+    p = Participant(name="Åsa Öberg", born="2000-02-12", registration_group=1001, member_group=1002)
+    assert p["born"] == "2000-02-12"
+    assert p.get("email") is None and "email" not in p
+    assert {"member_no": 1, **p} == {
+        "member_no": 1,
+        "name": "Åsa Öberg",
+        "born": "2000-02-12",
+        "registration_group": 1001,
+        "member_group": 1002,
+    }
+
+    p.update({"email": "asa@example.com", "mobile": None})
+    assert dict(p.items())["email"] == "asa@example.com"
+    assert "mobile" in p and p["mobile"] is None
+    assert pickle.loads(pickle.dumps(p)) == p
+
+
+def test_participant_keeps_unparsable_dates():
+    assert Participant(name="X", born="", registration_group=0, member_group=0)["born"] == ""
@@ -0,0 +1,56 @@
+import json
+import time
+
+import pytest
+
+from pyapp.app.popularity import HALF_LIFE, MAX_KEYS, Popularity
+
+
+def test_counts_are_combined_and_persisted(tmp_path):
+    path = tmp_path / "popularity.json"
+    worker1, worker2 = Popularity(path), Popularity(path)
+    for _ in range(3):
+        worker1.record(("summary", 1, (10, 20), "all", None))
+    worker1.record(("groups", 1))
+    for _ in range(2):
+        worker2.record(("groups", 1))
+    assert worker1.top(1) == [("summary", 1, (10, 20), "all", None)]
+
+    worker1.save()
+    worker2.save()
+    assert worker2.top(2) == [("groups", 1), ("summary", 1, (10, 20), "all", None)]
+
+    restarted = Popularity(path)
+    restarted.save()  # Loads the saved counts, as before the first prewarm
+    assert restarted.top(5) == [("groups", 1), ("summary", 1, (10, 20), "all", None)]  # Group ids back as a tuple
+
+
+def test_counts_decay(tmp_path):
+    path = tmp_path / "popularity.json"
+    path.write_text(json.dumps({"t": time.time() - 2 * HALF_LIFE, "counts": {'["groups",1]': 8}}))
+    popularity = Popularity(path)
+    for _ in range(3):
+        popularity.record(("questions", 1))
+    popularity.save()
+    assert popularity.top(2) == [("questions", 1), ("groups", 1)]
+    assert round(popularity.counts[("groups", 1)]) == 2
+
+
+@pytest.mark.parametrize("text", ["{", "{}", "[]", '{"t": "now", "counts": {}}', '{"t": 0, "counts": [1]}'])
+def test_unreadable_file(tmp_path, text):
+    path = tmp_path / "popularity.json"
+    path.write_text(text)
+    popularity = Popularity(path)
+    popularity.record(("groups", 1))
+    popularity.save()  # Replaces the file
+    assert popularity.top(5) == [("groups", 1)]
+
+
+def test_pending_keys_are_capped(tmp_path):
+    popularity = Popularity(tmp_path / "popularity.json")
+    for _ in range(3):
+        popularity.record(("groups", 1))
+    for i in range(10 * MAX_KEYS):
+        popularity.record(("summary", 1, (i,), "all", None))
+    assert len(popularity.pending) <= MAX_KEYS
+    assert popularity.top(1) == [("groups", 1)]
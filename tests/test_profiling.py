@@ -0,0 +1,47 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from pyapp.app import profiling
+from pyapp.app.authenctication import AuthUser
+from pyapp.app.profiling import ProfilingMiddleware
+
+
+async def _busy_handler():  # Async: the sampler follows the event loop thread
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+    return {"ok": True}
+
+
+def _client(monkeypatch, tmp_path, permissions: list[str]) -> TestClient:
+    async def user(request):
+        return AuthUser(subject="test", name="Test", preferred_username="test", permissions=permissions)
+
+    monkeypatch.setattr(profiling, "require_auth_user", user)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    app = FastAPI()
+    app.get("/busy")(_busy_handler)
+    app.add_middleware(ProfilingMiddleware)
+    return TestClient(app)
+
+
+def test_unprofiled_requests_pass_through(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path, ["j26-signupinfo:all:read"])
+    r = client.get("/busy")
+    assert r.json() == {"ok": True} and "x-profile-file" not in r.headers
+
+    client = _client(monkeypatch, tmp_path, ["j26-signupinfo:summaries:read"])
+    r = client.get("/busy", headers={"X-Profile": "1"})  # Not allowed to profile
+    assert r.json() == {"ok": True} and "x-profile-file" not in r.headers
+    assert not list(tmp_path.iterdir())
+
+
+def test_profiled_request(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path, ["j26-signupinfo:all:read"])
+    r = client.get("/busy", params={"profile": "1"})
+    assert r.json() == {"ok": True}
+    folded = (tmp_path / r.headers["x-profile-file"]).read_text().splitlines()
+    assert any("_busy_handler" in line for line in folded)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded)  # "stack count"
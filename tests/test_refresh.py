@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pyapp.app import scoutnet
+from pyapp.app.resilience import FAILURE_THRESHOLD
+
+
+def test_refresh_reports_failed_projects(client, monkeypatch):
+    outcome = []  # The projects that fail, or the exception of a refresh that fails
+
+    async def update(project_ids=None):
+        if isinstance(outcome, Exception):
+            raise outcome
+        for pid in outcome:
+            scoutnet._refresh_errors[pid] = {"failures": 1, "error": "ReadTimeout: timed out", "failed_at": 0.0}
+        return outcome
+
+    monkeypatch.setattr(scoutnet, "_is_leader", True)
+    monkeypatch.setattr(scoutnet, "_update_project_cache", update)
+    monkeypatch.setattr(scoutnet, "_refresh_errors", {})
+    assert client.get("/api/scoutnet/refresh").status_code == 200
+
+    outcome = [1]
+    r = client.get("/api/scoutnet/refresh")
+    assert r.status_code == 207
+    assert r.json() == {"failed": {"1": "ReadTimeout: timed out"}}
+
+    outcome = scoutnet.ScoutnetRequestError("Refresh failed for all projects [1]")
+    r = client.get("/api/scoutnet/refresh")
+    assert r.status_code == 502
+    assert "Refresh failed for all projects [1]" in r.json()["detail"]
+
+
+def test_failing_project_does_not_trip_others(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params["id"])
+        return httpx.Response(500 if request.url.params["id"] == "1" else 200, json={})
+
+    client_class = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: client_class(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(scoutnet, "_circuits", {})
+    url = f"{scoutnet.PROJECT_API}/questions?id={{}}&key=k"
+
+    async def fetch(project_id: int):
+        return await scoutnet._scoutnet_get(url.format(project_id), str(project_id), "questions")
+
+    async def run():
+        for _ in range(FAILURE_THRESHOLD):
+            with pytest.raises(scoutnet.ScoutnetRequestError, match="request failed"):
+                await fetch(1)
+        with pytest.raises(scoutnet.ScoutnetRequestError, match="request skipped"):
+            await fetch(1)  # Open: not sent
+        assert await fetch(2) == {}  # Same endpoint, another project
+
+    asyncio.run(run())
+    assert requests == ["1"] * FAILURE_THRESHOLD + ["2"]
@@ -0,0 +1,31 @@
+from pyapp.app import resilience
+from pyapp.app.resilience import CircuitBreaker, backoff_delay
+
+
+def test_backoff_delay():
+    for attempt, delay in [(1, 60), (2, 120), (3, 240), (7, 3600), (20, 3600)]:
+        assert delay / 2 <= backoff_delay(attempt, 60, 3600) <= delay
+
+
+def test_circuit_breaker(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    circuit = CircuitBreaker(failure_threshold=3, open_seconds=60)
+    circuit.failure()
+    circuit.failure()
+    circuit.success()  # Resets the count
+    for _ in range(3):
+        assert circuit.allow()
+        circuit.failure()
+    assert circuit.is_open and not circuit.allow()
+
+    now[0] += 60
+    assert circuit.allow()  # One trial request
+    assert not circuit.allow()
+    circuit.failure()  # Failed trial: open for another period
+    now[0] += 30
+    assert not circuit.allow()
+    now[0] += 30
+    assert circuit.allow()
+    circuit.success()
+    assert not circuit.is_open and circuit.allow()
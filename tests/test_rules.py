@@ -0,0 +1,140 @@
+import copy
+import json
+import random
+
+from pyapp.app.rules import AnswerRule, CompiledRules, load_rules
+from pyapp.app.scoutnet import ScoutnetProjectData
+from pyapp.app.scoutnet_forms import _fingerprint
+
+# --- The hand-written J26 functions that the J26 rules replaced, as the reference ---
+
+
+def _reference_individual(q: dict) -> None:
+    if q.get("90519", None) != "61935":  # "Ålder/roll vid anmälan" is not "Jag är vårdnadshavare och anmäler mitt barn"
+        q.pop("90426", None)  # Remove  "Jag samtycker till publicering av bilder på mitt barn"
+    else:
+        if "90426" not in q:
+            q["90426"] = "0"  # count this as NO if above is true and this one does not exist in the api response.
+
+    if q.get("88181", None) != "60136":  # "Vilken åldersgrupp eller funktion tillhör du/ditt barn?" is not "Ledare"
+        for key in ("88212", "89316", "89317"):
+            q.pop(key, None)  # Remove "Extra frågor för ledare"
+
+    if q.get("90433") != "1":  # "Jag samtycker till behandling av hälsoinformation"
+        for key in ("88201", "88205", "89284", "89285", "89286", "90446", "90447", "90449"):
+            q.pop(key, None)  # Remove health relates responses if not consent
+    if q.get("90447") != "1":  # "Är du/ditt barn allergisk mot något läkemedel?"
+        q.pop("90448", None)  # Remove "Vilket/vilka läkemedel är du/ditt barn allergisk mot?"
+    if q.get("89285") != "1":  # "Tar du/ditt barn någon medicin som jamboreens sjukvårdsteam bör känna till?)"
+        q.pop("88213", None)  # Remove "Vilken medicin tar du/ditt barn som jamboreens sjukvårdsteam bör känna till?"
+    if q.get("90449") != "1":  # "Har du/ditt barn annan allergi som jamboreens sjukvårdsteam bör känna till?"
+        q.pop("90450", None)  # Remove "Beskriv din/ditt barn icke-kostrelaterade allergi"
+    if q.get("89284") != "1":  # "Har du/ditt barn behov av interntransport?"
+        q.pop("88190", None)  # Remove "Beskriv ditt/ditt barns behov av interntransport"
+    if q.get("89286") != "1":  # "Har du/ditt barn ett medicinskt behov av elektricitet vid boplatsen?""
+        q.pop("88192", None)  # Remove "Vad behöver du/ditt barn elektricitet till?"
+
+    if q.get("90424") != "1":  # "Jag samtycker till behandling av kostinformation"
+        q.pop("88199", None)  # Remove "Allergier och medicinsk specialkost"
+        q.pop("89292", None)  # Remove "Kostpreferenser"
+    if q.get("88199") != "1":  # "Allergier och medicinsk specialkost" take 1
+        for key in ("88189", "88202", "88206", "88207", "88209", "88210", "88215"):
+            q.pop(key, None)  # If not, remove related responses
+    if q.get("88199") != "1":  # "Allergier och medicinsk specialkost" take 2
+        for key in ("88218", "88219", "89287", "89288", "89289", "89290", "89291"):
+            q.pop(key, None)  # If not, remove related responses
+    if q.get("89292") != "1":  # "Kostpreferenser"
+        for key in ("89293", "89294", "89295", "89296", "89297", "89298"):
+            q.pop(key, None)  # If not, remove related responses
+
+    for qpatch in ["91453", "91454", "91458", "91455", "91456", "91459", "91457", "91460"]:
+        # Decode and patch some of the "other_unsupported_by_api" types
+        if qpatch in q:
+            try:
+                decoded = json.loads(q[qpatch])
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(decoded, dict) and "value" in decoded:
+                q[qpatch] = decoded["value"]
+
+
+def _reference_group(q: dict) -> None:
+    if q.get("88180") != "60133":  # "Transportsätt för gods is not "Gods på pall"
+        for key in ("88197", "88211", "88221", "90422", "90423"):
+            q.pop(key, None)  # Remove gods related responses
+
+
+_RULE_KEYS = sorted(
+    {rule.question for rule in load_rules().individual}
+    | {key for rule in load_rules().individual for key in rule.drop + list(rule.default)}
+)
+
+
+def _random_answers(rnd: random.Random) -> dict:
+    """Answers to a random subset of the questions the rules read or drop, with rule-relevant values."""
+    answers = {}
+    for key in _RULE_KEYS:
+        if rnd.random() < 0.7:
+            answers[key] = rnd.choice(["0", "1", "61935", "60136", "Text"])
+    if rnd.random() < 0.3:
+        answers["91453"] = rnd.choice(['{"value": "12"}', "12", "{", '["x"]'])
+    return answers
+
+
+def test_same_answers_as_the_j26_functions():
+    rules = load_rules()
+    compiled = CompiledRules(rules.individual, rules.decode_json)
+    rnd = random.Random(1)
+    for _ in range(2000):
+        expected = _random_answers(rnd)
+        actual = copy.deepcopy(expected)
+        _reference_individual(expected)
+        compiled.apply(actual)
+        assert actual == expected
+
+    compiled = CompiledRules(rules.group)
+    for transport in ("60132", "60133", None):
+        expected = {"88180": transport, "88197": "2", "88302": "5"}
+        actual = dict(expected)
+        _reference_group(expected)
+        compiled.apply(actual)
+        assert actual == expected
+
+
+def test_rules_in_order():
+    compiled = CompiledRules(
+        [
+            AnswerRule(question="1", value="yes", drop=["2"]),
+            AnswerRule(question="2", value="yes", drop=["3"]),  # Also when 2 was dropped by the rule above
+            AnswerRule(question="3", value="yes", default={"4": "no"}),
+        ],
+        ["5"],
+    )
+    q = {"1": "no", "2": "yes", "3": "yes", "5": '{"value": "7"}'}
+    compiled.apply(q)
+    assert q == {"1": "no", "5": "7"}
+
+    q = {"1": "yes", "2": "yes", "3": "yes"}
+    compiled.apply(q)
+    assert q == {"1": "yes", "2": "yes", "3": "yes", "4": "no"}
+    assert len(compiled.outcomes) == 2
+
+    q = {"1": "no", "5": '{"value": "7"}'}
+    CompiledRules([], ["5"]).apply(q)  # No rules, e.g. a rule file without group rules
+    assert q == {"1": "no", "5": "7"}
+
+
+def test_load_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text('{"group": [{"question": "1", "value": "2", "drop": ["3"]}]}')
+    rules = load_rules(path)
+    assert rules.individual == [] and rules.group[0].drop == ["3"]
+    assert len(load_rules().individual) > 0  # The J26 rules
+
+
+def test_fingerprint_includes_the_rules():
+    data = ScoutnetProjectData(7001, "Test", {}, {"participants": {"1": {"questions": {"90433": "1"}}}}, {})
+    rules = load_rules()
+    changed = rules.model_copy(update={"decode_json": [*rules.decode_json, "99999"]})
+    assert _fingerprint(data, rules) == _fingerprint(data, load_rules())
+    assert _fingerprint(data, rules) != _fingerprint(data, changed)
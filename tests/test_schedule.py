@@ -0,0 +1,37 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from pydantic import ValidationError
+
+from pyapp.app.config import ProjectConfig
+from pyapp.app.schedule import CronSchedule
+
+TZ = ZoneInfo("Europe/Stockholm")
+
+
+def _next(expression: str, *after: int) -> datetime:
+    return CronSchedule(expression).next_after(datetime(*after, tzinfo=TZ))
+
+
+def test_next_after():
+    assert _next("0 3 * * *", 2026, 10, 19, 2, 59) == datetime(2026, 10, 19, 3, 0, tzinfo=TZ)
+    assert _next("0 3 * * *", 2026, 10, 19, 3, 0) == datetime(2026, 10, 20, 3, 0, tzinfo=TZ)
+    assert _next("*/15 7-9 * * 1-5", 2026, 10, 16, 9, 50) == datetime(2026, 10, 19, 7, 0, tzinfo=TZ)  # Fri -> Mon
+    assert _next("30 6 1,15 * *", 2026, 12, 20) == datetime(2027, 1, 1, 6, 30, tzinfo=TZ)
+    assert _next("0 12 * * 7", 2026, 10, 19) == datetime(2026, 10, 25, 12, 0, tzinfo=TZ)  # 7 is Sunday too
+    assert _next("0 0 13 * 5", 2026, 10, 19) == datetime(2026, 10, 23, 0, 0, tzinfo=TZ)  # Day OR weekday
+    assert _next("0 0 29 2 *", 2026, 10, 19) == datetime(2028, 2, 29, 0, 0, tzinfo=TZ)
+
+
+@pytest.mark.parametrize("expression", ["", "0 3 * *", "60 * * * *", "0 3 0 * *", "0 3 * * 1-9", "a * * * *"])
+def test_invalid(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_never_matches():
+    with pytest.raises(ValueError, match="never matches"):
+        _next("0 0 31 2 *", 2026, 10, 19)
+    with pytest.raises(ValidationError):
+        ProjectConfig(id=1, name="Test", member_key="", question_key="", refresh_schedule="0 0 31 2 *")
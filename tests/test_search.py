@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from pyapp.app.search import MemberIndex
+from pyapp.app.textutils import fold_text
+
+NAMES = {
+    1: ("Åsa Öberg", "2012-03-04", 10),
+    2: ("Anna Andersson", "2011-05-06", 10),
+    3: ("Anna Berg", "2013-07-08", 20),
+    4: ("Hanna Annerstedt", "2012-09-10", 20),
+    5: ("Erik Johansson", "2010-11-12", 30),
+}
+INDEX = MemberIndex(
+    {
+        member_no: SimpleNamespace(name=name, born=born, registration_group=gid, member_group=gid)
+        for member_no, (name, born, gid) in NAMES.items()
+    },
+    {10: "Östra kåren", 20: "Västra kåren", 30: "Norra kåren"},
+)
+
+
+def test_fold_text():
+    assert fold_text("  Åsa  ÖBERG-Linné ") == "asa oberg-linne"
+
+
+def test_diacritics_and_case():
+    assert INDEX.search("asa oberg", "", "", 10) == [1]
+    assert INDEX.search("ÅSA", "", "", 10) == [1]
+
+
+def test_misspelling():
+    assert INDEX.search("Anna Andersen", "", "", 10)[0] == 2
+    assert INDEX.search("Johanson", "", "", 10) == [5]
+
+
+def test_ranking():
+    # Whole word before prefix before a word containing it
+    assert INDEX.search("anna", "", "", 10) == [3, 2, 4]
+    assert INDEX.search("an", "", "", 10) == [3, 2, 4]  # Short queries match word prefixes only
+    assert INDEX.search("anna", "", "", 2) == [3, 2]
+
+
+def test_filters():
+    assert INDEX.search("anna", "2013", "", 10) == [3]
+    assert INDEX.search("anna", "", "vastra", 10) == [3, 4]
+    assert INDEX.search("", "", "östra", 10) == [2, 1]  # Sorted by name without a name query
+    assert INDEX.search("xyz", "", "", 10) == []
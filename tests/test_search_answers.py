@@ -0,0 +1,15 @@
+from pyapp.app.stats import RESTRICTED_QUESTIONS
+
+
+def test_restricted_answers_are_not_searched(client, project):
+    # The fake user only has j26-signupinfo:summaries:read
+    restricted = {str(qnum) for qnum in RESTRICTED_QUESTIONS}
+    restricted |= {str(qnum) for qnum in project.questions[21334]["questions"]}  # Section "Hälsa"
+    r = client.get("/api/stats/7001/search_answers", params={"q": "epipen", "max_hits": 100})
+    assert r.status_code == 200
+    hits = r.json()
+    assert hits  # "Epipen vid nötallergi" in 88189 "Beskriv allergin"
+    assert not {a["question_id"] for hit in hits for a in hit["answers"]} & restricted
+
+    assert client.get("/api/stats/7001/search_answers", params={"q": "alvedon"}).json() == []  # Only in 88213
+    assert client.get("/api/stats/1234/search_answers", params={"q": "epipen"}).status_code == 404
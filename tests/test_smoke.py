@@ -15,6 +15,18 @@ def test_metrics(client):
     r = client.get("/metrics")
     assert r.status_code == 200
     assert b"http_requests_total" in r.content
+    assert b"signupinfo_cache_generation" in r.content
+
+
+def test_healthz(client):
+    r = client.get("/healthz")
+    assert r.status_code == 200
+
+
+def test_readyz_without_cache(client):
+    r = client.get("/readyz")
+    assert r.status_code == 503
+    assert r.json()["ready"] is False
 
 
 def test_app_config(client):
@@ -0,0 +1,68 @@
+import pickle
+from dataclasses import dataclass
+
+import pytest
+
+from pyapp.app.scoutnet import _SNAPSHOT_TYPES, ProjectCache
+from pyapp.app.snapshot import HEADER, MAGIC, SCHEMA_VERSION, load_snapshot, read_snapshot_generation, write_snapshot
+
+
+def test_round_trip(tmp_path, project):
+    cache = ProjectCache(projects={7001: project}, group_map={1: "Kåren"}, generation=7, updated_at=1.5)
+    cache.changes = {7: {7001: {"added": [1, 2], "removed": []}}}
+    path = tmp_path / "cache.snapshot"
+    write_snapshot(path, cache, _SNAPSHOT_TYPES)
+    assert read_snapshot_generation(path) == 7
+
+    loaded = load_snapshot(path, _SNAPSHOT_TYPES)
+    assert (loaded.generation, loaded.updated_at, loaded.group_map) == (7, 1.5, {1: "Kåren"})
+    assert loaded.changes == cache.changes
+    loaded_project = loaded.projects[7001]
+    assert loaded_project.participants == project.participants
+    assert loaded_project.questions == project.questions
+    assert loaded_project.member_hashes == project.member_hashes
+    for group_id, group in project.groups.items():
+        loaded_group = loaded_project.groups[group_id]
+        assert loaded_group.aggregated == group.aggregated
+        assert dict(loaded_group.raw_individual_answers) == dict(group.raw_individual_answers)
+        assert loaded_group.raw_individual_answers.store is loaded_project.answers  # Still one shared store
+    assert list(loaded_project.answers.scan("88206")) == list(project.answers.scan("88206"))
+
+    write_snapshot(path, loaded, _SNAPSHOT_TYPES)  # Arrays loaded as memoryviews are written back
+    assert load_snapshot(path, _SNAPSHOT_TYPES).projects[7001].participants == project.participants
+
+
+def test_bad_snapshots(tmp_path):
+    path = tmp_path / "cache.snapshot"
+    assert read_snapshot_generation(path) is None  # Missing
+
+    path.write_bytes(pickle.dumps(ProjectCache(generation=3)))  # E.g. the format before
+    assert read_snapshot_generation(path) is None
+    with pytest.raises(ValueError, match="Not a cache snapshot"):
+        load_snapshot(path, _SNAPSHOT_TYPES)
+
+    path.write_bytes(HEADER.pack(MAGIC, 3, 0.0, SCHEMA_VERSION + 1, 2) + b"{}")
+    assert read_snapshot_generation(path) is None
+    with pytest.raises(ValueError, match="schema"):
+        load_snapshot(path, _SNAPSHOT_TYPES)
+
+
+def test_unknown_classes(tmp_path):
+    @dataclass
+    class Other:
+        value: int = 0
+
+    path = tmp_path / "cache.snapshot"
+    with pytest.raises(TypeError):
+        write_snapshot(path, ProjectCache(projects={1: Other()}), _SNAPSHOT_TYPES)
+
+    write_snapshot(path, ProjectCache(projects={1: Other()}), _SNAPSHOT_TYPES | {"Other": Other})
+    with pytest.raises(ValueError, match="Unknown snapshot class"):
+        load_snapshot(path, _SNAPSHOT_TYPES)
+
+    @dataclass
+    class Other:  # Changed fields
+        number: int = 0
+
+    with pytest.raises(ValueError, match="do not match"):
+        load_snapshot(path, _SNAPSHOT_TYPES | {"Other": Other})
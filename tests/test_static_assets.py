@@ -0,0 +1,35 @@
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from pyapp.app.static_assets import IMMUTABLE, REVALIDATE, StaticAssets
+
+
+def _client(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<html>{{ title }}</html>")
+    (tmp_path / "assets" / "index-BxQ3k9aZ.js").write_text('console.log("hej");' * 200)
+    static_assets = StaticAssets(tmp_path, rendered={"index.html": b"<html>SignupInfo</html>"})
+
+    app = FastAPI()
+
+    @app.get("/{full_path:path}")
+    async def serve(request: Request, full_path: str):
+        if not (response := static_assets.response(request, full_path or "index.html")):
+            raise HTTPException(status_code=404)
+        return response
+
+    return TestClient(app)
+
+
+def test_static_assets(tmp_path):
+    client = _client(tmp_path)
+    r = client.get("/")
+    assert r.text == "<html>SignupInfo</html>"
+    assert r.headers["cache-control"] == REVALIDATE
+    assert client.get("/", headers={"if-none-match": r.headers["etag"]}).status_code == 304
+
+    r = client.get("/assets/index-BxQ3k9aZ.js", headers={"accept-encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["cache-control"] == IMMUTABLE
+    assert r.text == 'console.log("hej");' * 200
+    assert client.get("/assets/missing.js").status_code == 404
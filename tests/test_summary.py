@@ -0,0 +1,45 @@
+import asyncio
+
+from pyapp.app import scoutnet
+from pyapp.app.scoutnet import TEXT_OTHER_KEY, CachedGroup, CachedProject, get_group_summary
+from pyapp.app.stats import RESTRICTED_QUESTIONS
+
+QUESTIONS = {
+    21335: {"text": "Allergener", "form_type": "individual", "questions": {88189: {"text": "Allergi", "type": "text"}}},
+    21339: {"text": "Gods", "form_type": "group", "questions": {88197: {"text": "Pallar", "type": "text"}}},
+}
+
+
+def _summary(group_ids, text_top=None) -> dict:
+    groups = {
+        1: CachedGroup(id=1, name="A", aggregated={21335: {88189: {"Gluten": 2, "Laktos": 1}}, 21339: {88197: "2"}}),
+        2: CachedGroup(id=2, name="B", aggregated={21335: {88189: {"Gluten": 1, "Nötter": 1}}, 21339: {88197: "2."}}),
+        3: CachedGroup(id=3, name="C", aggregated={21335: {88189: {"Soja": 1}}}),
+    }
+    scoutnet._project_cache.projects[7002] = CachedProject(7002, "Test", questions=QUESTIONS, groups=groups)
+    try:
+        return asyncio.run(get_group_summary(7002, group_ids, text_top))["stats"]
+    finally:
+        del scoutnet._project_cache.projects[7002]
+
+
+def test_text_answers_are_merged_across_groups():
+    stats = _summary([1, 2])
+    assert stats[21335][88189] == {"Gluten": 3, "Laktos": 1, "Nötter": 1}  # Individual answers: counts summed
+    assert stats[21339][88197] == {"2": 2}  # Group answers: normalized, one per group
+    assert _summary(None)[21335][88189] == {"Gluten": 3, "Laktos": 1, "Nötter": 1, "Soja": 1}
+
+
+def test_text_top():
+    stats = _summary(None, text_top=1)
+    assert stats[21335][88189] == {"Gluten": 3, TEXT_OTHER_KEY: 3}
+    assert _summary([1, 2], text_top=3)[21335][88189] == {"Gluten": 3, "Laktos": 1, "Nötter": 1}  # Not over the top
+
+
+def test_restricted_summary(client, project):
+    # The fake user only has j26-signupinfo:summaries:read
+    r = client.get("/api/stats/7001/groupinfo/summary")
+    assert r.status_code == 200
+    stats = r.json()["stats"]
+    assert "21334" not in stats and "21335" in stats
+    assert not {int(qnum) for section in stats.values() for qnum in section if qnum.isdigit()} & RESTRICTED_QUESTIONS
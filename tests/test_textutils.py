@@ -0,0 +1,7 @@
+from pyapp.app.textutils import normalize_text_answer
+
+
+def test_normalize_text_answer():
+    assert normalize_text_answer("  laktos.  ") == "Laktos"
+    assert normalize_text_answer("Gluten  och\nlaktos") == "Gluten och laktos"
+    assert normalize_text_answer(" . ") == ""
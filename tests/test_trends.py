@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pytest
+
+from pyapp.app.scoutnet import CachedGroup, CachedProject
+from pyapp.app.trends import MAX_BUCKETS, TIMEZONE, TooManyBuckets, TrendStore
+
+
+def _project(group_counts: dict[int, int]) -> CachedProject:
+    groups = {
+        gid: CachedGroup(id=gid, name=str(gid), num_participants=n, aggregated={"Kön": {"Kvinna": n}})
+        for gid, n in group_counts.items()
+    }
+    participants = {i: None for i in range(sum(group_counts.values()))}
+    return CachedProject(project_id=1, project_name="Test", participants=participants, groups=groups)
+
+
+def _ts(day: int, hour: int = 12) -> float:
+    return datetime(2026, 3, day, hour, tzinfo=TIMEZONE).timestamp()
+
+
+def test_trend_store(tmp_path):
+    store = TrendStore(tmp_path / "trends.jsonl")
+    store.append(1, _ts(1), {1: _project({10: 5, 11: 3})})
+    store.append(2, _ts(1, 18), {1: _project({10: 6, 11: 3})})
+    store.append(3, _ts(2), {1: _project({10: 6, 11: 3})})  # Nothing changed: nothing appended
+    store.append(4, _ts(4), {1: _project({10: 7})})
+    assert len((tmp_path / "trends.jsonl").read_text().splitlines()) == 3
+
+    reader = TrendStore(tmp_path / "trends.jsonl")  # E.g. another worker
+    timestamps, series = reader.query(1, ["total", "group"], "day", end=_ts(4, 23))
+    assert timestamps == [int(datetime(2026, 3, d, tzinfo=TIMEZONE).timestamp()) for d in (1, 2, 3, 4)]
+    assert series == {"total": [9, 9, 9, 7], "group:10": [6, 6, 6, 7], "group:11": [3, 3, 3, 0]}
+    assert reader.query(1, ["Kön:Kvinna"], "week", end=_ts(4, 23))[1] == {"Kön:Kvinna": [9, 7]}  # Weeks from Monday
+
+
+def test_query_range(tmp_path):
+    store = TrendStore(tmp_path / "trends.jsonl")
+    store.append(1, _ts(1), {1: _project({10: 5})})
+    timestamps, series = store.query(1, ["total"], "hour", start=datetime(1900, 1, 1).timestamp(), end=_ts(1, 14))
+    assert len(timestamps) == 3 and series == {"total": [5, 5, 5]}  # From the first refresh, not from 1900
+
+    with pytest.raises(TooManyBuckets):
+        store.query(1, ["total"], "hour", end=_ts(1) + MAX_BUCKETS * 3600)
+    assert len(store.query(1, ["total"], "week", end=_ts(1) + MAX_BUCKETS * 3600)[0]) < 50